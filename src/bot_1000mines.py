@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-from typing import Optional
+import time
+from typing import Any, Dict, Optional
 
-from src.services import create_session, close_session, run_game, Session
+from src.lib.s0_browser import stop_overlay_queue
+from src.services import create_session, create_simulated_session, close_session, run_game, Session
 
 
 class Minesweeper1000Bot:
@@ -20,16 +22,26 @@ class Minesweeper1000Bot:
         overlay_enabled: bool = False,
         max_iterations: int = 500,
         delay_between_iterations: float = 0.2,
+        record: bool = False,
+        resume: Optional[str] = None,
+        pooled: bool = False,
     ) -> bool:
-        """Pipeline principal : capture → vision → solver → executor."""
+        """Pipeline principal : capture → vision → solver → executor.
+
+        `resume` : game_id d'une partie interrompue dont la base de grille est rechargée
+        si la page montre encore cette partie (vérifié à la première passe vision).
+        `pooled` : navigateur headless pré-chauffé du pool (voir s0_browser/pool.py).
+        """
         try:
             # Une seule session/navigateur ; le restart clique sur le bouton du jeu
-            self.session = create_session(difficulty=difficulty)
+            self.session = create_session(difficulty=difficulty, pooled=pooled)
+            self.session.resume_from = resume
             result = run_game(
                 self.session,
                 max_iterations=max_iterations,
                 delay=delay_between_iterations,
                 overlay_enabled=overlay_enabled,
+                record=record,
             )
             print(f"[GAME] iterations={result['iterations']} actions={result['total_actions']}")
             return result.get("success", False)
@@ -41,8 +53,49 @@ class Minesweeper1000Bot:
                 self.session = None
             return False
 
+    def run_simulation(
+        self,
+        difficulty: str = "impossible",
+        *,
+        seed: int = 0,
+        max_iterations: int = 500,
+        max_games: int = 1,
+        record: bool = False,
+        overlay_enabled: bool = False,
+        resume: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Pipeline complet sur le plateau simulé ; mesure les cases révélées par seconde."""
+        self.session = create_simulated_session(difficulty=difficulty, seed=seed)
+        self.session.resume_from = resume
+        board = self.session.driver.board
+
+        start = time.perf_counter()
+        result = run_game(
+            self.session,
+            max_iterations=max_iterations,
+            delay=0.0,
+            max_games=max_games,
+            record=record,
+            overlay_enabled=overlay_enabled,
+        )
+        elapsed = time.perf_counter() - start
+
+        result.update({
+            "seed": seed,
+            "duration": elapsed,
+            "cells_revealed": board.stats.revealed,
+            "explosions": board.stats.explosions,
+            "cells_per_second": board.stats.revealed / elapsed if elapsed > 0 else 0.0,
+        })
+        print(
+            f"[SIMULATOR] seed={seed} révélées={board.stats.revealed} explosions={board.stats.explosions} "
+            f"durée={elapsed:.2f}s → {result['cells_per_second']:.1f} cases/s"
+        )
+        return result
+
     def cleanup(self) -> None:
         """Ferme proprement la session."""
+        stop_overlay_queue()  # Termine les rendus d'overlays en attente
         if self.session:
             close_session(self.session)
             self.session = None
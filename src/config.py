@@ -10,6 +10,7 @@ CELL_SIZE = 24         # Taille d'une case en pixels
 CELL_BORDER = 1        # Épaisseur des bordures entre les cases en pixels
 # Offset de référence de la grille dans le CanvasSpace (position réelle des bordures)
 GRID_REFERENCE_POINT = (-1, -1)
+CANVAS_TILE_SIZE = 512  # Taille d'une tuile canvas en pixels (positions fixes, indexées par l'ID)
 
 # Paramètres du viewport
 VIEWPORT_CONFIG = {
@@ -27,13 +28,84 @@ WAIT_TIMES = {
     'game_start': 2,           # Temps d'attente après le démarrage du jeu
 }
 
+# Détection de fin de rendu (remplace les délais fixes de la boucle et du planner)
+RENDER_SETTLE_CONFIG = {
+    'enabled': True,           # False = retour aux délais fixes (sleep complet)
+    'quiet_ms': 60,            # Durée sans redessin d'une tuile canvas pour considérer le rendu stable
+    'poll_ms': 10,             # Intervalle de vérification côté page
+}
+
+# Rendu des overlays de debug (--overlay) dans un processus worker
+OVERLAY_RENDER_CONFIG = {
+    'async': True,             # False = rendu synchrone dans la boucle (comportement historique)
+    'max_pending': 12,         # Rendus en attente max (~2 itérations) ; au-delà, frames abandonnées
+}
+
+# Base de grille persistante par partie (temp/games/<id>/grid_state.db, reprise après crash)
+GRID_DB_CONFIG = {
+    'enabled': True,           # Écrit les chunks modifiés à chaque upsert du storage
+    'chunk_size': 32,          # Côté d'un chunk en cases (32×32 codes uint32 = 4 Ko)
+    'compact_ratio': 4.0,      # Compaction quand le fichier dépasse N × la taille des chunks vivants
+    'fsync': False,            # True : survit aussi à une coupure système (plus lent)
+}
+
+# Éviction des régions froides du storage (zones résolues du mode Infinite)
+STORAGE_EVICTION_CONFIG = {
+    'enabled': True,
+    'chunk_size': 32,          # Côté d'une région en cases
+    'radius': 32,              # Distance (cases) à la cellule non résolue la plus proche pour évincer
+    'interval': 5,             # Passe d'éviction toutes les N itérations
+}
+
+# Journal des upserts du storage (flux de changements pour les consommateurs incrémentaux)
+STORAGE_JOURNAL_CONFIG = {
+    'capacity': 256,           # Upserts conservés ; un abonné plus en retard se resynchronise en entier
+}
+
+# Orchestrateur : plusieurs sessions en parallèle, un processus chacune
+ORCHESTRATOR_CONFIG = {
+    'headless': True,            # Navigateurs des sessions parallèles sans affichage
+    'log_dir': 'temp/orchestrator',  # Un log par session : temp/orchestrator/<run>/session_<i>.log
+    'report_interval': 5.0,      # Secondes entre deux bilans agrégés
+}
+
+# Vision : pré-filtrage des cellules non révélées
+VISION_CONFIG = {
+    'downscaler_device': 'cpu',  # 'cpu' (statistiques de bloc numpy) ou 'cuda' (torch importé à la demande)
+    'tile_native': True,         # Classification directe sur les tuiles canvas (sans composite)
+    'changed_tiles_only': True,  # Vision par tuiles : seules les tuiles modifiées depuis la passe précédente
+}
+
+# Surcouche UI temps réel : seules les cellules visibles (+ marge) sont envoyées au navigateur
+UI_OVERLAY_CONFIG = {
+    'viewport_margin': 5,      # Marge en cases autour du viewport visible
+    'index_bucket': 16,        # Côté (en cases) des seaux de l'index spatial
+    'control_wait': 1.0,       # Attente max (s) d'un événement de contrôle en pause (appel asynchrone)
+}
+
 # Paramètres du navigateur
 BROWSER_CONFIG = {
     'headless': False,         # Mode sans affichage
     'maximize': True,          # Ouvre le navigateur en mode plein écran
+    'chromedriver_cache': 'temp/chromedriver_path.txt',  # Chemin du pilote résolu (évite la résolution réseau à chaque démarrage)
     'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
 
+# Pool de navigateurs pré-chauffés (headless, page du jeu chargée, surcouche UI injectée)
+BROWSER_POOL_CONFIG = {
+    'size': 1,                 # Instances par difficulté (prêtes + en préparation + prêtées)
+    'max_reuse': 50,           # Sessions par instance avant relance complète (fuites mémoire de la page)
+    'acquire_timeout': 60.0,   # Attente max d'une instance en préparation avant démarrage direct
+}
+
+# Client DevTools asynchrone (scripts de la page en Runtime.evaluate sur WebSocket)
+DEVTOOLS_CONFIG = {
+    'enabled': True,           # False : remplaçant local (execute_script Selenium) même si Chrome expose DevTools
+    'session_client': True,    # False : sessions navigateur sans client asynchrone (capture synchrone capture_all_canvases)
+    'connect_timeout': 5.0,    # Découverte de la page et handshake WebSocket (s)
+    'call_timeout': 30.0,      # Attente max d'un lot de requêtes (s)
+}
+
 # Paramètres du jeu
 GAME_CONFIG = {
     'url': 'https://www.1000mines.com/',  # URL du jeu
@@ -72,6 +144,21 @@ DEFAULT_DIFFICULTY = 'impossible'
 # Paramètres du solver CSP
 CSP_CONFIG = {'max_zones_per_component': 50}  # Limite de zones par composante (50 = frontière de ~50 cases)
 
+# Simulateur hors-ligne (s0_simulator) : plateau infini déterministe sans navigateur
+SIMULATOR_CONFIG = {
+    'tiles_x': (-2, 1),         # Tuiles canvas 512px visibles (bornes incluses)
+    'tiles_y': (-1, 1),
+    'lives': 3,                 # Vies en début de partie
+    'opening_radius': 1,        # Rayon de la zone sans mine autour de l'origine (ouverture initiale)
+    'mine_density': {           # Densité de mines par difficulté
+        'beginner': 0.10,
+        'master': 0.15,
+        'ultimate': 0.18,
+        'impossible': 0.21,
+        'deathmatch': 0.25,
+    },
+}
+
 # Configuration de l'exploration
 EXPLORATION_CONFIG = {
     'min_safe_actions': 5,      # Seuil d'actions sûres pour déclencher l'exploration
@@ -110,5 +197,7 @@ def get_game_paths(game_id: str) -> dict:
         
         # Métadonnées et base de données
         'metadata': f"{base}/metadata.json",           # Métadonnées de la partie
-        'grid_db': f"{base}/grid_state_db.json"        # Base de données de la grille
+        'grid_db': f"{base}/grid_state.db",            # Base de grille binaire chunkée (reprise)
+        'progress': f"{base}/progress.csv",            # Série temporelle des compteurs (débit)
+        'recording': f"{base}/recording.zip",          # Enregistrement rejouable (captures + deltas)
     }
\ No newline at end of file
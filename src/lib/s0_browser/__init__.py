@@ -2,7 +2,11 @@
 
 from .browser import BrowserManager, start_browser, stop_browser, navigate_to
 from .types import BrowserConfig, BrowserHandle
+from .pool import BrowserPool, PooledBrowser
+from .devtools import AsyncBrowserClient, DevToolsClient, DevToolsError, LocalBrowserClient, open_browser_client
 from .actions import click_left, click_right
+from .render_settle import SettleResult, wait_render_settled
+from .overlay_queue import OverlayRenderQueue, submit_overlay, stop_overlay_queue
 from .export_context import (
     ExportContext,
     set_export_context,
@@ -17,8 +21,20 @@ __all__ = [
     "start_browser",
     "stop_browser",
     "navigate_to",
+    "BrowserPool",
+    "PooledBrowser",
+    "AsyncBrowserClient",
+    "DevToolsClient",
+    "DevToolsError",
+    "LocalBrowserClient",
+    "open_browser_client",
     "click_left",
     "click_right",
+    "SettleResult",
+    "wait_render_settled",
+    "OverlayRenderQueue",
+    "submit_overlay",
+    "stop_overlay_queue",
     "ExportContext",
     "set_export_context",
     "get_export_context",
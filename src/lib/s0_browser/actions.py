@@ -1,7 +1,12 @@
 """Actions de bas niveau via JavaScript."""
 
 from __future__ import annotations
-from selenium.webdriver.remote.webdriver import WebDriver
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
 
 def click_left(driver: WebDriver, rel_x: float, rel_y: float) -> bool:
     """Simule un clic gauche (double-clic) via JS à une position relative à l'anchor."""
@@ -1,17 +1,40 @@
-"""Gestion du navigateur Selenium."""
+"""Gestion du navigateur Selenium.
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.options import Options
+Selenium et webdriver-manager ne sont importés qu'au démarrage effectif du
+navigateur (le simulateur et le replay n'en paient pas le coût).
+"""
 
+from __future__ import annotations
+
+from pathlib import Path
+
+from src.config import BROWSER_CONFIG
+from src.startup_profile import startup_profile
 from .types import BrowserConfig, BrowserHandle
 
 
+def resolve_chromedriver(refresh: bool = False) -> str:
+    """
+    Chemin du chromedriver : cache local s'il pointe vers un fichier existant,
+    sinon résolution webdriver-manager (requête réseau) puis mise en cache.
+    """
+    cache = Path(BROWSER_CONFIG['chromedriver_cache'])
+    if not refresh and cache.exists():
+        cached = cache.read_text(encoding="utf-8").strip()
+        if cached and Path(cached).exists():
+            return cached
+
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    path = ChromeDriverManager().install()
+    try:
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        cache.write_text(path, encoding="utf-8")
+    except OSError as e:
+        print(f"[AVERTISSEMENT] Cache chromedriver non écrit: {e}")
+    return path
+
+
 class BrowserManager:
     """Gestionnaire du navigateur web."""
 
@@ -21,6 +44,11 @@ class BrowserManager:
 
     def start(self) -> BrowserHandle:
         """Démarre le navigateur Chrome."""
+        from selenium import webdriver
+        from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+
         try:
             options = Options()
 
@@ -42,10 +70,18 @@ class BrowserManager:
                 options.add_argument(f'user-agent={self.config.user_agent}')
 
             print("1. Installation du pilote Chrome...")
-            service = Service(ChromeDriverManager().install())
+            with startup_profile.phase("pilote Chrome"):
+                service = Service(resolve_chromedriver())
             
             print("2. Démarrage de Chrome...")
-            driver = webdriver.Chrome(service=service, options=options)
+            with startup_profile.phase("lancement de Chrome"):
+                try:
+                    driver = webdriver.Chrome(service=service, options=options)
+                except SessionNotCreatedException as e:
+                    # Chrome mis à jour : le pilote en cache ne correspond plus, on le résout à nouveau
+                    print(f"[AVERTISSEMENT] Pilote en cache incompatible, nouvelle résolution: {e.msg}")
+                    service = Service(resolve_chromedriver(refresh=True))
+                    driver = webdriver.Chrome(service=service, options=options)
             
             driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
 
@@ -86,6 +122,11 @@ def stop_browser(handle: BrowserHandle) -> None:
 
 def navigate_to(handle: BrowserHandle, url: str, timeout: int = 10) -> bool:
     """Navigue vers une URL."""
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
     if not handle or not handle.is_started:
         print("[ERREUR] Navigateur non démarré")
         return False
@@ -0,0 +1,290 @@
+"""
+Client navigateur asynchrone (asyncio) parlant directement le protocole DevTools.
+
+Chaque `execute_script` Selenium est un aller-retour HTTP bloquant vers
+chromedriver, lui-même relayé vers Chrome : une itération en enchaîne des
+dizaines (une capture par tuile, infos de jeu, overlays...). Ici les scripts
+sont envoyés en `Runtime.evaluate` sur la WebSocket DevTools de la page ; les
+requêtes sont multiplexées par identifiant, donc des appels lancés ensemble
+(`asyncio.gather`) sont en vol simultanément et attendus en une fois.
+
+- `DevToolsClient` : connexion à Chrome via l'adresse de débogage exposée
+  par chromedriver (`goog:chromeOptions.debuggerAddress`).
+- `LocalBrowserClient` : remplaçant local qui exécute les scripts sur un
+  driver synchrone (simulateur, tests, repli si DevTools est injoignable).
+
+La boucle asyncio tourne dans un thread dédié : le pipeline (synchrone)
+soumet ses coroutines via `client.run(...)` ou `client.gather(...)`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import os
+import struct
+import threading
+from typing import Any, Coroutine, Dict, List, Optional
+from urllib.parse import urlparse
+from urllib.request import urlopen
+
+from src.config import DEVTOOLS_CONFIG
+
+
+class DevToolsError(RuntimeError):
+    """Erreur protocole DevTools ou exception JavaScript levée par un script."""
+
+
+# ----------------------------------------------------------------------
+# Boucle asyncio partagée (thread de fond)
+# ----------------------------------------------------------------------
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _io_loop() -> asyncio.AbstractEventLoop:
+    """Boucle d'I/O navigateur, démarrée à la première utilisation."""
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="browser-io", daemon=True).start()
+    return _loop
+
+
+# ----------------------------------------------------------------------
+# WebSocket minimale (RFC 6455, côté client) sur asyncio
+# ----------------------------------------------------------------------
+
+_OP_CONTINUATION, _OP_TEXT, _OP_CLOSE, _OP_PING, _OP_PONG = 0x0, 0x1, 0x8, 0x9, 0xA
+
+
+class _WebSocket:
+    """Trames texte masquées en émission ; fragmentation, ping et close gérés en réception."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def connect(cls, url: str) -> "_WebSocket":
+        parsed = urlparse(url)
+        host, port = parsed.hostname, parsed.port or 80
+        reader, writer = await asyncio.open_connection(host, port, limit=2 ** 24)
+        key = base64.b64encode(os.urandom(16)).decode()
+        writer.write(
+            f"GET {parsed.path or '/'} HTTP/1.1\r\n"
+            f"Host: {host}:{port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n".encode()
+        )
+        await writer.drain()
+        response = await reader.readuntil(b"\r\n\r\n")
+        status = response.split(b"\r\n", 1)[0]
+        if b" 101 " not in status + b" ":
+            writer.close()
+            raise DevToolsError(f"Handshake WebSocket refusé: {status.decode(errors='replace')}")
+        return cls(reader, writer)
+
+    async def send(self, text: str) -> None:
+        self._write_frame(_OP_TEXT, text.encode())
+        await self._writer.drain()
+
+    def _write_frame(self, opcode: int, payload: bytes) -> None:
+        length = len(payload)
+        if length < 126:
+            header = struct.pack("!BB", 0x80 | opcode, 0x80 | length)
+        elif length < 1 << 16:
+            header = struct.pack("!BBH", 0x80 | opcode, 0x80 | 126, length)
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, 0x80 | 127, length)
+        mask = os.urandom(4)
+        # XOR du masque sur tout le payload en une opération entière
+        repeated = (mask * (length // 4 + 1))[:length]
+        masked = (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(length, "big")
+        self._writer.write(header + mask + masked)
+
+    async def receive(self) -> Optional[str]:
+        """Prochain message texte complet, None à la fermeture."""
+        fragments = []
+        while True:
+            first, second = await self._reader.readexactly(2)
+            opcode, length = first & 0x0F, second & 0x7F
+            if length == 126:
+                (length,) = struct.unpack("!H", await self._reader.readexactly(2))
+            elif length == 127:
+                (length,) = struct.unpack("!Q", await self._reader.readexactly(8))
+            mask = await self._reader.readexactly(4) if second & 0x80 else None
+            payload = await self._reader.readexactly(length)
+            if mask:
+                repeated = (mask * (length // 4 + 1))[:length]
+                payload = (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(length, "big")
+            if opcode == _OP_PING:
+                self._write_frame(_OP_PONG, payload)
+                continue
+            if opcode == _OP_CLOSE:
+                return None
+            if opcode in (_OP_TEXT, _OP_CONTINUATION):
+                fragments.append(payload)
+                if first & 0x80:
+                    return b"".join(fragments).decode()
+
+    async def close(self) -> None:
+        try:
+            self._write_frame(_OP_CLOSE, b"")
+            await self._writer.drain()
+        except (ConnectionError, RuntimeError):
+            pass
+        self._writer.close()
+
+
+# ----------------------------------------------------------------------
+# Clients
+# ----------------------------------------------------------------------
+
+def _wrap_script(script: str, args: tuple) -> str:
+    """Corps de script façon execute_script (`arguments`, `return`) → expression évaluable."""
+    return f"(function() {{\n{script}\n}}).apply(null, {json.dumps(list(args))})"
+
+
+class AsyncBrowserClient:
+    """Interface commune : scripts évalués en coroutines, soumis depuis le code synchrone."""
+
+    async def evaluate(self, script: str, *args: Any) -> Any:
+        """Équivalent asynchrone de `driver.execute_script(script, *args)` (arguments JSON uniquement)."""
+        raise NotImplementedError
+
+    def run(self, coro: Coroutine, timeout: float = DEVTOOLS_CONFIG['call_timeout']) -> Any:
+        """Exécute une coroutine sur la boucle d'I/O et attend son résultat."""
+        return asyncio.run_coroutine_threadsafe(coro, _io_loop()).result(timeout)
+
+    def gather(self, *coros: Coroutine, timeout: float = DEVTOOLS_CONFIG['call_timeout']) -> List[Any]:
+        """Lance les coroutines ensemble (requêtes en vol simultanément) et attend tous les résultats."""
+        async def _all():
+            return await asyncio.gather(*coros)
+        return self.run(_all(), timeout)
+
+    def close(self) -> None:
+        pass
+
+
+class LocalBrowserClient(AsyncBrowserClient):
+    """Remplaçant local : exécute les scripts sur un driver synchrone (simulateur, tests, repli)."""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    async def evaluate(self, script: str, *args: Any) -> Any:
+        return self.driver.execute_script(script, *args)
+
+
+class DevToolsClient(AsyncBrowserClient):
+    """Connexion DevTools directe à la page du jeu ; requêtes multiplexées par identifiant."""
+
+    def __init__(self, socket: _WebSocket):
+        self._socket = socket
+        self._next_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader_task = asyncio.get_running_loop().create_task(self._read_loop())
+
+    @classmethod
+    async def connect(cls, debugger_address: str, url_hint: Optional[str] = None) -> "DevToolsClient":
+        """Se connecte à la cible « page » (celle dont l'URL contient `url_hint` si fournie)."""
+        loop = asyncio.get_running_loop()
+        listing = await loop.run_in_executor(
+            None, lambda: urlopen(f"http://{debugger_address}/json", timeout=DEVTOOLS_CONFIG['connect_timeout']).read()
+        )
+        pages = [target for target in json.loads(listing) if target.get("type") == "page"]
+        if url_hint:
+            pages.sort(key=lambda target: url_hint not in target.get("url", ""))
+        if not pages or "webSocketDebuggerUrl" not in pages[0]:
+            raise DevToolsError(f"Aucune page DevTools sur {debugger_address}")
+        socket = await asyncio.wait_for(
+            _WebSocket.connect(pages[0]["webSocketDebuggerUrl"]), DEVTOOLS_CONFIG['connect_timeout']
+        )
+        return cls(socket)
+
+    async def _read_loop(self) -> None:
+        try:
+            while True:
+                message = await self._socket.receive()
+                if message is None:
+                    break
+                payload = json.loads(message)
+                future = self._pending.pop(payload.get("id"), None)  # Les événements (sans id) sont ignorés
+                if future is not None and not future.done():
+                    future.set_result(payload)
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            error = e
+        else:
+            error = None
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(DevToolsError(f"Connexion DevTools fermée: {error}"))
+        self._pending.clear()
+
+    async def send(self, method: str, **params: Any) -> Dict[str, Any]:
+        """Commande DevTools brute ; retourne le champ `result` de la réponse."""
+        if self._reader_task.done():
+            raise DevToolsError("Connexion DevTools fermée")
+        self._next_id += 1
+        message_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        await self._socket.send(json.dumps({"id": message_id, "method": method, "params": params}))
+        response = await future
+        if "error" in response:
+            raise DevToolsError(f"{method}: {response['error'].get('message')}")
+        return response.get("result", {})
+
+    async def evaluate(self, script: str, *args: Any) -> Any:
+        result = await self.send(
+            "Runtime.evaluate",
+            expression=_wrap_script(script, args),
+            returnByValue=True,
+            awaitPromise=True,
+        )
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            description = details.get("exception", {}).get("description") or details.get("text")
+            raise DevToolsError(f"Exception JavaScript: {description}")
+        return result.get("result", {}).get("value")
+
+    def close(self) -> None:
+        async def _close():
+            self._reader_task.cancel()
+            await self._socket.close()
+        try:
+            asyncio.run_coroutine_threadsafe(_close(), _io_loop()).result(DEVTOOLS_CONFIG['connect_timeout'])
+        except Exception as e:
+            print(f"[DEVTOOLS] Erreur fermeture: {e}")
+
+
+def open_browser_client(driver, fallback: bool = True) -> Optional[AsyncBrowserClient]:
+    """
+    Client asynchrone pour un driver : DevTools si Chrome expose son adresse de
+    débogage et que la connexion aboutit, sinon remplaçant local sur le driver
+    (ou None si `fallback` est faux).
+    """
+    capabilities = getattr(driver, "capabilities", None) or {}
+    address = capabilities.get("goog:chromeOptions", {}).get("debuggerAddress")
+    if not DEVTOOLS_CONFIG['enabled'] or not address:
+        return LocalBrowserClient(driver) if fallback else None
+    try:
+        async def _connect():
+            return await DevToolsClient.connect(address, url_hint=getattr(driver, "current_url", None))
+        client = asyncio.run_coroutine_threadsafe(_connect(), _io_loop()).result(
+            DEVTOOLS_CONFIG['connect_timeout'] * 2
+        )
+        print(f"[DEVTOOLS] Connecté à {address}")
+        return client
+    except Exception as e:
+        if not fallback:
+            print(f"[DEVTOOLS] Connexion impossible ({e})")
+            return None
+        print(f"[DEVTOOLS] Connexion impossible ({e}), repli sur execute_script")
+        return LocalBrowserClient(driver)
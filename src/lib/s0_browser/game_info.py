@@ -1,12 +1,16 @@
 """Extraction des informations de jeu depuis le DOM (score, vie, etc.)."""
 
+from __future__ import annotations
+
 from dataclasses import dataclass
-from typing import Optional
-from selenium.webdriver.common.by import By
-from selenium.webdriver.remote.webdriver import WebDriver
+from typing import TYPE_CHECKING, Dict, Optional
 
+from .devtools import AsyncBrowserClient
 from .types import BrowserHandle
 
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
 @dataclass
 class GameInfo:
     """Informations sur l'état du jeu extraites du DOM."""
@@ -15,6 +19,20 @@ class GameInfo:
     high_score: int = 0
     mode: str = "unknown"
 
+
+# Éléments lus : score, meilleur score, mode, vies (coeurs)
+GAME_INFO_ELEMENTS = ("score", "high", "mode", "helth")
+
+GAME_INFO_SCRIPT = """
+const texts = {};
+for (const id of arguments[0]) {
+    const element = document.getElementById(id);
+    texts[id] = element ? element.innerText : null;
+}
+return texts;
+"""
+
+
 class GameInfoExtractor:
     """Extrait les informations de jeu depuis le navigateur."""
 
@@ -24,28 +42,34 @@ class GameInfoExtractor:
     def get_game_info(self) -> GameInfo:
         """Récupère les informations actuelles du jeu."""
         try:
-            # Score
-            score_el = self.driver.find_element(By.ID, "score")
-            score = int(score_el.text) if score_el.text.isdigit() else 0
-            
-            # High Score
-            high_el = self.driver.find_element(By.ID, "high")
-            high_score = int(high_el.text) if high_el.text.isdigit() else 0
-            
-            # Mode
-            mode_el = self.driver.find_element(By.ID, "mode")
-            mode = mode_el.text
-            
-            # Lives (Health) - Compter les coeurs
-            health_el = self.driver.find_element(By.ID, "helth") # Sic: "helth" dans le DOM
-            lives = health_el.text.count("♥")
-            
-            return GameInfo(
-                score=score,
-                lives=lives,
-                high_score=high_score,
-                mode=mode
-            )
+            texts = {
+                element_id: self.driver.find_element("id", element_id).text  # By.ID, sans importer Selenium
+                for element_id in GAME_INFO_ELEMENTS
+            }
+            return self._parse(texts)
         except Exception as e:
             print(f"[GameInfo] Erreur extraction: {e}")
             return GameInfo()
+
+    async def get_game_info_async(self, client: AsyncBrowserClient) -> GameInfo:
+        """Même lecture en un seul script, via le client asynchrone (lancée avec la capture)."""
+        try:
+            texts = await client.evaluate(GAME_INFO_SCRIPT, list(GAME_INFO_ELEMENTS))
+            missing = [element_id for element_id in GAME_INFO_ELEMENTS if not texts or texts.get(element_id) is None]
+            if missing:
+                raise RuntimeError(f"éléments introuvables: {missing}")
+            return self._parse(texts)
+        except Exception as e:
+            print(f"[GameInfo] Erreur extraction: {e}")
+            return GameInfo()
+
+    @staticmethod
+    def _parse(texts: Dict[str, str]) -> GameInfo:
+        score = texts["score"]
+        high = texts["high"]
+        return GameInfo(
+            score=int(score) if score.isdigit() else 0,
+            lives=texts["helth"].count("♥"),  # Sic: "helth" dans le DOM ; vies = coeurs
+            high_score=int(high) if high.isdigit() else 0,
+            mode=texts["mode"],
+        )
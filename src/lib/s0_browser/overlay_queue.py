@@ -0,0 +1,135 @@
+"""
+File de rendu asynchrone des overlays de debug (--overlay).
+
+Les modules (vision, solver) soumettent un rendu `func(*args, **kwargs)` :
+le job est sérialisé immédiatement (snapshot immuable : l'itération
+suivante peut muter le contexte d'export sans effet) puis exécuté par un
+processus worker (rendu PIL + écriture PNG/JSON hors du chemin critique).
+
+Contre-pression : si la file est pleine, le rendu est abandonné (frame
+perdue) plutôt que de bloquer le bot.
+"""
+
+from __future__ import annotations
+
+import atexit
+import multiprocessing
+import pickle
+import queue
+from typing import Any, Callable, Optional
+
+from src.config import OVERLAY_RENDER_CONFIG
+
+
+def _worker_main(jobs) -> None:
+    """Boucle du processus worker : exécute les rendus jusqu'au sentinel None."""
+    while True:
+        payload = jobs.get()
+        if payload is None:
+            break
+        try:
+            func, args, kwargs = pickle.loads(payload)
+            func(*args, **kwargs)
+        except Exception as e:
+            print(f"[OVERLAY_QUEUE] Erreur rendu: {e}")
+
+
+class OverlayRenderQueue:
+    """File bornée + processus worker pour les rendus d'overlays."""
+
+    def __init__(self, max_pending: int = OVERLAY_RENDER_CONFIG['max_pending']):
+        self.max_pending = max_pending
+        self.submitted = 0
+        self.dropped = 0
+        # spawn : pas de fork d'un process qui pilote Chrome (et identique sous Windows)
+        self._ctx = multiprocessing.get_context("spawn")
+        self._jobs = None
+        self._process = None
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._jobs = self._ctx.Queue(maxsize=self.max_pending)
+        self._process = self._ctx.Process(
+            target=_worker_main,
+            args=(self._jobs,),
+            name="overlay-render",
+            daemon=True,
+        )
+        self._process.start()
+        print(f"[OVERLAY_QUEUE] Worker démarré (pid={self._process.pid}, file={self.max_pending})")
+
+    def submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> bool:
+        """
+        Soumet un rendu. `func` doit être une fonction de module (picklable).
+
+        Returns:
+            False si la frame est abandonnée (file pleine ou worker arrêté)
+        """
+        if not self.running or self._jobs.full():
+            self.dropped += 1
+            return False
+        try:
+            self._jobs.put_nowait(pickle.dumps((func, args, kwargs), protocol=pickle.HIGHEST_PROTOCOL))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.submitted += 1
+        return True
+
+    def close(self, timeout: float = 30.0) -> None:
+        """Vide la file (rendus en attente terminés) puis arrête le worker."""
+        if not self.running:
+            return
+        try:
+            self._jobs.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+        print(f"[OVERLAY_QUEUE] Worker arrêté ({self.submitted} rendus, {self.dropped} frames abandonnées)")
+        self._process = None
+        self._jobs = None
+
+
+_overlay_queue: Optional[OverlayRenderQueue] = None
+
+
+def get_overlay_queue() -> OverlayRenderQueue:
+    """Retourne la file globale, démarrée à la première utilisation."""
+    global _overlay_queue
+    if _overlay_queue is None:
+        _overlay_queue = OverlayRenderQueue()
+        atexit.register(stop_overlay_queue)
+    if not _overlay_queue.running:
+        _overlay_queue.start()
+    return _overlay_queue
+
+
+def stop_overlay_queue() -> None:
+    """Termine les rendus en attente et arrête le worker global."""
+    if _overlay_queue is not None:
+        _overlay_queue.close()
+
+
+def submit_overlay(func: Callable[..., Any], *args: Any, **kwargs: Any) -> bool:
+    """
+    Rendu d'overlay : asynchrone via le worker si activé, sinon synchrone.
+
+    Returns:
+        False si la frame a été abandonnée (contre-pression)
+    """
+    if not OVERLAY_RENDER_CONFIG['async']:
+        func(*args, **kwargs)
+        return True
+    try:
+        return get_overlay_queue().submit(func, *args, **kwargs)
+    except Exception as e:
+        print(f"[OVERLAY_QUEUE] Worker indisponible, rendu synchrone: {e}")
+        func(*args, **kwargs)
+        return True
@@ -0,0 +1,211 @@
+"""
+Pool de navigateurs Chrome pré-chauffés.
+
+Une session neuve paie le démarrage de Chrome, la résolution du pilote, le
+chargement de la page du jeu et l'injection de la surcouche UI. Le pool
+garde des instances headless prêtes : page chargée et préparation appliquée
+par `warmup` (difficulté, surcouche). Une session en prend une (`acquire`)
+puis la rend (`release`) : une remise à zéro dans la page (`reset`), faite
+au prêt suivant, la rend réutilisable sans relance. Le remplissage tourne
+dans un thread de fond.
+
+Les callbacks `warmup` / `reset` sont fournis par le service de session :
+ce module ne connaît ni le jeu ni la surcouche.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Hashable, Optional
+
+from src.config import BROWSER_POOL_CONFIG
+from .browser import BrowserManager
+from .types import BrowserConfig, BrowserHandle
+
+# warmup(handle, clé) : prépare la page pour la clé (ex. difficulté) ; reset(handle) : nouvelle partie dans la page
+WarmupFn = Callable[[BrowserHandle, Hashable], bool]
+ResetFn = Callable[[BrowserHandle], bool]
+
+
+@dataclass
+class PooledBrowser:
+    """Navigateur du pool, préparé pour une clé."""
+    handle: BrowserHandle
+    key: Hashable
+    games: int = 0  # Sessions déjà jouées sur cette instance
+    dirty: bool = False  # Rendue sans remise à zéro : faite au prochain prêt
+
+
+class BrowserPool:
+    """
+    Au plus `size` instances par clé (prêtes, en préparation ou prêtées),
+    remplies en arrière-plan.
+    """
+
+    def __init__(
+        self,
+        warmup: WarmupFn,
+        reset: ResetFn,
+        config: Optional[BrowserConfig] = None,
+        size: int = BROWSER_POOL_CONFIG['size'],
+        max_reuse: int = BROWSER_POOL_CONFIG['max_reuse'],
+    ):
+        self.warmup = warmup
+        self.reset = reset
+        self.config = config or BrowserConfig(headless=True, maximize=False)
+        self.size = size
+        self.max_reuse = max_reuse
+        self.launched = 0
+        self.reused = 0
+        self._ready: Dict[Hashable, Deque[PooledBrowser]] = {}
+        self._warming: Dict[Hashable, int] = {}
+        self._in_use: Dict[Hashable, int] = {}
+        self._pending: Deque[Hashable] = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    # Remplissage
+    # ------------------------------------------------------------------
+
+    def _count(self, key: Hashable) -> int:
+        return len(self._ready.get(key, ())) + self._warming.get(key, 0) + self._in_use.get(key, 0)
+
+    def prefill(self, key: Hashable) -> None:
+        """Demande au thread de fond de compléter le pool jusqu'à `size` instances pour la clé."""
+        with self._cond:
+            if self._closed:
+                return
+            missing = self.size - self._count(key)
+            for _ in range(max(0, missing)):
+                self._warming[key] = self._warming.get(key, 0) + 1
+                self._pending.append(key)
+            if self._pending and (self._thread is None or not self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._fill_loop, name="browser-pool", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def _fill_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                key = self._pending.popleft()
+            browser = self._launch(key)
+            with self._cond:
+                self._warming[key] -= 1
+                if browser is not None and not self._closed:
+                    self._ready.setdefault(key, deque()).append(browser)
+                    browser = None
+                self._cond.notify_all()
+            if browser is not None:  # Pool fermé pendant la préparation
+                browser.handle.close()
+
+    def _launch(self, key: Hashable) -> Optional[PooledBrowser]:
+        start = time.perf_counter()
+        try:
+            handle = BrowserManager(self.config).start()
+        except Exception as e:
+            print(f"[BROWSER_POOL] Échec du démarrage d'une instance: {e}")
+            return None
+        try:
+            ready = self.warmup(handle, key)
+        except Exception as e:
+            print(f"[BROWSER_POOL] Erreur de préparation: {e}")
+            ready = False
+        if not ready:
+            handle.close()
+            return None
+        self.launched += 1
+        print(f"[BROWSER_POOL] Instance prête pour {key} ({time.perf_counter() - start:.1f}s)")
+        return PooledBrowser(handle=handle, key=key)
+
+    # ------------------------------------------------------------------
+    # Prêt / retour
+    # ------------------------------------------------------------------
+
+    def acquire(self, key: Hashable, timeout: float = BROWSER_POOL_CONFIG['acquire_timeout']) -> PooledBrowser:
+        """
+        Instance prête pour la clé : immédiate si le pool en a une, sinon attend
+        celle en préparation. Le pool est ensuite complété en arrière-plan.
+        """
+        self.prefill(key)
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._in_use[key] = self._in_use.get(key, 0) + 1
+        browser = None
+        while browser is None:
+            with self._cond:
+                while not self._ready.get(key):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or (not self._warming.get(key) and not self._pending):
+                        break
+                    self._cond.wait(remaining)
+                ready = self._ready.get(key)
+                browser = ready.popleft() if ready else None
+            if browser is None:
+                break
+            if browser.dirty and not self._reset(browser):
+                browser.handle.close()
+                browser = None
+        if browser is None:
+            # Préparation en échec ou trop lente : démarrage direct (mêmes erreurs qu'une session classique)
+            print("[BROWSER_POOL] Aucune instance prête, démarrage direct")
+            browser = self._launch(key)
+            if browser is None:
+                with self._cond:
+                    self._in_use[key] -= 1
+                raise RuntimeError(f"Impossible de préparer un navigateur pour {key}")
+        elif browser.games:
+            self.reused += 1
+        self.prefill(key)
+        return browser
+
+    def _reset(self, browser: PooledBrowser) -> bool:
+        """Nouvelle partie dans la page d'une instance rendue ; False si elle est inutilisable."""
+        try:
+            reusable = self.reset(browser.handle)
+        except Exception as e:
+            print(f"[BROWSER_POOL] Remise à zéro impossible: {e}")
+            reusable = False
+        browser.dirty = not reusable
+        return reusable
+
+    def release(self, browser: PooledBrowser, reuse: bool = True) -> None:
+        """
+        Rend une instance : retour au pool si elle reste réutilisable, sinon fermeture.
+        La remise à zéro dans la page est différée au prochain `acquire` : rien
+        n'est fait pour une instance que personne ne reprend (fin de programme).
+        """
+        browser.games += 1
+        with self._cond:
+            self._in_use[browser.key] -= 1
+            if (reuse and browser.games < self.max_reuse and browser.handle.is_started
+                    and not self._closed and self._count(browser.key) < self.size):
+                browser.dirty = True
+                self._ready.setdefault(browser.key, deque()).append(browser)
+                self._cond.notify_all()
+                return
+        browser.handle.close()
+
+    def shutdown(self) -> None:
+        """Ferme toutes les instances prêtes ; celles en préparation sont fermées à leur sortie."""
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            browsers = [browser for ready in self._ready.values() for browser in ready]
+            self._ready.clear()
+            self._cond.notify_all()
+        for browser in browsers:
+            try:
+                browser.handle.close()
+            except Exception as e:
+                print(f"[BROWSER_POOL] Erreur fermeture: {e}")
+        if self.launched:
+            print(f"[BROWSER_POOL] Arrêté ({self.launched} instances démarrées, {self.reused} réutilisations)")
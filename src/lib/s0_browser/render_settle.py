@@ -0,0 +1,107 @@
+"""Détection de fin de rendu du jeu (remplace les délais fixes)."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from src.config import RENDER_SETTLE_CONFIG
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+# Hook injecté une seule fois : chaque primitive de dessin 2D horodate
+# window.__botLastCanvasDraw, sauf pour les canvas de l'overlay du bot
+# (id "bot-ui-*") qui redessinent en continu.
+_SETTLE_SCRIPT = """
+const quietMs = arguments[0];
+const timeoutMs = arguments[1];
+const pollMs = arguments[2];
+const done = arguments[arguments.length - 1];
+
+if (!window.__botRenderHook) {
+    const proto = window.CanvasRenderingContext2D && window.CanvasRenderingContext2D.prototype;
+    if (!proto) { done(null); return; }
+    const methods = ['drawImage', 'putImageData', 'fillRect', 'clearRect', 'strokeRect',
+                     'fillText', 'strokeText', 'fill', 'stroke'];
+    for (const name of methods) {
+        const original = proto[name];
+        if (typeof original !== 'function') continue;
+        proto[name] = function() {
+            const c = this.canvas;
+            if (!c || !c.id || c.id.indexOf('bot-ui') !== 0) {
+                window.__botLastCanvasDraw = performance.now();
+            }
+            return original.apply(this, arguments);
+        };
+    }
+    window.__botLastCanvasDraw = performance.now();
+    window.__botRenderHook = true;
+}
+
+const start = performance.now();
+(function check() {
+    const now = performance.now();
+    // On attend au moins une fenêtre complète après l'appel : un clic
+    // peut ne déclencher le redessin qu'à la frame suivante.
+    const last = Math.max(window.__botLastCanvasDraw || 0, start);
+    if (now - last >= quietMs) { done({settled: true, waited: now - start}); return; }
+    if (now - start >= timeoutMs) { done({settled: false, waited: now - start}); return; }
+    setTimeout(check, pollMs);
+})();
+"""
+
+
+@dataclass
+class SettleResult:
+    """Résultat d'une attente de stabilisation du rendu."""
+    settled: bool
+    waited: float       # Temps réellement attendu (s)
+    max_wait: float     # Budget accordé (s)
+
+    @property
+    def idle_saved(self) -> float:
+        """Temps économisé par rapport au délai fixe."""
+        return max(0.0, self.max_wait - self.waited)
+
+
+def wait_render_settled(
+    driver: WebDriver,
+    max_wait: float,
+    quiet_ms: int | None = None,
+) -> SettleResult:
+    """
+    Attend qu'aucune tuile canvas n'ait été redessinée depuis `quiet_ms`,
+    dans la limite de `max_wait` secondes.
+    Fallback : sleep complet si la détection est désactivée ou indisponible.
+    """
+    if max_wait <= 0:
+        return SettleResult(settled=True, waited=0.0, max_wait=0.0)
+
+    if not RENDER_SETTLE_CONFIG.get('enabled', True):
+        time.sleep(max_wait)
+        return SettleResult(settled=False, waited=max_wait, max_wait=max_wait)
+
+    quiet = RENDER_SETTLE_CONFIG['quiet_ms'] if quiet_ms is None else quiet_ms
+    start = time.perf_counter()
+    try:
+        payload = driver.execute_async_script(
+            _SETTLE_SCRIPT,
+            quiet,
+            int(max_wait * 1000),
+            RENDER_SETTLE_CONFIG['poll_ms'],
+        )
+    except Exception as e:
+        print(f"[SETTLE] Erreur détection rendu: {e}")
+        payload = None
+
+    if not payload:
+        # Hook indisponible : on complète jusqu'au délai fixe
+        remaining = max_wait - (time.perf_counter() - start)
+        if remaining > 0:
+            time.sleep(remaining)
+        return SettleResult(settled=False, waited=max_wait, max_wait=max_wait)
+
+    waited = min(time.perf_counter() - start, max_wait)
+    return SettleResult(settled=bool(payload.get('settled')), waited=waited, max_wait=max_wait)
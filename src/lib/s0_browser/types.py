@@ -1,8 +1,12 @@
 """Types pour le module s0_browser."""
 
+from __future__ import annotations
+
 from dataclasses import dataclass
-from typing import Optional, Any
-from selenium.webdriver.remote.webdriver import WebDriver
+from typing import TYPE_CHECKING, Optional, Any
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
 
 
 @dataclass
@@ -1,15 +1,16 @@
 """Localisation des canvas (512×512) autour de #anchor."""
 
+from __future__ import annotations
+
 import re
 import time
-from typing import List, Tuple, Optional, Dict
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.remote.webdriver import WebDriver
+from typing import TYPE_CHECKING, List, Tuple, Optional, Dict
 
 from .types import CanvasInfo
 
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
 
 class CanvasLocator:
     """Localise les canvases et renvoie leurs offsets absolus/relatifs."""
@@ -43,6 +44,10 @@ class CanvasLocator:
     def _get_anchor_element(self):
         self._require_driver()
         if not self._anchor_element:
+            from selenium.webdriver.common.by import By  # Import différé (démarrage)
+            from selenium.webdriver.support.ui import WebDriverWait
+            from selenium.webdriver.support import expected_conditions as EC
+
             self._anchor_element = WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, self.anchor_selector))
             )
@@ -95,6 +100,10 @@ class CanvasLocator:
 
     def locate(self, canvas_id: str) -> CanvasInfo:
         """Mesure la position d'un canvas spécifique."""
+        from selenium.webdriver.common.by import By  # Import différé (démarrage)
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
         self._require_driver()
         canvas = WebDriverWait(self.driver, 10).until(
             EC.presence_of_element_located((By.ID, canvas_id))
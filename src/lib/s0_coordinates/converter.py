@@ -1,12 +1,16 @@
 """Conversion de coordonnées grille ↔ canvas ↔ écran."""
 
+from __future__ import annotations
+
 import math
-from typing import Tuple, Optional
-from selenium.webdriver.remote.webdriver import WebDriver
+from typing import TYPE_CHECKING, Tuple, Optional
 
 from .types import Coord, ScreenPoint, GridBounds
 from src.config import GRID_REFERENCE_POINT
 
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
 DEFAULT_CELL_SIZE = 24
 DEFAULT_CELL_BORDER = 1
 
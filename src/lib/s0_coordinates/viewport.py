@@ -1,15 +1,16 @@
 """Gestion du viewport et des zones visibles."""
 
+from __future__ import annotations
+
 import math
-from typing import List, Tuple, Optional, Dict, Any
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.remote.webdriver import WebDriver
+from typing import TYPE_CHECKING, List, Tuple, Optional, Dict, Any
 
 from .types import Coord, GridBounds, ViewportInfo
 from .converter import CoordinateConverter
 
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
 
 class ViewportMapper:
     """Lecture des limites du viewport et des zones visibles."""
@@ -30,6 +31,10 @@ class ViewportMapper:
             raise RuntimeError("Driver requis pour ViewportMapper")
 
         if not self._control_element:
+            from selenium.webdriver.common.by import By  # Import différé (démarrage)
+            from selenium.webdriver.support.ui import WebDriverWait
+            from selenium.webdriver.support import expected_conditions as EC
+
             self._control_element = WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.ID, "control"))
             )
@@ -2,6 +2,8 @@
 Overlay UI pour le bot 1000mines.
 """
 
+from importlib import import_module
+
 from .types import OverlayType, OverlayData, CellOverlayData, ActionOverlayData
 
 # Nouveau système UI temps réel
@@ -11,9 +13,28 @@ from .ui_controller import (
     StatusCellData,
     ActionCellData,
     ProbabilityCellData,
+    ControlState,
     get_ui_controller,
 )
 
+# Peintre PNG (PIL.ImageDraw) : chargé au premier accès (démarrage rapide)
+_LAZY_EXPORTS = {
+    "CellPainter": ".painter",
+    "rect_pattern": ".painter",
+    "text_sprite": ".painter",
+    "lines_sprite": ".painter",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
 __all__ = [
     'OverlayType',
     'OverlayData',
@@ -24,5 +45,10 @@ __all__ = [
     'StatusCellData',
     'ActionCellData',
     'ProbabilityCellData',
+    'ControlState',
     'get_ui_controller',
+    'CellPainter',
+    'rect_pattern',
+    'text_sprite',
+    'lines_sprite',
 ]
@@ -47,6 +47,10 @@
     BUTTON_HOVER: 'rgba(60, 80, 120, 0.5)',
   };
 
+  // === CODES STATUS (protocole delta, ordre partagé avec ui_controller.py) ===
+  const STATUS_CODES = [null, 'ACTIVE', 'FRONTIER', 'TO_VISUALIZE', 'MINE', 'SOLVED', 'UNREVEALED'];
+  const FOCUS_CODES = [null, 'TO_REDUCE', 'REDUCED', 'TO_PROCESS', 'PROCESSED'];
+
   // === ÉTAT GLOBAL ===
   const state = {
     initialized: false,
@@ -61,6 +65,7 @@
       actions: null,   // Actions planifiées (SAFE, FLAG, GUESS)
       probabilities: null, // Probabilités CSP
     },
+    statusVersion: 0,  // Version du dernier delta status appliqué
 
     // Éléments DOM
     anchorElement: null,
@@ -383,6 +388,45 @@
     }
   }
 
+  /**
+   * Applique un delta status packé (triplets int32 LE col,row,code en base64).
+   * code = statut | (focus << 4), 0 = cellule retirée.
+   * Refuse le delta si baseVersion ne correspond pas (Python renvoie alors tout avec reset).
+   */
+  function applyStatusDelta(baseVersion, version, packed, reset) {
+    let cells = state.data.status && state.data.status.cells instanceof Map ? state.data.status.cells : null;
+    if (reset || !cells) {
+      if (!reset) return { ok: false, version: state.statusVersion };
+      cells = new Map();
+    } else if (baseVersion !== state.statusVersion) {
+      return { ok: false, version: state.statusVersion };
+    }
+
+    const binary = atob(packed);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+    const view = new DataView(bytes.buffer);
+
+    for (let i = 0; i + 12 <= bytes.length; i += 12) {
+      const col = view.getInt32(i, true);
+      const row = view.getInt32(i + 4, true);
+      const code = view.getInt32(i + 8, true);
+      const key = `${col},${row}`;
+      if (code === 0) {
+        cells.delete(key);
+      } else {
+        cells.set(key, { col, row, status: STATUS_CODES[code & 15], focus_level: FOCUS_CODES[code >> 4] });
+      }
+    }
+
+    state.data.status = { cells };
+    state.statusVersion = version;
+    if (state.currentOverlay === 'status') {
+      render();
+    }
+    return { ok: true, version };
+  }
+
   // === RENDU ===
   function startRenderLoop() {
     let lastTime = 0;
@@ -653,7 +697,8 @@
     const type = state.botRunning ? 'success' : 'warning';
     showToast(message, type);
 
-    // Émettre un événement custom pour Python
+    // Événement pour Python (réveille une attente en pause) + événement DOM
+    pushEvent(state.botRunning ? 'start' : 'pause');
     const event = state.botRunning ? 'botui:start' : 'botui:pause';
     window.dispatchEvent(new CustomEvent(event));
   }
@@ -661,14 +706,45 @@
   function restartGame() {
     showToast('Redémarrage de la partie...', 'info');
 
-    // Flag pour que Python puisse le détecter
-    window.__botui_restart_requested = true;
-    window.__botui_auto_restart = true;  // Indique qu'il faut auto-relancer comme 'y'
-
-    // Émettre un événement custom pour Python
+    // Événement pour Python (restart en cours de partie ou relance en fin de partie)
+    pushEvent('restart');
     window.dispatchEvent(new CustomEvent('botui:restart'));
   }
 
+  // === FILE D'ÉVÉNEMENTS DE CONTRÔLE ===
+  // Python la vide en un seul appel par itération (drainControl) ou attend
+  // le prochain événement en un appel asynchrone (waitControl, en pause).
+  const controlEvents = [];
+  let controlWaiter = null;
+
+  function pushEvent(type) {
+    controlEvents.push(type);
+    if (controlWaiter) controlWaiter();
+  }
+
+  function drainControl() {
+    return {
+      events: controlEvents.splice(0),
+      botRunning: state.botRunning,
+      autoExploration: state.autoExploration,
+    };
+  }
+
+  function waitControl(timeoutMs, callback) {
+    if (controlEvents.length) {
+      callback(drainControl());
+      return;
+    }
+    // Un seul client Python : une attente abandonnée est remplacée par la nouvelle
+    const finish = () => {
+      clearTimeout(timer);
+      if (controlWaiter === finish) controlWaiter = null;
+      callback(drainControl());
+    };
+    const timer = setTimeout(finish, timeoutMs);
+    controlWaiter = finish;
+  }
+
   function updateBotButtons() {
     const toggleBtn = document.getElementById('bot-toggle');
 
@@ -794,6 +870,19 @@
     state.ctx = null;
     state.menuElement = null;
     state.data = { status: null, actions: null, probabilities: null };
+    state.statusVersion = 0;
+  }
+
+  // === REMISE À ZÉRO (navigateur réutilisé par le pool) ===
+  function reset() {
+    // Nouvelle partie dans la même page : on garde la structure DOM et la boucle de rendu
+    state.data = { status: null, actions: null, probabilities: null };
+    state.statusVersion = 0;
+    controlEvents.length = 0;
+    // L'observateur score/vies ne doit pas prendre ce restart pour un redémarrage manuel
+    window.__manual_restart_in_progress = true;
+    setTimeout(() => { window.__manual_restart_in_progress = false; }, 1000);
+    render();
   }
 
   // === CONTROL STATE ===
@@ -814,11 +903,16 @@
   window.BotUI = {
     init,
     destroy,
+    reset,
     setOverlay,
     updateData,
+    applyStatusDelta,
     render,
     toggleBot,
     restartGame,
+    pushEvent,
+    drainControl,
+    waitControl,
     showToast,
     getState: () => ({ ...state }),
     isRunning: () => state.botRunning,
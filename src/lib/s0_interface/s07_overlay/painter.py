@@ -0,0 +1,227 @@
+"""
+Peintre vectorisé pour les overlays PNG de debug (vision, solver).
+
+Au lieu d'un `ImageDraw.rectangle` par cellule, chaque couche (une couleur)
+est un masque booléen sur le réseau des cellules (R, C). Les couches sont
+accumulées en couleurs par cellule et par motif (fond, contour...), puis
+étendues en espace pixel en une seule indexation (équivalent `np.kron`
+du réseau par le motif de cellule stride × stride).
+
+Les textes sont rendus une fois par libellé (sprite RGBA mis en cache)
+puis tamponnés sur toutes les cellules concernées en une opération.
+
+Sémantique d'ImageDraw sur un calque RGBA transparent : une couche écrase
+les précédentes ; les sprites sont composés après les aplats ; le calque
+est ensuite composé (alpha) sur l'image de base.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+Color = Tuple[int, int, int, int]
+
+# Marge du canvas à droite/en bas : les sprites de texte peuvent déborder de la cellule
+SPRITE_PAD = 64
+
+_sprite_cache: Dict[tuple, np.ndarray] = {}
+
+
+def _font_key(font) -> tuple:
+    # Les polices sont rechargées à chaque rendu : clé sur le fichier et la taille, pas l'objet
+    return (getattr(font, "path", None), getattr(font, "size", None))
+
+
+def text_sprite(text: str, font, fill: Color = (255, 255, 255, 255)) -> np.ndarray:
+    """Sprite RGBA (h, w, 4) d'un texte, tel que dessiné par ImageDraw.text en (0, 0)."""
+    key = (text, _font_key(font), fill)
+    sprite = _sprite_cache.get(key)
+    if sprite is None:
+        left, top, right, bottom = font.getbbox(text or " ")
+        image = Image.new("RGBA", (max(1, right), max(1, bottom)), (0, 0, 0, 0))
+        ImageDraw.Draw(image).text((0, 0), text, font=font, fill=fill)
+        sprite = np.asarray(image, dtype=np.uint8)[:SPRITE_PAD, :SPRITE_PAD]
+        _sprite_cache[key] = sprite
+    return sprite
+
+
+def lines_sprite(lines: Tuple[Tuple[str, int], ...], font, fill: Color = (255, 255, 255, 255)) -> np.ndarray:
+    """Sprite de plusieurs textes superposés : ((texte, décalage_y), ...) dessinés en x = 0."""
+    key = (lines, _font_key(font), fill)
+    sprite = _sprite_cache.get(key)
+    if sprite is None:
+        boxes = [font.getbbox(text or " ") for text, _ in lines]
+        width = max(box[2] for box in boxes)
+        height = max(box[3] + dy for box, (_, dy) in zip(boxes, lines))
+        image = Image.new("RGBA", (max(1, width), max(1, height)), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+        for text, dy in lines:
+            draw.text((0, dy), text, font=font, fill=fill)
+        sprite = np.asarray(image, dtype=np.uint8)[:SPRITE_PAD, :SPRITE_PAD]
+        _sprite_cache[key] = sprite
+    return sprite
+
+
+def rect_pattern(stride: int, x0: int, y0: int, x1: int, y1: int, outline_only: bool = False) -> np.ndarray:
+    """
+    Motif booléen (stride, stride) d'un rectangle à bornes incluses (comme ImageDraw),
+    relatif au coin de la cellule. Le motif est tronqué au pas du réseau.
+    """
+    pattern = np.zeros((stride, stride), dtype=bool)
+    if x1 < x0 or y1 < y0:
+        return pattern
+    pattern[y0:y1 + 1, x0:x1 + 1] = True
+    if outline_only:
+        pattern[y0 + 1:y1, x0 + 1:x1] = False
+    return pattern
+
+
+class CellPainter:
+    """
+    Calque RGBA peint par couches de cellules.
+
+    Le pixel (x, y) du coin de la cellule (col, row) vaut
+    (origin_x + col * stride, origin_y + row * stride).
+    """
+
+    def __init__(self, size: Tuple[int, int], origin: Tuple[int, int], stride: int):
+        self.width, self.height = size
+        self.origin_x, self.origin_y = origin
+        self.stride = stride
+
+        # Réseau des cellules recouvrant l'image (cellules partiellement visibles incluses)
+        self.col0 = math.floor(-self.origin_x / stride)
+        self.row0 = math.floor(-self.origin_y / stride)
+        self.cols = max(0, math.floor((self.width - 1 - self.origin_x) / stride) - self.col0 + 1)
+        self.rows = max(0, math.floor((self.height - 1 - self.origin_y) / stride) - self.row0 + 1)
+
+        # Décalage image → canvas (>= 0 : le canvas commence sur un coin de cellule)
+        self.offset_x = -(self.origin_x + self.col0 * stride)
+        self.offset_y = -(self.origin_y + self.row0 * stride)
+
+        self.canvas = np.zeros(
+            (self.rows * stride + SPRITE_PAD, self.cols * stride + SPRITE_PAD, 4),
+            dtype=np.uint8,
+        )
+        # Aplats différés : par motif, couleur et numéro d'ordre de la dernière couche par cellule
+        self._patterns: list = []
+        self._colors: list = []
+        self._order: list = []
+        self._sequence = 0
+        self._stamps: list = []
+
+    def lattice_mask(self, coords: Iterable[Tuple[int, int]]) -> Optional[np.ndarray]:
+        """Masque (R, C) des cellules (col, row) présentes sur l'image, None si aucune."""
+        array = np.fromiter(
+            (v for coord in coords for v in coord), dtype=np.int64
+        ).reshape(-1, 2)
+        if not len(array):
+            return None
+        cols = array[:, 0] - self.col0
+        rows = array[:, 1] - self.row0
+        keep = (cols >= 0) & (cols < self.cols) & (rows >= 0) & (rows < self.rows)
+        if not keep.any():
+            return None
+        mask = np.zeros((self.rows, self.cols), dtype=bool)
+        mask[rows[keep], cols[keep]] = True
+        return mask
+
+    def _pattern_index(self, pattern: np.ndarray) -> int:
+        for index, known in enumerate(self._patterns):
+            if known is pattern or np.array_equal(known, pattern):
+                return index
+        self._patterns.append(pattern)
+        self._colors.append(np.zeros((self.rows, self.cols, 4), dtype=np.uint8))
+        self._order.append(np.zeros((self.rows, self.cols), dtype=np.int32))
+        return len(self._patterns) - 1
+
+    def fill(self, mask: Optional[np.ndarray], pattern: np.ndarray, color: Color) -> None:
+        """Peint `pattern` de couleur `color` dans toutes les cellules du masque (écrase)."""
+        if mask is None:
+            return
+        index = self._pattern_index(pattern)
+        self._sequence += 1
+        self._colors[index][mask] = color
+        self._order[index][mask] = self._sequence
+
+    def stamp(self, mask: Optional[np.ndarray], sprite: np.ndarray, offset: Tuple[int, int]) -> None:
+        """Compose (alpha « over ») le sprite à `offset` du coin de chaque cellule du masque."""
+        if mask is not None:
+            self._stamps.append((mask, sprite, offset))
+
+    def _render_fills(self) -> None:
+        """Étend les couleurs par cellule en pixels : une indexation pour tout le calque."""
+        if not self._patterns or not self.rows or not self.cols:
+            return
+        stride = self.stride
+        # Régions du bloc stride × stride : pixels couverts par le même ensemble de motifs
+        coverage = np.stack(self._patterns)  # (P, s, s)
+        signatures, region_map = np.unique(
+            coverage.reshape(len(self._patterns), -1).T, axis=0, return_inverse=True
+        )
+        region_map = region_map.reshape(stride, stride)
+
+        # Couleur par (cellule, région) : le motif de plus grand ordre l'emporte
+        colors = np.stack(self._colors)  # (P, R, C, 4)
+        order = np.stack(self._order)    # (P, R, C)
+        per_region = np.zeros((self.rows, self.cols, len(signatures), 4), dtype=np.uint8)
+        for region, signature in enumerate(signatures):
+            covering = np.flatnonzero(signature)
+            if not len(covering):
+                continue
+            if len(covering) == 1:
+                per_region[:, :, region] = colors[covering[0]]
+            else:
+                winner = covering[np.argmax(order[covering], axis=0)]
+                per_region[:, :, region] = np.take_along_axis(
+                    colors, winner[None, :, :, None], axis=0
+                )[0]
+
+        # Pixels RGBA manipulés comme uint32 : (R, C, s, s) → vue (R, s, C, s) du canvas
+        pixels = np.take(per_region.view(np.uint32)[..., 0], region_map, axis=2)
+        canvas32 = self.canvas.view(np.uint32)[..., 0]
+        canvas32[:self.rows * stride, :self.cols * stride].reshape(
+            self.rows, stride, self.cols, stride
+        )[...] = pixels.transpose(0, 2, 1, 3)
+
+    def _apply_stamp(self, mask: np.ndarray, sprite: np.ndarray, offset: Tuple[int, int]) -> None:
+        rows, cols = np.nonzero(mask)
+        h, w = sprite.shape[:2]
+        ys = (rows * self.stride + offset[1])[:, None] + np.arange(h)
+        xs = (cols * self.stride + offset[0])[:, None] + np.arange(w)
+        ys = np.clip(ys, 0, self.canvas.shape[0] - 1)[:, :, None]
+        xs = np.clip(xs, 0, self.canvas.shape[1] - 1)[:, None, :]
+
+        # Seuls les pixels couverts par le glyphe sont recomposés
+        covered = sprite[..., 3] > 0
+        ys, xs = np.broadcast_to(ys, (len(rows), h, w))[:, covered], np.broadcast_to(xs, (len(rows), h, w))[:, covered]
+        src = sprite[covered].astype(np.uint16)
+        dst = self.canvas[ys, xs].astype(np.uint16)
+        alpha = src[:, 3:4]
+        out = np.empty_like(dst)
+        out[..., :3] = (src[:, :3] * alpha + dst[..., :3] * (255 - alpha) + 127) // 255
+        out[..., 3:] = alpha + (dst[..., 3:] * (255 - alpha) + 127) // 255
+        self.canvas[ys, xs] = out.astype(np.uint8)
+
+    def render(self) -> None:
+        """Matérialise les aplats puis les sprites (idempotent)."""
+        if self._patterns:
+            self._render_fills()
+            self._patterns, self._colors, self._order = [], [], []
+        for stamp in self._stamps:
+            self._apply_stamp(*stamp)
+        self._stamps = []
+
+    def overlay(self) -> Image.Image:
+        """Calque RGBA à la taille de l'image."""
+        self.render()
+        layer = self.canvas[self.offset_y:self.offset_y + self.height, self.offset_x:self.offset_x + self.width]
+        return Image.fromarray(np.ascontiguousarray(layer))
+
+    def composite(self, base_image: Image.Image) -> Image.Image:
+        """Compose le calque sur l'image de base (une seule opération alpha)."""
+        return Image.alpha_composite(base_image.convert("RGBA"), self.overlay())
@@ -4,12 +4,19 @@ Contrôleur pour la surcouche UI temps réel dans Selenium.
 Gère l'injection et la communication avec BotUI JavaScript.
 """
 
+from __future__ import annotations
+
+import base64
 import json
+import struct
+import time
 from pathlib import Path
-from typing import Optional, Dict, Any, List
-from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
-from selenium.webdriver.remote.webdriver import WebDriver
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
 
 
 class UIOverlayType(str, Enum):
@@ -29,6 +36,25 @@ class StatusCellData:
     focus_level: Optional[str] = None  # TO_REDUCE, REDUCED, TO_PROCESS, PROCESSED
 
 
+# Codage compact des statuts (protocole delta) : code = statut | (focus << 4), 0 = cellule retirée
+# Ordre partagé avec STATUS_CODES / FOCUS_CODES de overlay_ui.js
+STATUS_CODES = (None, 'ACTIVE', 'FRONTIER', 'TO_VISUALIZE', 'MINE', 'SOLVED', 'UNREVEALED')
+FOCUS_CODES = (None, 'TO_REDUCE', 'REDUCED', 'TO_PROCESS', 'PROCESSED')
+_STATUS_INDEX = {name: i for i, name in enumerate(STATUS_CODES)}
+_FOCUS_INDEX = {name: i for i, name in enumerate(FOCUS_CODES)}
+
+
+def encode_status(status: str, focus_level: Optional[str] = None) -> int:
+    """Code compact (1 octet utile) d'un statut + focus level."""
+    return _STATUS_INDEX.get(status, 0) | (_FOCUS_INDEX.get(focus_level, 0) << 4)
+
+
+def pack_status_delta(entries: List[Tuple[int, int, int]]) -> str:
+    """Triplets (col, row, code) → int32 little-endian encodés en base64."""
+    flat = [value for entry in entries for value in entry]
+    return base64.b64encode(struct.pack(f"<{len(flat)}i", *flat)).decode("ascii")
+
+
 @dataclass
 class ActionCellData:
     """Données d'une action pour l'overlay actions."""
@@ -48,10 +74,20 @@ class ProbabilityCellData:
 
 @dataclass
 class ControlState:
-    """État de contrôle du bot."""
+    """État de contrôle du bot et événements vidés de la file de la page."""
     bot_running: bool = False
     auto_exploration: bool = True
+    events: List[str] = field(default_factory=list)  # start, pause, restart, manual_restart
 
+    @property
+    def restart_requested(self) -> bool:
+        """Bouton Restart de la surcouche (F6)."""
+        return "restart" in self.events
+
+    @property
+    def manual_restart(self) -> bool:
+        """Clic sur un bouton restart/difficulté du jeu, ou score remis à zéro."""
+        return "manual_restart" in self.events
 
 
 class UIController:
@@ -65,7 +101,13 @@ class UIController:
         self._js_code: Optional[str] = None
         self._is_injected = False
         self._bot_running = True
-        self._restart_requested = False
+        # État status connu côté page (protocole delta versionné)
+        self._status_synced: Optional[Dict[Tuple[int, int], int]] = None
+        self._status_version = 0
+        # Culling viewport : bornes (min_col, min_row, max_col, max_row) marge incluse, None = tout envoyer
+        from .ui_data_converter import SpatialCellIndex  # import local (dépendance circulaire)
+        self.visible_bounds: Optional[Tuple[int, int, int, int]] = None
+        self.spatial_index = SpatialCellIndex()
     
     def _load_js(self) -> str:
         """Charge le code JavaScript de l'UI."""
@@ -84,6 +126,16 @@ class UIController:
         Returns:
             True si succès
         """
+        self._is_injected = self.install(driver)
+        if self._is_injected:
+            self._reset_status_sync()
+        return self._is_injected
+    
+    def install(self, driver: WebDriver) -> bool:
+        """
+        Installe la surcouche dans une page sans toucher à l'état du contrôleur
+        (pré-injection dans les navigateurs du pool, depuis son thread de fond).
+        """
         try:
             # Charger et injecter le JS
             js_code = self._load_js()
@@ -92,21 +144,36 @@ class UIController:
             # Initialiser
             result = driver.execute_script("return window.BotUI ? window.BotUI.init() : false;")
             
-            if result:
-                self._is_injected = True
-                print("[UI] Surcouche UI injectée")
-                
-                # Injecter écouteurs pour détecter les redémarrages manuels
-                self._inject_restart_listeners(driver)
-            else:
+            if not result:
                 print("[UI] Échec initialisation UI")
-                self._is_injected = False
+                return False
+            print("[UI] Surcouche UI injectée")
             
-            return self._is_injected
+            # Injecter écouteurs pour détecter les redémarrages manuels
+            self._inject_restart_listeners(driver)
+            return True
             
         except Exception as e:
             print(f"[UI] Erreur injection: {e}")
-            self._is_injected = False
+            return False
+    
+    def adopt(self, driver: WebDriver) -> bool:
+        """Prend le contrôle d'une page où la surcouche est déjà installée (sinon l'injecte)."""
+        if not self.is_ready(driver):
+            return self.inject(driver)
+        self._is_injected = True
+        self._reset_status_sync()
+        print("[UI] Surcouche UI pré-injectée reprise")
+        return True
+    
+    def reset(self, driver: WebDriver) -> bool:
+        """Efface les données de la surcouche pour une nouvelle partie (structure DOM conservée)."""
+        self._reset_status_sync()
+        try:
+            driver.execute_script("if (window.BotUI) window.BotUI.reset();")
+            return True
+        except Exception as e:
+            print(f"[UI] Erreur reset: {e}")
             return False
     
     def _inject_restart_listeners(self, driver: WebDriver) -> None:
@@ -120,7 +187,7 @@ class UIController:
                 const handleRestart = () => {
                     if (window.__manual_restart_in_progress) return;
                     window.__manual_restart_in_progress = true;
-                    window.__manual_restart_requested = true;
+                    if (window.BotUI) window.BotUI.pushEvent('manual_restart');
                     console.log('[BOT] Redémarrage manuel détecté');
                     setTimeout(() => { window.__manual_restart_in_progress = false; }, 1000);
                 };
@@ -157,7 +224,7 @@ class UIController:
                             if (lastScore > 0 && score === 0 && lives === 3) {
                                 if (!window.__manual_restart_in_progress) {
                                     window.__manual_restart_in_progress = true;
-                                    window.__manual_restart_requested = true;
+                                    if (window.BotUI) window.BotUI.pushEvent('manual_restart');
                                     console.log('[BOT] Redémarrage détecté (score=0, lives=3)');
                                     setTimeout(() => { window.__manual_restart_in_progress = false; }, 1000);
                                 }
@@ -199,25 +266,76 @@ class UIController:
             print(f"[UI] Erreur setOverlay: {e}")
             return False
     
+    def set_visible_bounds(self, bounds: Optional[Tuple[int, int, int, int]]) -> None:
+        """Définit la zone visible (marge incluse) utilisée pour filtrer les envois."""
+        self.visible_bounds = bounds
+
+    def _cull(self, cells: List[Any]) -> List[Any]:
+        """Écarte les cellules hors de la zone visible avant le passage WebDriver."""
+        if self.visible_bounds is None:
+            return cells
+        from .ui_data_converter import filter_visible_cells
+        return filter_visible_cells(cells, self.visible_bounds)
+
+    def _reset_status_sync(self) -> None:
+        """Oublie l'état status côté page : le prochain envoi sera complet."""
+        self._status_synced = None
+        self._status_version = 0
+
+    def _send_status_delta(
+        self,
+        driver: WebDriver,
+        entries: List[Tuple[int, int, int]],
+        reset: bool,
+    ) -> bool:
+        version = self._status_version + 1
+        result = driver.execute_script(
+            "return window.BotUI.applyStatusDelta(arguments[0], arguments[1], arguments[2], arguments[3]);",
+            self._status_version,
+            version,
+            pack_status_delta(entries),
+            reset,
+        )
+        if not result or not result.get('ok'):
+            return False
+        self._status_version = version
+        return True
+
     def update_status(self, driver: WebDriver, cells: List[StatusCellData]) -> bool:
-        """Met à jour les données de l'overlay status."""
+        """
+        Met à jour les données de l'overlay status.
+
+        Seules les cellules visibles (cf. set_visible_bounds) et modifiées
+        depuis le dernier envoi sont transmises
+        (triplets col,row,code packés en base64). BotUI garde l'état en page
+        et vérifie la version : en cas de désynchronisation (page rechargée,
+        UI réinjectée), un envoi complet est refait.
+        """
         if not self.ensure_injected(driver):
             return False
         try:
-            data = {
-                'cells': [
-                    {
-                        'col': c.col, 
-                        'row': c.row, 
-                        'status': c.status,
-                        'focus_level': c.focus_level
-                    }
-                    for c in cells
-                ]
-            }
-            driver.execute_script(f"window.BotUI.updateData('status', {json.dumps(data)});")
-            return True
+            codes = {(c.col, c.row): encode_status(c.status, c.focus_level) for c in self._cull(cells)}
+            previous = self._status_synced
+
+            if previous is not None:
+                entries = [(col, row, code) for (col, row), code in codes.items() if previous.get((col, row)) != code]
+                entries.extend((col, row, 0) for (col, row) in previous.keys() - codes.keys())
+                if not entries:
+                    return True
+                if self._send_status_delta(driver, entries, reset=False):
+                    self._status_synced = codes
+                    return True
+                print("[UI] Overlay status désynchronisé, renvoi complet")
+
+            # Envoi complet (premier envoi ou resynchronisation)
+            full = [(col, row, code) for (col, row), code in codes.items()]
+            if self._send_status_delta(driver, full, reset=True):
+                self._status_synced = codes
+                return True
+            self._reset_status_sync()
+            return False
         except Exception as e:
+            self._reset_status_sync()
             print(f"[UI] Erreur update_status: {e}")
             return False
     
@@ -230,7 +348,7 @@ class UIController:
             data = {
                 'actions': [
                     {'col': a.col, 'row': a.row, 'type': a.type, 'confidence': a.confidence}
-                    for a in actions
+                    for a in self._cull(actions)
                 ]
             }
             driver.execute_script(f"window.BotUI.updateData('actions', {json.dumps(data)});")
@@ -239,22 +357,42 @@ class UIController:
             print(f"[UI] Erreur update_actions: {e}")
             return False
     
-    def get_control_state(self, driver: WebDriver) -> ControlState:
-        """Récupère l'état de contrôle depuis l'UI JavaScript."""
-        if not self.ensure_injected(driver):
-            return ControlState()
-        
+    def poll_control(self, driver: WebDriver, wait: float = 0.0) -> ControlState:
+        """
+        Vide la file d'événements de contrôle de la page en un seul aller-retour.
+
+        `wait` > 0 : appel asynchrone qui rend la main dès le prochain événement
+        (ou après `wait` secondes) au lieu de re-sonder la page en boucle ; en
+        cas d'échec (erreur, surcouche à réinjecter), l'attente est faite ici.
+        """
         try:
-            result = driver.execute_script("return window.BotUI.getControlState();")
-            if result:
-                return ControlState(
-                    bot_running=result.get('botRunning', False),
-                    auto_exploration=result.get('autoExploration', True)
+            if wait > 0:
+                result = driver.execute_async_script(
+                    """
+                    const done = arguments[arguments.length - 1];
+                    if (!window.BotUI) { done(null); return; }
+                    window.BotUI.waitControl(arguments[0], done);
+                    """,
+                    int(wait * 1000),
                 )
+            else:
+                result = driver.execute_script("return window.BotUI ? window.BotUI.drainControl() : null;")
         except Exception as e:
-            print(f"[UI] Erreur get_control_state: {e}")
-        
-        return ControlState()
+            print(f"[UI] Erreur poll_control: {e}")
+            time.sleep(wait)  # L'appelant boucle en attente : pas de re-sondage immédiat
+            return ControlState(bot_running=self._bot_running)
+
+        if result is None:
+            # Surcouche perdue (rechargement de page) : réinjection, aucun événement
+            self._is_injected = False
+            self.inject(driver)
+            time.sleep(wait)
+            return ControlState(bot_running=self._bot_running)
+        return ControlState(
+            bot_running=result.get('botRunning', False),
+            auto_exploration=result.get('autoExploration', True),
+            events=list(result.get('events') or []),
+        )
     
     def update_probabilities(self, driver: WebDriver, cells: List[ProbabilityCellData]) -> bool:
         """Met à jour les données de l'overlay probabilités."""
@@ -265,7 +403,7 @@ class UIController:
             data = {
                 'cells': [
                     {'col': c.col, 'row': c.row, 'probability': c.probability}
-                    for c in cells
+                    for c in self._cull(cells)
                 ]
             }
             driver.execute_script(f"window.BotUI.updateData('probabilities', {json.dumps(data)});")
@@ -299,74 +437,15 @@ class UIController:
             print(f"[UI] Erreur get_bot_state: {e}")
             return None
     
-    def is_bot_running(self, driver: WebDriver) -> bool:
-        """Vérifie si le bot est en mode running via l'UI."""
-        if not self.is_ready(driver):
-            return self._bot_running
-        
-        try:
-            return driver.execute_script("return window.BotUI.isRunning();")
-        except:
-            return self._bot_running
-    
-    def is_restart_requested(self, driver: WebDriver) -> bool:
-        """Vérifie si un restart a été demandé et reset le flag."""
-        if not self.is_ready(driver):
-            result = self._restart_requested
-            self._restart_requested = False
-            return result
-        
-        try:
-            result = driver.execute_script("""
-                const flag = window.__botui_restart_requested || false;
-                window.__botui_restart_requested = false;
-                return flag;
-            """)
-            return result
-        except:
-            return False
-    
-    def is_auto_restart_requested(self, driver: WebDriver) -> bool:
-        """Vérifie si un auto-restart (comme 'y') a été demandé."""
-        if not self.is_ready(driver):
-            return False
-        
-        try:
-            result = driver.execute_script("""
-                const flag = window.__botui_auto_restart || false;
-                window.__botui_auto_restart = false;
-                return flag;
-            """)
-            return result
-        except:
-            return False
-    
-    def is_manual_restart_requested(self, driver: WebDriver) -> bool:
-        """Vérifie si un redémarrage manuel (clic bouton) a été détecté."""
-        if not self.is_ready(driver):
-            return False
-        
-        try:
-            result = driver.execute_script("""
-                const flag = window.__manual_restart_requested || false;
-                window.__manual_restart_requested = false;
-                return flag;
-            """)
-            return result
-        except:
-            return False
-    
     def set_bot_running(self, driver: WebDriver, running: bool) -> None:
         """Force l'état running du bot dans l'UI."""
         self._bot_running = running
-        if not self.is_ready(driver):
-            return
-        
         try:
-            current = driver.execute_script("return window.BotUI.isRunning();")
-            if current != running:
-                driver.execute_script("window.BotUI.toggleBot();")
-        except:
+            driver.execute_script(
+                "if (window.BotUI && window.BotUI.isRunning() !== arguments[0]) window.BotUI.toggleBot();",
+                running,
+            )
+        except Exception:
             pass
     
     def destroy(self, driver: WebDriver) -> bool:
@@ -374,6 +453,7 @@ class UIController:
         try:
             driver.execute_script("if (window.BotUI) window.BotUI.destroy();")
             self._is_injected = False
+            self._reset_status_sync()
             print("[UI] Surcouche UI détruite")
             return True
         except Exception as e:
@@ -2,14 +2,19 @@
 Convertisseur de données solver/storage vers format UI overlay.
 """
 
-from typing import Dict, List, Optional, Set, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from dataclasses import dataclass
 
+from src.config import UI_OVERLAY_CONFIG
 from .ui_controller import StatusCellData, ActionCellData, ProbabilityCellData
 
+if TYPE_CHECKING:
+    from src.lib.s3_storage import StorageController
+    from src.lib.s3_storage.journal import ChangeFeed
+
 
 def convert_snapshot_to_status(
-    snapshot: Dict[Tuple[int, int], any],
+    snapshot: Dict[Tuple[int, int], Any],
     bounds_offset: Optional[Tuple[int, int]] = None,
 ) -> List[StatusCellData]:
     """
@@ -55,7 +60,7 @@ def convert_snapshot_to_status(
 
 
 def convert_actions_to_overlay(
-    actions: List[any],
+    actions: List[Any],
     bounds_offset: Optional[Tuple[int, int]] = None,
 ) -> List[ActionCellData]:
     """
@@ -91,7 +96,7 @@ def convert_actions_to_overlay(
 
 def convert_probabilities_to_overlay(
     zone_probabilities: Dict[int, float],
-    zones: List[any],
+    zones: List[Any],
     bounds_offset: Optional[Tuple[int, int]] = None,
 ) -> List[ProbabilityCellData]:
     """
@@ -125,9 +130,9 @@ def convert_probabilities_to_overlay(
 
 
 def filter_visible_cells(
-    cells: List[any],
+    cells: List[Any],
     visible_bounds: Tuple[int, int, int, int],
-) -> List[any]:
+) -> List[Any]:
     """
     Filtre les cellules pour ne garder que celles visibles à l'écran.
     
@@ -144,3 +149,74 @@ def filter_visible_cells(
         c for c in cells
         if min_col <= c.col <= max_col and min_row <= c.row <= max_row
     ]
+
+
+class SpatialCellIndex:
+    """
+    Index spatial par seaux (bucket × bucket cases) des coordonnées connues.
+
+    L'index est tenu à jour incrémentalement (nouvelles coordonnées du storage,
+    régions froides comprises), et une requête par bornes ne parcourt que les
+    seaux qui les recouvrent (O(visible)).
+    """
+
+    def __init__(self, bucket: int = UI_OVERLAY_CONFIG['index_bucket']):
+        self.bucket = bucket
+        self._buckets: Dict[Tuple[int, int], Set[Tuple[int, int]]] = {}
+        self._coords: Set[Tuple[int, int]] = set()
+        # Storage suivi et abonnement à son journal (cf. follow)
+        self._source: Optional["StorageController"] = None
+        self._feed: Optional["ChangeFeed"] = None
+
+    def __len__(self) -> int:
+        return len(self._coords)
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._coords.clear()
+
+    def add(self, coords: Iterable[Tuple[int, int]]) -> None:
+        """Ajoute des coordonnées (col, row) à l'index."""
+        bucket = self.bucket
+        for col, row in coords:
+            self._buckets.setdefault((col // bucket, row // bucket), set()).add((col, row))
+            self._coords.add((col, row))
+
+    def remove(self, coords: Iterable[Tuple[int, int]]) -> None:
+        """Retire des coordonnées (col, row) de l'index."""
+        bucket = self.bucket
+        for col, row in coords:
+            cell_bucket = self._buckets.get((col // bucket, row // bucket))
+            if cell_bucket is not None:
+                cell_bucket.discard((col, row))
+            self._coords.discard((col, row))
+
+    def follow(self, storage: "StorageController") -> None:
+        """
+        Met l'index à jour depuis le journal du storage (travail proportionnel au delta).
+        Nouveau storage (restart) : abonnement neuf ; journal dépassé : reconstruction.
+        """
+        if self._source is not storage:
+            self._source = storage
+            self._feed = storage.subscribe("ui_overlay", from_start=True)
+            self.clear()
+        changes = self._feed.poll()
+        if not changes.complete:
+            self.clear()
+            self.add(storage.iter_coords())
+            return
+        # Les cellules évincées restent indexées : toujours affichables, leur état
+        # est lu dans les régions froides (StorageController.get_cell)
+        self.add(changes.get("ADDED"))
+
+    def query(self, visible_bounds: Tuple[int, int, int, int]) -> Iterator[Tuple[int, int]]:
+        """
+        Coordonnées dans les bornes (min_col, min_row, max_col, max_row), bornes incluses.
+        """
+        min_col, min_row, max_col, max_row = visible_bounds
+        bucket = self.bucket
+        for bucket_row in range(min_row // bucket, max_row // bucket + 1):
+            for bucket_col in range(min_col // bucket, max_col // bucket + 1):
+                for col, row in self._buckets.get((bucket_col, bucket_row), ()):
+                    if min_col <= col <= max_col and min_row <= row <= max_row:
+                        yield col, row
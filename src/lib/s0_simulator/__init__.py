@@ -0,0 +1,15 @@
+"""Module s0_simulator : plateau 1000mines simulé hors-ligne (driver factice, sans navigateur)."""
+
+from .types import SimulatorConfig, BoardStats
+from .board import SimulatedBoard
+from .renderer import TileRenderer
+from .driver import SimulatedDriver, SimulatedElement
+
+__all__ = [
+    "SimulatorConfig",
+    "BoardStats",
+    "SimulatedBoard",
+    "TileRenderer",
+    "SimulatedDriver",
+    "SimulatedElement",
+]
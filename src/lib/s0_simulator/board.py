@@ -0,0 +1,173 @@
+"""Plateau infini simulé : placement déterministe des mines, clics, flood fill, vies."""
+
+from __future__ import annotations
+
+import math
+import random
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.config import CELL_SIZE, CELL_BORDER
+from .types import SimulatorConfig, BoardStats
+
+Coord = Tuple[int, int]  # (col, row) comme dans s3_storage
+
+TILE_SIZE = 512
+EXPLODED = -1
+
+_NEIGHBOR_OFFSETS = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dx or dy]
+
+
+class SimulatedBoard:
+    """
+    Plateau de démineur infini déterministe.
+
+    Les mines sont tirées paresseusement cellule par cellule à partir de
+    (seed, col, row) : la même graine donne toujours le même plateau.
+    Le jeu est restreint à la fenêtre visible (tuiles canvas configurées),
+    ce qui borne le flood fill.
+    """
+
+    def __init__(self, config: SimulatorConfig):
+        self.config = config
+        stride = CELL_SIZE + CELL_BORDER
+        tx0, tx1 = config.tiles_x
+        ty0, ty1 = config.tiles_y
+        # Cellules (même partiellement) couvertes par les tuiles visibles
+        self.min_col = math.floor(tx0 * TILE_SIZE / stride)
+        self.max_col = math.floor(((tx1 + 1) * TILE_SIZE - 1) / stride)
+        self.min_row = math.floor(ty0 * TILE_SIZE / stride)
+        self.max_row = math.floor(((ty1 + 1) * TILE_SIZE - 1) / stride)
+        self.reset(config.seed)
+
+    # ------------------------------------------------------------------ #
+    # Cycle de vie
+    # ------------------------------------------------------------------ #
+    def reset(self, seed: Optional[int] = None) -> None:
+        """Nouvelle partie (nouvelle graine optionnelle) avec ouverture à l'origine."""
+        if seed is not None:
+            self.config.seed = seed
+        self.lives = self.config.lives
+        self.stats = BoardStats()
+        self.revealed: Dict[Coord, int] = {}
+        self.flags: Set[Coord] = set()
+        self._mines: Dict[Coord, bool] = {}
+        self._changed: Set[Coord] = set()
+        self.version = 0
+        self._reveal((0, 0))
+
+    @property
+    def game_over(self) -> bool:
+        return self.lives <= 0
+
+    @property
+    def score(self) -> int:
+        return self.stats.revealed
+
+    def in_bounds(self, coord: Coord) -> bool:
+        col, row = coord
+        return self.min_col <= col <= self.max_col and self.min_row <= row <= self.max_row
+
+    def pop_changes(self) -> Set[Coord]:
+        """Retourne et vide l'ensemble des cellules modifiées (pour le rendu incrémental)."""
+        changed, self._changed = self._changed, set()
+        return changed
+
+    # ------------------------------------------------------------------ #
+    # Contenu du plateau
+    # ------------------------------------------------------------------ #
+    def is_mine(self, coord: Coord) -> bool:
+        cached = self._mines.get(coord)
+        if cached is not None:
+            return cached
+        col, row = coord
+        radius = self.config.opening_radius
+        if abs(col) <= radius and abs(row) <= radius:
+            mine = False
+        else:
+            # hash() d'un tuple d'entiers est stable d'une exécution à l'autre
+            mine = random.Random(hash((self.config.seed, col, row))).random() < self.config.mine_density
+        self._mines[coord] = mine
+        return mine
+
+    def neighbors(self, coord: Coord) -> List[Coord]:
+        col, row = coord
+        return [
+            (col + dx, row + dy)
+            for dx, dy in _NEIGHBOR_OFFSETS
+            if self.in_bounds((col + dx, row + dy))
+        ]
+
+    def adjacent_mines(self, coord: Coord) -> int:
+        return sum(1 for n in self.neighbors(coord) if self.is_mine(n))
+
+    def symbol_at(self, coord: Coord) -> str:
+        """Symbole vision attendu pour une cellule (noms du data_set)."""
+        value = self.revealed.get(coord)
+        if value is None:
+            return "flag" if coord in self.flags else "unrevealed"
+        if value == EXPLODED:
+            return "exploded"
+        if value == 0:
+            return "empty"
+        return f"number_{value}"
+
+    # ------------------------------------------------------------------ #
+    # Actions joueur
+    # ------------------------------------------------------------------ #
+    def left_click(self, coord: Coord) -> None:
+        """Clic gauche : révèle une case, ou chord sur un chiffre entièrement marqué."""
+        if self.game_over or not self.in_bounds(coord) or coord in self.flags:
+            return
+        self.stats.left_clicks += 1
+        value = self.revealed.get(coord)
+        if value is None:
+            self._reveal(coord)
+        elif value > 0:
+            marked = sum(
+                1 for n in self.neighbors(coord)
+                if n in self.flags or self.revealed.get(n) == EXPLODED
+            )
+            if marked == value:
+                for n in self.neighbors(coord):
+                    if n not in self.flags and n not in self.revealed:
+                        self._reveal(n)
+                        if self.game_over:
+                            break
+
+    def right_click(self, coord: Coord) -> None:
+        """Clic droit : pose/retire un drapeau sur une case non révélée."""
+        if self.game_over or not self.in_bounds(coord) or coord in self.revealed:
+            return
+        self.stats.right_clicks += 1
+        if coord in self.flags:
+            self.flags.discard(coord)
+            self.stats.flags -= 1
+        else:
+            self.flags.add(coord)
+            self.stats.flags += 1
+        self._mark_changed(coord)
+
+    def _reveal(self, start: Coord) -> None:
+        if self.is_mine(start):
+            self.revealed[start] = EXPLODED
+            self.lives -= 1
+            self.stats.explosions += 1
+            self._mark_changed(start)
+            return
+
+        queue = deque([start])
+        while queue:
+            coord = queue.popleft()
+            if coord in self.revealed or coord in self.flags:
+                continue
+            count = self.adjacent_mines(coord)
+            self.revealed[coord] = count
+            self.stats.revealed += 1
+            self._mark_changed(coord)
+            if count == 0:
+                queue.extend(n for n in self.neighbors(coord) if n not in self.revealed)
+
+    def _mark_changed(self, coord: Coord) -> None:
+        self._changed.add(coord)
+        self.version += 1
@@ -0,0 +1,181 @@
+"""Driver Selenium simulé : répond aux scripts du bot à partir du plateau simulé."""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Optional
+
+from src.config import CELL_SIZE, CELL_BORDER, VIEWPORT_CONFIG
+from .board import SimulatedBoard, TILE_SIZE
+from .renderer import TileRenderer
+from .types import SimulatorConfig
+
+# Éléments DOM simulés (id)
+_ELEMENTS = frozenset({"anchor", "control", "score", "high", "mode", "helth", "ctl-restart-host"})
+
+
+class SimulatedElement:
+    """Élément DOM minimal (texte, rect, clic) exposé par SimulatedDriver."""
+
+    def __init__(self, driver: "SimulatedDriver", key: str):
+        self._driver = driver
+        self.key = key
+
+    @property
+    def text(self) -> str:
+        return self._driver._element_text(self.key)
+
+    @property
+    def rect(self) -> Dict[str, float]:
+        return self._driver._element_rect(self.key)
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        return self.key if name == "id" else None
+
+    def is_displayed(self) -> bool:
+        return True
+
+    def is_enabled(self) -> bool:
+        return True
+
+    def click(self) -> None:
+        self._driver._element_click(self.key)
+
+
+class SimulatedDriver:
+    """
+    Remplace le WebDriver Chrome pour la boucle de jeu.
+
+    Les scripts JS des modules (capture, locator, clics, infos de jeu,
+    restart, render-settle) sont reconnus par marqueurs et exécutés
+    directement sur le SimulatedBoard. Les scripts inconnus renvoient None
+    (comme un script JS sans return).
+    """
+
+    def __init__(self, config: Optional[SimulatorConfig] = None):
+        self.config = config or SimulatorConfig()
+        self.board = SimulatedBoard(self.config)
+        self.renderer = TileRenderer(self.board)
+        self.stride = CELL_SIZE + CELL_BORDER
+        self.current_url = "simulator://1000mines"
+        self.title = "1000mines (simulateur)"
+        self.high_score = 0
+        # Position écran de l'anchor : la première tuile visible est en haut à gauche du viewport
+        view_left, view_top = VIEWPORT_CONFIG['position']
+        self._anchor_left = view_left - self.config.tiles_x[0] * TILE_SIZE
+        self._anchor_top = view_top - self.config.tiles_y[0] * TILE_SIZE
+
+    # ------------------------------------------------------------------ #
+    # API WebDriver utilisée par le bot
+    # ------------------------------------------------------------------ #
+    def get(self, url: str) -> None:
+        self.current_url = url
+
+    def quit(self) -> None:
+        pass
+
+    def find_element(self, by: str = "id", value: Optional[str] = None) -> SimulatedElement:
+        key = (value or "").lstrip("#")
+        if key not in _ELEMENTS:
+            from selenium.common.exceptions import NoSuchElementException  # Même erreur que Chrome
+
+            raise NoSuchElementException(f"Élément simulé introuvable: {by}={value}")
+        return SimulatedElement(self, key)
+
+    def find_elements(self, by: str = "id", value: Optional[str] = None) -> List[SimulatedElement]:
+        key = (value or "").lstrip("#")
+        return [SimulatedElement(self, key)] if key in _ELEMENTS else []
+
+    def execute_script(self, script: str, *args: Any) -> Any:
+        if "toDataURL" in script:
+            return self._capture_canvas(args[0])
+        if "querySelectorAll" in script:
+            return self._list_canvases()
+        if "innerText" in script and args and isinstance(args[0], list):
+            return {key: self._element_text(key) for key in args[0]}
+        if "dispatchEvent" in script and "contextmenu" in script and len(args) >= 2:
+            return self._click(args[0], args[1], right=True)
+        if "dispatchEvent" in script and "dblclick" in script and len(args) >= 2:
+            return self._click(args[0], args[1], right=False)
+        if args and isinstance(args[0], SimulatedElement):
+            element = args[0]
+            if "getBoundingClientRect" in script:
+                rect = self._element_rect(element.key)
+                return {**rect, "left": rect["x"], "top": rect["y"],
+                        "right": rect["x"] + rect["width"], "bottom": rect["y"] + rect["height"]}
+            if "click" in script:
+                element.click()
+                return None
+        return None
+
+    def execute_async_script(self, script: str, *args: Any) -> Any:
+        if "__botLastCanvasDraw" in script:
+            # Rendu synchrone : toujours stable
+            return {"settled": True, "waited": 0}
+        return None
+
+    # ------------------------------------------------------------------ #
+    # Handlers internes
+    # ------------------------------------------------------------------ #
+    def _tile_ids(self) -> List[str]:
+        (tx0, tx1), (ty0, ty1) = self.config.tiles_x, self.config.tiles_y
+        return [f"canvas_{tx}x{ty}" for ty in range(ty0, ty1 + 1) for tx in range(tx0, tx1 + 1)]
+
+    def _list_canvases(self) -> List[Dict[str, Any]]:
+        results = []
+        for canvas_id in self._tile_ids():
+            tx, ty = (int(v) for v in canvas_id.split("_", 1)[1].split("x"))
+            results.append({
+                "id": canvas_id,
+                "relative_left": tx * TILE_SIZE,
+                "relative_top": ty * TILE_SIZE,
+                "width": TILE_SIZE,
+                "height": TILE_SIZE,
+            })
+        return results
+
+    def _capture_canvas(self, canvas_id: str) -> Dict[str, Any]:
+        if canvas_id not in self._tile_ids():
+            return {"success": False, "error": f"Canvas {canvas_id} introuvable"}
+        tx, ty = (int(v) for v in canvas_id.split("_", 1)[1].split("x"))
+        return {"success": True, "dataURL": self.renderer.tile_data_url(tx, ty)}
+
+    def _click(self, rel_x: float, rel_y: float, right: bool) -> bool:
+        coord = (math.floor(rel_x / self.stride), math.floor(rel_y / self.stride))
+        if right:
+            self.board.right_click(coord)
+        else:
+            self.board.left_click(coord)
+        self.high_score = max(self.high_score, self.board.score)
+        return True
+
+    def _element_text(self, key: str) -> str:
+        if key == "score":
+            return str(self.board.score)
+        if key == "high":
+            return str(self.high_score)
+        if key == "mode":
+            return f"Infinite {self.config.difficulty}"
+        if key == "helth":
+            return "♥" * max(0, self.board.lives)
+        return ""
+
+    def _element_rect(self, key: str) -> Dict[str, float]:
+        if key == "anchor":
+            return {"x": self._anchor_left, "y": self._anchor_top, "width": 0, "height": 0}
+        if key == "control":
+            (tx0, tx1), (ty0, ty1) = self.config.tiles_x, self.config.tiles_y
+            view_left, view_top = VIEWPORT_CONFIG['position']
+            return {
+                "x": view_left,
+                "y": view_top,
+                "width": (tx1 - tx0 + 1) * TILE_SIZE,
+                "height": (ty1 - ty0 + 1) * TILE_SIZE,
+            }
+        return {"x": 0, "y": 0, "width": 0, "height": 0}
+
+    def _element_click(self, key: str) -> None:
+        if key == "ctl-restart-host":
+            # Nouvelle partie : graine suivante pour rester reproductible
+            self.board.reset(self.config.seed + 1)
+            self.renderer.invalidate_all()
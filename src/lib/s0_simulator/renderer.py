@@ -0,0 +1,120 @@
+"""Rendu des tuiles canvas 512×512 du plateau simulé."""
+
+from __future__ import annotations
+
+import base64
+import io
+import json
+import math
+from pathlib import Path, PureWindowsPath
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import numpy as np
+from PIL import Image
+
+from src.config import CELL_SIZE, CELL_BORDER
+from .board import SimulatedBoard, TILE_SIZE, Coord
+
+GRID_LINE_COLOR = (160, 160, 160)
+SYMBOLS = ["unrevealed", "empty", "flag", "exploded"] + [f"number_{i}" for i in range(1, 9)]
+
+
+def _templates_dir() -> Path:
+    return Path(__file__).resolve().parents[1] / "s2_vision" / "templates"
+
+
+def _load_sprites() -> Dict[str, np.ndarray]:
+    """
+    Charge un sprite 24×24 par symbole.
+    Priorité au premier échantillon réel du data_set ; sinon reconstruction
+    depuis l'artefact de template central (zone moyenne sur fond uniforme).
+    """
+    templates_dir = _templates_dir()
+    dataset_dir = templates_dir / "Template analizer" / "data_set"
+    manifest_path = templates_dir / "template_artifact" / "central_templates_manifest.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    margin = int(manifest.get("margin", 7))
+
+    sprites: Dict[str, np.ndarray] = {}
+    for symbol in SYMBOLS:
+        samples = sorted((dataset_dir / symbol).glob("*.png")) if (dataset_dir / symbol).is_dir() else []
+        if samples:
+            sprite = np.asarray(Image.open(samples[0]).convert("RGB"), dtype=np.uint8)
+            if sprite.shape[:2] == (CELL_SIZE, CELL_SIZE):
+                sprites[symbol] = sprite
+                continue
+
+        payload = manifest["templates"][symbol]
+        mean = np.load(manifest_path.parent / PureWindowsPath(payload["mean_template_file"]).as_posix())
+        # Fond = couleur du bord du template (approximation du fond de la case)
+        edge = np.concatenate([mean[0], mean[-1], mean[:, 0], mean[:, -1]]).mean(axis=0)
+        sprite = np.empty((CELL_SIZE, CELL_SIZE, 3), dtype=np.uint8)
+        sprite[:] = np.clip(edge, 0, 255).astype(np.uint8)
+        sprite[margin:CELL_SIZE - margin, margin:CELL_SIZE - margin] = np.clip(mean, 0, 255).astype(np.uint8)
+        sprites[symbol] = sprite
+    return sprites
+
+
+class TileRenderer:
+    """Rend les tuiles du plateau et met en cache leur dataURL PNG (invalidation par cellule)."""
+
+    def __init__(self, board: SimulatedBoard):
+        self.board = board
+        self.stride = CELL_SIZE + CELL_BORDER
+        self.sprites = _load_sprites()
+        self._cache: Dict[Tuple[int, int], str] = {}
+
+    def invalidate_all(self) -> None:
+        self._cache.clear()
+        self.board.pop_changes()
+
+    def _tiles_for_cell(self, coord: Coord) -> Iterable[Tuple[int, int]]:
+        col, row = coord
+        x0, y0 = col * self.stride, row * self.stride
+        for ty in range(math.floor(y0 / TILE_SIZE), math.floor((y0 + CELL_SIZE - 1) / TILE_SIZE) + 1):
+            for tx in range(math.floor(x0 / TILE_SIZE), math.floor((x0 + CELL_SIZE - 1) / TILE_SIZE) + 1):
+                yield tx, ty
+
+    def _apply_changes(self) -> None:
+        dirty: Set[Tuple[int, int]] = set()
+        for coord in self.board.pop_changes():
+            dirty.update(self._tiles_for_cell(coord))
+        for tile in dirty:
+            self._cache.pop(tile, None)
+
+    def render_tile(self, tile_x: int, tile_y: int) -> np.ndarray:
+        """Rend une tuile 512×512 RGB (cellule (col,row) en pixel (col*25, row*25))."""
+        tile = np.empty((TILE_SIZE, TILE_SIZE, 3), dtype=np.uint8)
+        tile[:] = GRID_LINE_COLOR
+        left, top = tile_x * TILE_SIZE, tile_y * TILE_SIZE
+
+        col_start = math.floor((left - CELL_SIZE + 1) / self.stride)
+        col_end = math.floor((left + TILE_SIZE - 1) / self.stride)
+        row_start = math.floor((top - CELL_SIZE + 1) / self.stride)
+        row_end = math.floor((top + TILE_SIZE - 1) / self.stride)
+
+        for row in range(row_start, row_end + 1):
+            y = row * self.stride - top
+            sy0, sy1 = max(0, -y), min(CELL_SIZE, TILE_SIZE - y)
+            if sy0 >= sy1:
+                continue
+            for col in range(col_start, col_end + 1):
+                x = col * self.stride - left
+                sx0, sx1 = max(0, -x), min(CELL_SIZE, TILE_SIZE - x)
+                if sx0 >= sx1:
+                    continue
+                sprite = self.sprites[self.board.symbol_at((col, row))]
+                tile[y + sy0:y + sy1, x + sx0:x + sx1] = sprite[sy0:sy1, sx0:sx1]
+        return tile
+
+    def tile_data_url(self, tile_x: int, tile_y: int) -> str:
+        """dataURL PNG de la tuile (équivalent de canvas.toDataURL)."""
+        self._apply_changes()
+        key = (tile_x, tile_y)
+        cached: Optional[str] = self._cache.get(key)
+        if cached is None:
+            buffer = io.BytesIO()
+            Image.fromarray(self.render_tile(tile_x, tile_y)).save(buffer, format="PNG", compress_level=1)
+            cached = "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+            self._cache[key] = cached
+        return cached
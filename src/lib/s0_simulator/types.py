@@ -0,0 +1,37 @@
+"""Types pour le module s0_simulator."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+from src.config import SIMULATOR_CONFIG, DEFAULT_DIFFICULTY
+
+
+@dataclass
+class SimulatorConfig:
+    """Configuration d'un plateau simulé."""
+    seed: int = 0
+    difficulty: str = DEFAULT_DIFFICULTY
+    tiles_x: Tuple[int, int] = field(default_factory=lambda: tuple(SIMULATOR_CONFIG['tiles_x']))
+    tiles_y: Tuple[int, int] = field(default_factory=lambda: tuple(SIMULATOR_CONFIG['tiles_y']))
+    lives: int = SIMULATOR_CONFIG['lives']
+    opening_radius: int = SIMULATOR_CONFIG['opening_radius']
+    density: Optional[float] = None  # Surcharge de la densité de la difficulté (bench)
+
+    @property
+    def mine_density(self) -> float:
+        if self.density is not None:
+            return self.density
+        densities = SIMULATOR_CONFIG['mine_density']
+        return densities.get(self.difficulty, densities[DEFAULT_DIFFICULTY])
+
+
+@dataclass
+class BoardStats:
+    """Compteurs d'une partie simulée."""
+    revealed: int = 0
+    flags: int = 0
+    explosions: int = 0
+    left_clicks: int = 0
+    right_clicks: int = 0
@@ -1,13 +1,21 @@
 """Module s1_capture : Capture des canvas."""
 
 from .types import CaptureInput, CaptureResult, CanvasCaptureResult
-from .capture import CanvasCaptureBackend, capture_canvas, capture_all_canvases
+from .capture import (
+    CanvasCaptureBackend,
+    FrameBuffer,
+    capture_canvas,
+    capture_all_canvases,
+    capture_all_canvases_async,
+)
 
 __all__ = [
     "CaptureInput",
     "CaptureResult",
     "CanvasCaptureResult",
     "CanvasCaptureBackend",
+    "FrameBuffer",
     "capture_canvas",
     "capture_all_canvases",
+    "capture_all_canvases_async",
 ]
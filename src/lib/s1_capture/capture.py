@@ -2,24 +2,42 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import io
 import os
 import time
 import math
-from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
-from datetime import datetime
+import re
+from functools import partial
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Set, Tuple
 
+import numpy as np
 from PIL import Image
-from selenium.webdriver.remote.webdriver import WebDriver
 
-from src.config import CELL_SIZE, CELL_BORDER, GRID_REFERENCE_POINT
+from src.config import CANVAS_TILE_SIZE, CELL_SIZE, CELL_BORDER, GRID_REFERENCE_POINT
+from src.lib.s0_browser.devtools import AsyncBrowserClient
 from src.lib.s0_coordinates import CanvasLocator
 from src.lib.s0_coordinates.types import GridBounds
 from .types import CaptureInput, CaptureResult, CanvasCaptureResult
 from ..s0_coordinates.types import GridBounds
 
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+CANVAS_ID_PATTERN = re.compile(r'(?P<x>-?\d+)x(?P<y>-?\d+)')
+
+CANVAS_CAPTURE_SCRIPT = """
+const canvasId = arguments[0];
+const sourceCanvas = document.getElementById(canvasId) ||
+                    document.querySelector(`canvas[data-tile-id="${canvasId}"]`);
+if (!sourceCanvas) {
+    return { success: false, error: `Canvas ${canvasId} introuvable` };
+}
+return { success: true, dataURL: sourceCanvas.toDataURL('image/png') };
+"""
+
+
 class CanvasCaptureBackend:
     """Capture directe via canvas.toDataURL() (in-memory only, jamais de fichiers)."""
 
@@ -39,12 +57,10 @@ class CanvasCaptureBackend:
         """Capture un canvas complet (en mémoire uniquement)."""
         data_url = self._execute_canvas_capture(canvas_id)
         image = self._data_url_to_image(data_url)
-        raw_bytes = self._image_to_bytes(image)
 
-        # Raws jamais sauvegardés
+        # Raws jamais sauvegardés ; PNG réencodé seulement à la demande (raw_bytes)
         return CanvasCaptureResult(
             image=image,
-            raw_bytes=raw_bytes,
             width=image.width,
             height=image.height,
             canvas_id=canvas_id,
@@ -54,21 +70,31 @@ class CanvasCaptureBackend:
 
     def _execute_canvas_capture(self, canvas_id: str) -> str:
         """Exécute le script JS pour capturer le canvas."""
-        script = """
-        const canvasId = arguments[0];
-        const sourceCanvas = document.getElementById(canvasId) ||
-                            document.querySelector(`canvas[data-tile-id="${canvasId}"]`);
-        if (!sourceCanvas) {
-            return { success: false, error: `Canvas ${canvasId} introuvable` };
-        }
-        return { success: true, dataURL: sourceCanvas.toDataURL('image/png') };
-        """
-        response = self.driver.execute_script(script, canvas_id)
+        return self._data_url_from_response(canvas_id, self.driver.execute_script(CANVAS_CAPTURE_SCRIPT, canvas_id))
+
+    async def capture_tile_async(
+        self,
+        client: AsyncBrowserClient,
+        canvas_id: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> CanvasCaptureResult:
+        """Capture d'un canvas via le client asynchrone (requête lancée avec les autres tuiles)."""
+        data_url = self._data_url_from_response(canvas_id, await client.evaluate(CANVAS_CAPTURE_SCRIPT, canvas_id))
+        image = self._data_url_to_image(data_url)
+        return CanvasCaptureResult(
+            image=image,
+            width=image.width,
+            height=image.height,
+            canvas_id=canvas_id,
+            saved_path=None,
+            metadata=metadata,
+        )
 
+    @staticmethod
+    def _data_url_from_response(canvas_id: str, response: Any) -> str:
         if not response or not response.get("success"):
             error = response.get("error") if isinstance(response, dict) else "Réponse JS invalide"
             raise RuntimeError(f"Capture canvas échouée ({canvas_id}): {error}")
-
         return response["dataURL"]
 
     @staticmethod
@@ -91,13 +117,6 @@ class CanvasCaptureBackend:
 
         return image
 
-    @staticmethod
-    def _image_to_bytes(image: Image.Image) -> bytes:
-        """Convertit une image PIL en bytes PNG."""
-        buffer = io.BytesIO()
-        image.save(buffer, format="PNG")
-        return buffer.getvalue()
-
     def _save_image(self, image: Image.Image, save_dir: str, filename: str) -> str:
         """Sauvegarde l'image sur disque."""
         os.makedirs(save_dir, exist_ok=True)
@@ -106,61 +125,110 @@ class CanvasCaptureBackend:
         return path
 
 
-def _compose_aligned_grid(
-    captures: List[CanvasCaptureResult],
-    grid_reference: Tuple[int, int],
-    cell_stride: int,
-    save: bool,
-    save_dir: Optional[Path] = None,
-) -> Tuple[CaptureResult, Tuple[int, int, int, int]]:
+def _tile_arrays(captures: List[CanvasCaptureResult]) -> Dict[Tuple[int, int], np.ndarray]:
     """
-    Assemble les tuiles canvas en un composite aligné sur les cellules Minesweeper,
-    et calcule les bornes de grille couvertes.
-    Utilise les IDs des canvas pour calculer les positions exactes (pas de coordonnées DOM).
+    Tuiles (CANVAS_TILE_SIZE, CANVAS_TILE_SIZE, 3) uint8 indexées par position de
+    canvas, lue dans l'ID (ex: "canvas_0x0" -> (0, 0)).
     """
-    if save and save_dir:
-        save_dir.mkdir(parents=True, exist_ok=True)
-
-    # Extraire les coordonnées des canvas depuis leurs IDs
-    canvas_coords = []
+    tiles: Dict[Tuple[int, int], np.ndarray] = {}
     for item in captures:
-        canvas_id = item.metadata["canvas_info"].id
-        # Parser l'ID du canvas (ex: "canvas_0x0" -> x=0, y=0)
-        import re
-        match = re.search(r'(?P<x>-?\d+)x(?P<y>-?\d+)', canvas_id)
-        if match:
-            x = int(match.group('x'))
-            y = int(match.group('y'))
-            canvas_coords.append((x, y))
-    
-    # Calculer les bornes en pixels à partir des IDs (chaque canvas fait 512x512)
-    min_x = min(x for x, y in canvas_coords)
-    min_y = min(y for x, y in canvas_coords)
-    max_x = max(x for x, y in canvas_coords)
-    max_y = max(y for x, y in canvas_coords)
-    
-    # Convertir en positions pixels
-    CANVAS_SIZE = 512
-    min_left = min_x * CANVAS_SIZE
-    min_top = min_y * CANVAS_SIZE
-    max_right = (max_x + 1) * CANVAS_SIZE
-    max_bottom = (max_y + 1) * CANVAS_SIZE
-
-    width = int(math.ceil(max_right - min_left))
-    height = int(math.ceil(max_bottom - min_top))
-    composite = Image.new("RGB", (width, height), "white")
+        match = CANVAS_ID_PATTERN.search(item.metadata["canvas_info"].id)
+        if not match:
+            continue
+        tile = np.asarray(item.image)
+        if tile.shape[:2] != (CANVAS_TILE_SIZE, CANVAS_TILE_SIZE):
+            # Tuile de taille inattendue : ramenée à la taille nominale, complétée en blanc
+            padded = np.full((CANVAS_TILE_SIZE, CANVAS_TILE_SIZE, 3), 255, dtype=np.uint8)
+            height = min(tile.shape[0], CANVAS_TILE_SIZE)
+            width = min(tile.shape[1], CANVAS_TILE_SIZE)
+            padded[:height, :width] = tile[:height, :width]
+            tile = padded
+        tiles[(int(match.group('x')), int(match.group('y')))] = tile
+    return tiles
+
+
+def _tile_layout(tiles: Dict[Tuple[int, int], np.ndarray]) -> Tuple[int, int, int, int]:
+    """Bornes (min_x, min_y, max_x, max_y) des tuiles, en indices de canvas."""
+    if not tiles:
+        raise RuntimeError("Aucune tuile capturée : impossible de composer la grille (canvas absents ou captures en échec).")
+    return (
+        min(x for x, y in tiles),
+        min(y for x, y in tiles),
+        max(x for x, y in tiles),
+        max(y for x, y in tiles),
+    )
 
-    for item in captures:
-        # Calculer la position depuis l'ID du canvas
-        canvas_id = item.metadata["canvas_info"].id
-        match = re.search(r'(?P<x>-?\d+)x(?P<y>-?\d+)', canvas_id)
-        if match:
-            canvas_x = int(match.group('x'))
-            canvas_y = int(match.group('y'))
-            # Position dans le composite basée sur l'ID
-            offset_x = (canvas_x - min_x) * CANVAS_SIZE
-            offset_y = (canvas_y - min_y) * CANVAS_SIZE
-            composite.paste(item.image, (offset_x, offset_y))
+
+class FrameBuffer:
+    """
+    Tampon RGB préalloué du composite, propre à une session (`Session.frame_buffer`).
+
+    Le tableau est réutilisé d'une capture à l'autre tant que la disposition des
+    tuiles (bornes en indices de canvas) ne change pas : les tuiles sont écrites
+    directement dans leur emplacement, seuls les emplacements sans tuile cette
+    fois-ci sont remis en blanc. Le composite rendu est une vue sur ce tampon,
+    valide jusqu'à la capture suivante de la session. Une capture dont le
+    composite est demandé après une capture plus récente est composée dans un
+    tableau à part : elle n'écrase jamais le composite courant.
+    """
+
+    def __init__(self) -> None:
+        self.layout: Optional[Tuple[int, int, int, int]] = None
+        self.frame: Optional[np.ndarray] = None
+        self._written: Set[Tuple[int, int]] = set()
+        self._latest: Optional[object] = None
+
+    def claim(self) -> object:
+        """Réserve le tampon pour une nouvelle capture ; jeton à passer à `write`."""
+        self._latest = object()
+        return self._latest
+
+    def _slot(self, canvas_x: int, canvas_y: int) -> np.ndarray:
+        top = (canvas_y - self.layout[1]) * CANVAS_TILE_SIZE
+        left = (canvas_x - self.layout[0]) * CANVAS_TILE_SIZE
+        return self.frame[top:top + CANVAS_TILE_SIZE, left:left + CANVAS_TILE_SIZE]
+
+    def write(
+        self,
+        tiles: Dict[Tuple[int, int], np.ndarray],
+        layout: Tuple[int, int, int, int],
+        token: object,
+    ) -> np.ndarray:
+        if token is not self._latest:
+            # Capture dépassée par une plus récente : composée à part
+            private = FrameBuffer()
+            return private.write(tiles, layout, private.claim())
+        if self.layout != layout:
+            # Disposition changée : réallocation
+            min_x, min_y, max_x, max_y = layout
+            self.layout = layout
+            self.frame = np.full(
+                ((max_y - min_y + 1) * CANVAS_TILE_SIZE, (max_x - min_x + 1) * CANVAS_TILE_SIZE, 3), 255, dtype=np.uint8
+            )
+            self._written = set()
+        for (canvas_x, canvas_y), tile in tiles.items():
+            self._slot(canvas_x, canvas_y)[:] = tile
+        for canvas_x, canvas_y in self._written - tiles.keys():
+            self._slot(canvas_x, canvas_y)[:] = 255
+        self._written = set(tiles)
+        return self.frame
+
+
+def _aligned_grid(
+    layout: Tuple[int, int, int, int],
+    grid_reference: Tuple[int, int],
+    cell_stride: int,
+) -> Tuple[Tuple[int, int, int, int], Tuple[int, int, int, int]]:
+    """
+    Recadrage (left, top, right, bottom) du composite de la disposition aligné
+    sur les cellules Minesweeper, et bornes de grille couvertes.
+    Utilise les positions des canvas (IDs), pas de coordonnées DOM.
+    """
+    min_x, min_y, max_x, max_y = layout
+    min_left = min_x * CANVAS_TILE_SIZE
+    min_top = min_y * CANVAS_TILE_SIZE
+    max_right = (max_x + 1) * CANVAS_TILE_SIZE
+    max_bottom = (max_y + 1) * CANVAS_TILE_SIZE
 
     ref_x, ref_y = grid_reference
     cell_ref_x = ref_x + 1
@@ -184,17 +252,6 @@ def _compose_aligned_grid(
     crop_right = int(round(aligned_right_px - min_left))
     crop_bottom = int(round(aligned_bottom_px - min_top))
 
-    grid_image = composite.crop((crop_left, crop_top, crop_right, crop_bottom))
-
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-    composite_path = None
-    if save and save_dir:
-        composite_path = save_dir / f"full_grid_{timestamp}.png"
-        grid_image.save(composite_path, format="PNG")
-
-    buffer = io.BytesIO()
-    grid_image.save(buffer, format="PNG")
-    composite_bytes = buffer.getvalue()
     actual_canvas_left = min_left + crop_left
     actual_canvas_top = min_top + crop_top
     actual_canvas_right = min_left + crop_right
@@ -206,23 +263,30 @@ def _compose_aligned_grid(
         int(math.ceil((actual_canvas_right - ref_x) / cell_stride)) - 1,
         int(math.ceil((actual_canvas_bottom - ref_y) / cell_stride)) - 1,
     )
-    
+
     print(f"[COMPOSITE] Bounds calculés: {grid_bounds}")
-    print(f"[COMPOSITE] Taille composite: {grid_image.width}x{grid_image.height}")
+    return (crop_left, crop_top, crop_right, crop_bottom), grid_bounds
 
-    capture_result = CaptureResult(
-        captures=captures,
-        grid_bounds=None,
-        timestamp=time.time(),
-        metadata={
-            "composite_path": str(composite_path),
-            "cell_stride": cell_stride,
-            "grid_bounds": grid_bounds,
-            "composite_bytes": composite_bytes,
-        },
-    )
 
-    return capture_result, grid_bounds
+def _compose_aligned_grid(
+    tiles: Dict[Tuple[int, int], np.ndarray],
+    layout: Tuple[int, int, int, int],
+    crop: Tuple[int, int, int, int],
+    frame_buffer: FrameBuffer,
+    token: object,
+) -> np.ndarray:
+    """
+    Assemble les tuiles en un composite aligné sur les cellules.
+
+    Le composite est une vue sur le tampon de la session (`FrameBuffer`) : il
+    reste valide jusqu'à la capture suivante de cette session.
+    """
+    frame = frame_buffer.write(tiles, layout, token)
+    crop_left, crop_top, crop_right, crop_bottom = crop
+    # Recadrage aligné : vue sur le tampon, sans copie
+    grid_array = frame[crop_top:crop_bottom, crop_left:crop_right]
+    print(f"[COMPOSITE] Taille composite: {grid_array.shape[1]}x{grid_array.shape[0]}")
+    return grid_array
 
 
 def capture_all_canvases(
@@ -230,8 +294,12 @@ def capture_all_canvases(
     save: bool = False,
     save_dir: Optional[str] = None,
     game_id: Optional[str] = None,
+    frame_buffer: Optional[FrameBuffer] = None,
 ) -> CaptureResult:
-    """Capture tous les canvas visibles et compose une grille alignée."""
+    """
+    Capture tous les canvas visibles et compose une grille alignée.
+    `frame_buffer` : tampon du composite de la session (sinon, tampon propre à cette capture).
+    """
     locator = CanvasLocator(driver=driver)
     backend = CanvasCaptureBackend(driver=driver)
 
@@ -263,12 +331,61 @@ def capture_all_canvases(
         if not success:
             print(f"[CANVAS] Échec capture définitive pour {info.id} après 3 tentatives.")
 
-    composite_result, grid_bounds = _compose_aligned_grid(
-        captures=captures,
+    return _build_capture_result(captures, game_id, frame_buffer)
+
+
+async def capture_all_canvases_async(
+    driver: WebDriver,
+    client: AsyncBrowserClient,
+    game_id: Optional[str] = None,
+    frame_buffer: Optional[FrameBuffer] = None,
+) -> CaptureResult:
+    """
+    Variante asynchrone : toutes les tuiles sont demandées en même temps au
+    client (une requête en vol par canvas) ; les échecs sont réessayés un par un.
+    """
+    locator = CanvasLocator(driver=driver)
+    backend = CanvasCaptureBackend(driver=driver)
+
+    canvas_infos = locator.locate_all()
+    game_info = f" pour le jeu {game_id}" if game_id else ""
+    print(f"[CANVAS] {len(canvas_infos)} canvas trouvés{game_info}.")
+
+    results = await asyncio.gather(
+        *(backend.capture_tile_async(client, info.id, metadata={"canvas_info": info}) for info in canvas_infos),
+        return_exceptions=True,
+    )
+    captures: List[CanvasCaptureResult] = []
+    for info, result in zip(canvas_infos, results):
+        for attempt in range(2):
+            if not isinstance(result, BaseException):
+                break
+            await asyncio.sleep(0.05)  # Le DOM peut changer pendant la capture
+            try:
+                result = await backend.capture_tile_async(client, info.id, metadata={"canvas_info": info})
+            except Exception as e:
+                result = e
+        if isinstance(result, BaseException):
+            print(f"[CANVAS] Échec capture définitive pour {info.id} après 3 tentatives.")
+            continue
+        captures.append(result)
+
+    return _build_capture_result(captures, game_id, frame_buffer)
+
+
+def _build_capture_result(
+    captures: List[CanvasCaptureResult],
+    game_id: Optional[str],
+    frame_buffer: Optional[FrameBuffer] = None,
+) -> CaptureResult:
+    """Calcule la disposition et les bornes des tuiles capturées et construit le résultat de capture."""
+    frame_buffer = frame_buffer or FrameBuffer()
+    tiles = _tile_arrays(captures)
+    layout = _tile_layout(tiles)
+    crop, grid_bounds = _aligned_grid(
+        layout,
         grid_reference=GRID_REFERENCE_POINT,
         cell_stride=CELL_SIZE + CELL_BORDER,
-        save=False,
-        save_dir=None,
     )
 
     gb_obj = GridBounds(
@@ -285,9 +402,10 @@ def capture_all_canvases(
         metadata={
             "game_id": game_id,
             "canvas_count": len(captures),
-            "composite_path": composite_result.metadata.get("composite_path"),
-            "composite_bytes": composite_result.metadata.get("composite_bytes"),
             "grid_bounds": gb_obj,  # Directly use the GridBounds object
+            "tiles": tiles,
+            # Composite assemblé à la première demande seulement (overlays, enregistreur)
+            "compose": partial(_compose_aligned_grid, tiles, layout, crop, frame_buffer, frame_buffer.claim()),
         },
     )
 
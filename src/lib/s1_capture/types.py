@@ -1,7 +1,10 @@
 """Types pour le module s1_capture."""
 
+import io
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any, Tuple
+
+import numpy as np
 from PIL import Image
 
 from src.lib.s0_coordinates.types import GridBounds, CanvasInfo
@@ -20,12 +23,21 @@ class CaptureInput:
 class CanvasCaptureResult:
     """Résultat brut d'une capture canvas."""
     image: Image.Image
-    raw_bytes: bytes
     width: int
     height: int
     canvas_id: str
     saved_path: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
+    _raw_bytes: Optional[bytes] = field(default=None, repr=False)
+
+    @property
+    def raw_bytes(self) -> bytes:
+        """PNG de la tuile, encodé à la première demande (la vision lit `image` directement)."""
+        if self._raw_bytes is None:
+            buffer = io.BytesIO()
+            self.image.save(buffer, format="PNG")
+            self._raw_bytes = buffer.getvalue()
+        return self._raw_bytes
 
 
 @dataclass
@@ -44,14 +56,39 @@ class CaptureResult:
     def composite_path(self) -> Optional[str]:
         return self.metadata.get("composite_path")
     
+    @property
+    def tiles(self) -> Dict[Tuple[int, int], np.ndarray]:
+        """Tuiles (H, W, 3) uint8 indexées par position de canvas (x, y)."""
+        return self.metadata.get("tiles", {})
+
+    @property
+    def composite_array(self) -> Optional[np.ndarray]:
+        """
+        Composite (H, W, 3) uint8 aligné sur les cellules, assemblé à la première
+        demande : vue sur le tampon de la session, valide jusqu'à sa capture suivante
+        (`composite_image` / `composite_bytes` en sont des copies).
+        """
+        if self.metadata.get("composite_array") is None and self.metadata.get("compose"):
+            self.metadata["composite_array"] = self.metadata["compose"]()
+        return self.metadata.get("composite_array")
+
     @property
     def composite_bytes(self) -> Optional[bytes]:
+        """PNG du composite, encodé à la première demande (enregistrement de partie)."""
+        if self.metadata.get("composite_bytes") is None and self.composite_image is not None:
+            buffer = io.BytesIO()
+            self.composite_image.save(buffer, format="PNG")
+            self.metadata["composite_bytes"] = buffer.getvalue()
         return self.metadata.get("composite_bytes")
-    
+
     @property
     def composite_image(self) -> Optional[Image.Image]:
-        """Reconstruit l'image composite à partir des bytes."""
-        if self.composite_bytes:
-            import io
-            return Image.open(io.BytesIO(self.composite_bytes))
-        return None
+        """Image composite (copie du tampon, ou décodage des bytes), mise en cache."""
+        image = self.metadata.get("composite_image")
+        if image is None:
+            if self.composite_array is not None:
+                image = Image.fromarray(self.composite_array)
+            elif self.metadata.get("composite_bytes"):
+                image = Image.open(io.BytesIO(self.metadata["composite_bytes"]))
+            self.metadata["composite_image"] = image
+        return image
@@ -1,9 +1,28 @@
 """Module s2_vision : Reconnaissance visuelle des cellules."""
 
+from importlib import import_module
+
 from .s2_types import VisionInput, VisionResult, CellMatch
-from .s2a_template_matcher import CenterTemplateMatcher, MatchResult
-from .s2_vision import analyze, analyze_image
-from .s2z_overlay_vision import VisionOverlay, vision_result_to_matches
+from .s2a_template_matcher import CenterTemplateMatcher, MatchResult, SharedTemplateBank, TemplateBank
+from .s2d_tile_vision import TileVision
+from .s2_vision import analyze, analyze_image, analyze_tiles, use_template_bank
+
+# Overlays de debug : chargés au premier accès (démarrage rapide)
+_LAZY_EXPORTS = {
+    "VisionOverlay": ".s2z_overlay_vision",
+    "render_and_save_vision_overlay": ".s2z_overlay_vision",
+    "vision_result_to_matches": ".s2z_overlay_vision",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "VisionInput",
@@ -11,8 +30,14 @@ __all__ = [
     "CellMatch",
     "CenterTemplateMatcher",
     "MatchResult",
+    "TemplateBank",
+    "SharedTemplateBank",
     "analyze",
     "analyze_image",
+    "analyze_tiles",
+    "TileVision",
+    "use_template_bank",
     "VisionOverlay",
+    "render_and_save_vision_overlay",
     "vision_result_to_matches",
 ]
@@ -0,0 +1,211 @@
+"""Benchmark vitesse/précision de la vision sur le data_set étiqueté.
+
+Usage :
+    python -m src.lib.s2_vision.bench --grid 40 60 --composites 3 --seed 1
+
+Deux passes :
+- `classify_cell` sur chaque échantillon du data_set (par cellule)
+- `classify_grid` (moteur batch) sur des composites synthétiques pavés
+  à partir du data_set, avec la géométrie réelle (stride 25, bordures)
+
+Rapporte ms/cellule, cellules/s, matrice de confusion, précision,
+répartition des chemins de décision (downscale, uniforme, template...) et
+élagage par étage de la cascade de rejet précoce.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from src.config import CELL_SIZE, CELL_BORDER
+from .s2a_template_matcher import CenterTemplateMatcher
+
+GRID_LINE_COLOR = (160, 160, 160)
+
+Sample = Tuple[str, np.ndarray]  # (symbole attendu, cellule 24×24×3 uint8)
+
+
+def _default_dataset_dir() -> Path:
+    return Path(__file__).resolve().parent / "templates" / "Template analizer" / "data_set"
+
+
+def load_dataset(dataset_dir: Optional[Path] = None) -> List[Sample]:
+    """Charge toutes les cellules étiquetées (un sous-dossier par symbole)."""
+    dataset_dir = Path(dataset_dir or _default_dataset_dir())
+    samples: List[Sample] = []
+    for symbol_dir in sorted(p for p in dataset_dir.iterdir() if p.is_dir() and not p.name.startswith("_")):
+        for path in sorted(symbol_dir.glob("*.png")):
+            cell = np.asarray(Image.open(path).convert("RGB"), dtype=np.uint8)
+            if cell.shape[:2] == (CELL_SIZE, CELL_SIZE):
+                samples.append((symbol_dir.name, cell))
+    return samples
+
+
+def _confusion(pairs: List[Tuple[str, str]]) -> Dict[str, Dict[str, int]]:
+    matrix: Dict[str, Dict[str, int]] = {}
+    for expected, predicted in pairs:
+        row = matrix.setdefault(expected, {})
+        row[predicted] = row.get(predicted, 0) + 1
+    return matrix
+
+
+def _cascade_report(stats: Dict[str, int]) -> Dict[str, Any]:
+    """Élagage par étage de la cascade (couples cellule × template)."""
+    pairs = stats.get("pairs", 0)
+    return {
+        **stats,
+        "bounds_prune_rate": stats.get("pruned_bounds", 0) / pairs if pairs else 0.0,
+        "distance_rate": stats.get("distances", 0) / pairs if pairs else 0.0,
+    }
+
+
+def _report(
+    pairs: List[Tuple[str, str]],
+    elapsed: float,
+    path_stats: Dict[str, int],
+    cascade_stats: Dict[str, int],
+) -> Dict[str, Any]:
+    count = len(pairs)
+    correct = sum(1 for expected, predicted in pairs if expected == predicted)
+    return {
+        "cells": count,
+        "ms_per_cell": elapsed * 1000 / count if count else 0.0,
+        "cells_per_s": count / elapsed if elapsed > 0 else 0.0,
+        "accuracy": correct / count if count else 0.0,
+        "errors": count - correct,
+        "path_stats": dict(path_stats),
+        "uniform_hit_rate": path_stats.get("uniform", 0) / count if count else 0.0,
+        "downscale_hit_rate": path_stats.get("downscale", 0) / count if count else 0.0,
+        "cascade": _cascade_report(cascade_stats),
+        "confusion": _confusion(pairs),
+    }
+
+
+def bench_cells(matcher: CenterTemplateMatcher, samples: List[Sample]) -> Dict[str, Any]:
+    """Classification cellule par cellule sur le data_set."""
+    matcher.reset_path_stats()
+    pairs: List[Tuple[str, str]] = []
+    start = time.perf_counter()
+    for expected, cell in samples:
+        pairs.append((expected, matcher.classify_cell(cell).symbol))
+    elapsed = time.perf_counter() - start
+    return _report(pairs, elapsed, matcher.path_stats, matcher.cascade.stats.as_dict())
+
+
+def build_composite(
+    samples: List[Sample],
+    rows: int,
+    cols: int,
+    rng: random.Random,
+    unrevealed_ratio: float,
+) -> Tuple[Image.Image, List[List[str]]]:
+    """Composite synthétique rows×cols (géométrie du jeu) et étiquettes attendues."""
+    stride = CELL_SIZE + CELL_BORDER
+    unrevealed = [s for s in samples if s[0] == "unrevealed"]
+    others = [s for s in samples if s[0] != "unrevealed"]
+
+    canvas = np.empty((rows * stride, cols * stride, 3), dtype=np.uint8)
+    canvas[:] = GRID_LINE_COLOR
+    labels: List[List[str]] = []
+    for row in range(rows):
+        label_row = []
+        for col in range(cols):
+            pool = unrevealed if unrevealed and rng.random() < unrevealed_ratio else others
+            symbol, cell = rng.choice(pool)
+            y, x = row * stride, col * stride
+            canvas[y:y + CELL_SIZE, x:x + CELL_SIZE] = cell
+            label_row.append(symbol)
+        labels.append(label_row)
+    return Image.fromarray(canvas), labels
+
+
+def bench_grid(
+    matcher: CenterTemplateMatcher,
+    samples: List[Sample],
+    rows: int,
+    cols: int,
+    composites: int,
+    seed: int,
+    unrevealed_ratio: float,
+) -> Dict[str, Any]:
+    """Moteur batch (classify_grid) sur composites synthétiques."""
+    rng = random.Random(seed)
+    stride = CELL_SIZE + CELL_BORDER
+    matcher.reset_path_stats()
+    pairs: List[Tuple[str, str]] = []
+    elapsed = 0.0
+    for _ in range(composites):
+        image, labels = build_composite(samples, rows, cols, rng, unrevealed_ratio)
+        start = time.perf_counter()
+        results = matcher.classify_grid(image, (0, 0), (cols, rows), stride=stride)
+        elapsed += time.perf_counter() - start
+        for row in range(rows):
+            for col in range(cols):
+                match = results.get((row, col))
+                pairs.append((labels[row][col], match.symbol if match else "missing"))
+    return _report(pairs, elapsed, matcher.path_stats, matcher.cascade.stats.as_dict())
+
+
+def run_bench(
+    grid: Tuple[int, int] = (40, 60),
+    composites: int = 3,
+    seed: int = 1,
+    unrevealed_ratio: float = 0.6,
+    dataset_dir: Optional[Path] = None,
+) -> Dict[str, Any]:
+    samples = load_dataset(dataset_dir)
+    matcher = CenterTemplateMatcher()
+    rows, cols = grid
+    # Les logs [VISION_PERF] sont capturés pour garder un JSON propre
+    with contextlib.redirect_stdout(io.StringIO()):
+        cells_report = bench_cells(matcher, samples)
+        grid_report = bench_grid(matcher, samples, rows, cols, composites, seed, unrevealed_ratio)
+    return {
+        "dataset_cells": len(samples),
+        "grid": {"rows": rows, "cols": cols, "composites": composites, "seed": seed,
+                 "unrevealed_ratio": unrevealed_ratio},
+        "engines": {
+            "classify_cell": cells_report,
+            "classify_grid": grid_report,
+        },
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark vitesse/précision de la vision (s2)")
+    parser.add_argument("--grid", type=int, nargs=2, default=[40, 60], metavar=("ROWS", "COLS"))
+    parser.add_argument("--composites", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--unrevealed-ratio", type=float, default=0.6)
+    parser.add_argument("--dataset", help="Dossier data_set (défaut : templates/Template analizer/data_set)")
+    parser.add_argument("--output", help="Fichier JSON de sortie (stdout par défaut)")
+    args = parser.parse_args(argv)
+
+    report = run_bench(
+        grid=tuple(args.grid),
+        composites=args.composites,
+        seed=args.seed,
+        unrevealed_ratio=args.unrevealed_ratio,
+        dataset_dir=Path(args.dataset) if args.dataset else None,
+    )
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload)
+        print(f"[BENCH] Rapport écrit : {args.output}")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,7 @@ class VisionInput:
     bounds: GridBounds
     known_set: Optional[Set[Tuple[int, int]]] = None
     cell_size: int = 24
+    known_mask: Optional[Any] = None  # np.ndarray bool [row, col] aligné sur bounds (prioritaire sur known_set)
 
 
 @dataclass
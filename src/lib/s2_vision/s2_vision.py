@@ -8,11 +8,14 @@ import time
 from src.config import CELL_SIZE, CELL_BORDER
 from typing import Dict, List, Optional, Set, Tuple
 
+import numpy as np
 from PIL import Image
 
 from src.lib.s0_coordinates.types import Coord, GridBounds
+from src.startup_profile import startup_profile
 from .s2_types import VisionInput, VisionResult, CellMatch
-from .s2a_template_matcher import CenterTemplateMatcher, MatchResult
+from .s2a_template_matcher import CenterTemplateMatcher, MatchResult, TemplateBank
+from .s2d_tile_vision import TileKey, TileVision
 
 
 _default_matcher: Optional[CenterTemplateMatcher] = None
@@ -21,7 +24,15 @@ _default_matcher: Optional[CenterTemplateMatcher] = None
 def _get_matcher() -> CenterTemplateMatcher:
     global _default_matcher
     if _default_matcher is None:
-        _default_matcher = CenterTemplateMatcher()
+        with startup_profile.phase("banque de templates"):
+            _default_matcher = CenterTemplateMatcher()
+    return _default_matcher
+
+
+def use_template_bank(bank: TemplateBank) -> CenterTemplateMatcher:
+    """Remplace le matcher par défaut par un matcher sur une banque fournie (mémoire partagée)."""
+    global _default_matcher
+    _default_matcher = CenterTemplateMatcher(bank=bank)
     return _default_matcher
 
 
@@ -56,6 +67,7 @@ def analyze(input: VisionInput) -> VisionResult:
                 stride=CELL_SIZE + CELL_BORDER,
                 known_set=input.known_set,
                 bounds_offset=(input.bounds.min_col, input.bounds.min_row) if input.bounds else None,
+                known_mask=input.known_mask,
             )
             
             # Convertir les résultats en CellMatch
@@ -93,17 +105,23 @@ def analyze(input: VisionInput) -> VisionResult:
 
 
 def analyze_image(
-    image: Image.Image,
+    image: Image.Image | np.ndarray,
     bounds: GridBounds,
     cell_size: int = 24,
     known_set: Optional[Set[Tuple[int, int]]] = None,
+    known_mask: Optional[np.ndarray] = None,
 ) -> VisionResult:
-    """Analyse une image PIL directement."""
+    """Analyse une image PIL, ou un tableau (H, W, 3) uint8 lu sans copie.
+
+    `known_mask` : cellules connues [row, col] alignées sur `bounds`
+    (StorageController.get_known_mask), prioritaire sur `known_set`.
+    """
     matcher = _get_matcher()
     start_time = time.time()
     
-    cols = image.width // cell_size
-    rows = image.height // cell_size
+    height, width = image.shape[:2] if isinstance(image, np.ndarray) else (image.height, image.width)
+    cols = width // cell_size
+    rows = height // cell_size
     
     grid_results = matcher.classify_grid(
         image=image,
@@ -112,6 +130,7 @@ def analyze_image(
         stride=CELL_SIZE + CELL_BORDER,
         known_set=known_set,
         bounds_offset=(bounds.min_col, bounds.min_row),
+        known_mask=known_mask,
     )
     
     matches = [
@@ -130,3 +149,43 @@ def analyze_image(
         timestamp=time.time(),
         metadata={"duration": time.time() - start_time},
     )
+
+
+def analyze_tiles(
+    tiles: Dict[TileKey, np.ndarray],
+    bounds: GridBounds,
+    known_mask: Optional[np.ndarray] = None,
+    tracker: Optional[TileVision] = None,
+    changed_only: bool = True,
+) -> VisionResult:
+    """Analyse directement les tuiles canvas, sans composite.
+
+    `tracker` garde les tuiles de la passe précédente : avec `changed_only`,
+    seules les cellules touchant une tuile modifiée sont reclassifiées (sans
+    tracker, passe complète). `known_mask` comme pour `analyze_image`.
+    """
+    matcher = _get_matcher()
+    start_time = time.time()
+    tracker = tracker or TileVision()
+
+    cols, rows, cells, changed = tracker.extract(tiles, bounds, known_mask=known_mask, changed_only=changed_only)
+    results = matcher.classify_patches(cells)
+
+    matches = [
+        CellMatch(
+            coord=Coord(row=row, col=col),
+            symbol=result.symbol,
+            confidence=result.confidence,
+            distance=result.distance,
+            threshold=result.threshold,
+        )
+        for col, row, result in zip(cols.tolist(), rows.tolist(), results)
+    ]
+
+    duration = time.time() - start_time
+    print(f"[VISION_PERF] Tuiles: {changed}/{len(tiles)} modifiées | {len(matches)} cells | {duration*1000:.2f}ms")
+    return VisionResult(
+        matches=matches,
+        timestamp=time.time(),
+        metadata={"duration": duration, "tile_count": len(tiles), "changed_tiles": changed},
+    )
@@ -2,17 +2,21 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
 import time
 from dataclasses import dataclass
-from pathlib import Path
-from typing import Dict, Iterable, Optional, Tuple, Any
+from multiprocessing import shared_memory
+from pathlib import Path, PureWindowsPath
+from typing import Dict, Iterable, List, Optional, Tuple, Any
 
 import numpy as np
 from PIL import Image
 
 from src.config import CELL_SIZE
 from .s2b_gpu_downscaler import GPUDownscaler
+from .s2c_cascade import TemplateCascade
 
 
 def _default_manifest_path() -> Path:
@@ -32,6 +36,215 @@ class TemplateData:
     image_count: int
 
 
+def _bank_cache_path(manifest_path: Path) -> Path:
+    return manifest_path.with_name(manifest_path.stem + "_bank.npz")
+
+
+@dataclass
+class TemplateBank:
+    """
+    Templates compilés en une matrice contiguë (T, D) des fenêtres gardées aplaties.
+
+    Les distances d'un lot de cellules à tous les templates sortent d'un seul
+    produit matriciel : ‖x − t‖² = ‖x‖² + ‖t‖² − 2 x·t. Les vecteurs sont
+    centrés (moyenne des templates) pour limiter l'annulation en float32.
+    """
+    symbols: Tuple[str, ...]
+    means: np.ndarray         # (T, h, w, 3) float32, templates moyens bruts
+    stds: np.ndarray          # (T, h, w, 3) float32
+    thresholds: np.ndarray    # (T,) float32, seuils suggérés du manifest (0 = aucun)
+    image_counts: np.ndarray  # (T,) int32
+    margin: int
+    guard: int
+    matrix: np.ndarray        # (T, D) float32, fenêtres gardées centrées
+    center: np.ndarray        # (D,) float32
+    sq_norms: np.ndarray      # (T,) float32
+    digest: str = ""
+
+    @staticmethod
+    def guarded(arr: np.ndarray, guard: int) -> np.ndarray:
+        """Fenêtre de distance : bord de `guard` pixels retiré (axes h, w des derniers rangs)."""
+        h, w = arr.shape[-3], arr.shape[-2]
+        if guard <= 0 or guard * 2 >= h or guard * 2 >= w:
+            return arr
+        return arr[..., guard:h - guard, guard:w - guard, :]
+
+    @classmethod
+    def compile(
+        cls,
+        symbols: Tuple[str, ...],
+        means: np.ndarray,
+        stds: np.ndarray,
+        thresholds: np.ndarray,
+        image_counts: np.ndarray,
+        margin: int,
+        guard: int,
+        digest: str = "",
+    ) -> "TemplateBank":
+        windows = cls.guarded(means, guard).reshape(len(symbols), -1).astype(np.float32)
+        center = windows.mean(axis=0) if len(symbols) else np.zeros(windows.shape[1], dtype=np.float32)
+        matrix = np.ascontiguousarray(windows - center, dtype=np.float32)
+        return cls(
+            symbols=tuple(symbols),
+            means=means.astype(np.float32),
+            stds=stds.astype(np.float32),
+            thresholds=thresholds.astype(np.float32),
+            image_counts=image_counts.astype(np.int32),
+            margin=margin,
+            guard=guard,
+            matrix=matrix,
+            center=center.astype(np.float32),
+            sq_norms=np.einsum("td,td->t", matrix, matrix),
+            digest=digest,
+        )
+
+    @classmethod
+    def from_manifest(cls, manifest_path: Path, guard: int) -> "TemplateBank":
+        """Compile le manifest, via le cache .npz voisin s'il est à jour (sinon le régénère)."""
+        raw = manifest_path.read_bytes()
+        digest = hashlib.sha1(raw + f"|guard={guard}".encode()).hexdigest()
+        cache_path = _bank_cache_path(manifest_path)
+        if cache_path.exists():
+            try:
+                bank = cls.load(cache_path)
+                if bank.digest == digest:
+                    return bank
+            except Exception as e:
+                print(f"[TEMPLATES] Cache illisible ({cache_path.name}): {e}")
+
+        data = json.loads(raw.decode("utf-8"))
+        base_dir = manifest_path.parent
+        payloads = data.get("templates", {})
+        symbols = tuple(payloads)
+        # Le manifest est généré sous Windows (séparateurs antislash) : normaliser
+        means = [np.load(base_dir / PureWindowsPath(p["mean_template_file"]).as_posix()) for p in payloads.values()]
+        stds = [np.load(base_dir / PureWindowsPath(p["std_template_file"]).as_posix()) for p in payloads.values()]
+        bank = cls.compile(
+            symbols=symbols,
+            means=np.stack(means) if means else np.zeros((0, 1, 1, 3), dtype=np.float32),
+            stds=np.stack(stds) if stds else np.zeros((0, 1, 1, 3), dtype=np.float32),
+            thresholds=np.array([float(p.get("suggested_threshold", 0.0)) for p in payloads.values()]),
+            image_counts=np.array([int(p.get("image_count", 0)) for p in payloads.values()]),
+            margin=int(data.get("margin", 7)),
+            guard=guard,
+            digest=digest,
+        )
+        try:
+            bank.save(cache_path)
+            print(f"[TEMPLATES] Banque compilée : {cache_path.name} ({len(symbols)} templates)")
+        except OSError as e:
+            print(f"[TEMPLATES] Cache non écrit ({cache_path}): {e}")
+        return bank
+
+    def save(self, path: Path) -> None:
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                symbols=np.array(self.symbols, dtype=str),
+                means=self.means,
+                stds=self.stds,
+                thresholds=self.thresholds,
+                image_counts=self.image_counts,
+                header=np.array([self.margin, self.guard], dtype=np.int32),
+                matrix=self.matrix,
+                center=self.center,
+                sq_norms=self.sq_norms,
+                digest=np.array(self.digest),
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "TemplateBank":
+        with np.load(path, allow_pickle=False) as data:
+            margin, guard = (int(v) for v in data["header"])
+            return cls(
+                symbols=tuple(str(s) for s in data["symbols"]),
+                means=data["means"],
+                stds=data["stds"],
+                thresholds=data["thresholds"],
+                image_counts=data["image_counts"],
+                margin=margin,
+                guard=guard,
+                matrix=data["matrix"],
+                center=data["center"],
+                sq_norms=data["sq_norms"],
+                digest=str(data["digest"]),
+            )
+
+    def distances(self, windows: np.ndarray) -> np.ndarray:
+        """Distances euclidiennes (N, T) de N fenêtres aplaties (N, D) à tous les templates."""
+        x = np.asarray(windows, dtype=np.float32) - self.center
+        sq = np.einsum("nd,nd->n", x, x)[:, None] + self.sq_norms[None, :] - 2.0 * (x @ self.matrix.T)
+        return np.sqrt(np.maximum(sq, 0.0, out=sq), out=sq)
+
+
+# Tableaux de la banque publiés en mémoire partagée (les métadonnées voyagent dans le handle)
+_SHARED_FIELDS = ("means", "stds", "thresholds", "image_counts", "matrix", "center", "sq_norms")
+_attached_segments: Dict[str, shared_memory.SharedMemory] = {}
+
+
+@dataclass(frozen=True)
+class SharedTemplateBank:
+    """
+    Handle picklable d'une banque publiée en mémoire partagée.
+
+    Le processus orchestrateur publie la banque une fois ; chaque processus de
+    session s'y attache et obtient des vues numpy en lecture seule (aucune copie).
+    """
+    shm_name: str
+    layout: Tuple[Tuple[str, str, Tuple[int, ...], int], ...]  # (champ, dtype, shape, offset)
+    symbols: Tuple[str, ...]
+    margin: int
+    guard: int
+    digest: str
+
+    @classmethod
+    def publish(cls, bank: TemplateBank) -> Tuple["SharedTemplateBank", shared_memory.SharedMemory]:
+        """Copie les tableaux dans un segment partagé ; l'appelant garde (et libère) le segment."""
+        layout = []
+        offset = 0
+        for name in _SHARED_FIELDS:
+            array = np.ascontiguousarray(getattr(bank, name))
+            offset = (offset + 63) // 64 * 64  # Alignement des tableaux
+            layout.append((name, array.dtype.str, tuple(array.shape), offset))
+            offset += array.nbytes
+        segment = shared_memory.SharedMemory(create=True, size=max(1, offset))
+        for name, dtype, shape, start in layout:
+            view = np.ndarray(shape, dtype=dtype, buffer=segment.buf, offset=start)
+            view[...] = getattr(bank, name)
+        handle = cls(
+            shm_name=segment.name,
+            layout=tuple(layout),
+            symbols=bank.symbols,
+            margin=bank.margin,
+            guard=bank.guard,
+            digest=bank.digest,
+        )
+        return handle, segment
+
+    def attach(self) -> TemplateBank:
+        """Banque adossée au segment partagé (vues en lecture seule)."""
+        segment = _attached_segments.get(self.shm_name)
+        if segment is None:
+            # Processus lancés en spawn : ils partagent le resource tracker de l'orchestrateur,
+            # seul propriétaire du segment (libéré par lui via unlink)
+            segment = shared_memory.SharedMemory(name=self.shm_name)
+            _attached_segments[self.shm_name] = segment
+        arrays = {}
+        for name, dtype, shape, start in self.layout:
+            view = np.ndarray(shape, dtype=dtype, buffer=segment.buf, offset=start)
+            view.flags.writeable = False
+            arrays[name] = view
+        return TemplateBank(
+            symbols=self.symbols,
+            margin=self.margin,
+            guard=self.guard,
+            digest=self.digest,
+            **arrays,
+        )
+
+
 @dataclass
 class MatchResult:
     symbol: str
@@ -64,133 +277,217 @@ class CenterTemplateMatcher:
         "empty", "question_mark",
     )
 
-    def __init__(self, manifest_path: Optional[str | Path] = None):
+    def __init__(self, manifest_path: Optional[str | Path] = None, bank: Optional[TemplateBank] = None):
+        """`bank` : banque déjà compilée (ex. mémoire partagée d'un orchestrateur), sinon le manifest est chargé."""
         self.manifest_path = Path(manifest_path or _default_manifest_path())
-        if not self.manifest_path.exists():
+        if bank is None and not self.manifest_path.exists():
             raise FileNotFoundError(f"Manifest introuvable: {self.manifest_path}")
         self.margin: int = 7
         self.templates: Dict[str, TemplateData] = {}
         self.gpu_downscaler = GPUDownscaler()
-        self._load_manifest()
-
-    def _load_manifest(self) -> None:
-        data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
-        self.margin = int(data.get("margin", 7))
-        base_dir = self.manifest_path.parent
-
-        for symbol, payload in data.get("templates", {}).items():
-            mean = np.load(base_dir / payload["mean_template_file"])
-            std = np.load(base_dir / payload["std_template_file"])
-            self.templates[symbol] = TemplateData(
+        # Compteurs par chemin de décision (bench : taux de fast path)
+        self.path_stats: Dict[str, int] = {}
+        self._load_manifest(bank)
+
+    def reset_path_stats(self) -> None:
+        self.path_stats = {}
+        self.cascade.reset_stats()
+
+    def _count_path(self, path: str, n: int = 1) -> None:
+        self.path_stats[path] = self.path_stats.get(path, 0) + n
+
+    def _load_manifest(self, bank: Optional[TemplateBank] = None) -> None:
+        """Charge la banque compilée (cache .npz : une lecture au lieu de 2×T `np.load`)."""
+        if bank is None:
+            bank = TemplateBank.from_manifest(self.manifest_path, self.DISTANCE_GUARD)
+        self.bank = bank
+        self.margin = bank.margin
+        self.templates = {
+            symbol: TemplateData(
                 symbol=symbol,
-                mean=mean.astype(np.float32),
-                std=std.astype(np.float32),
-                threshold=float(payload.get("suggested_threshold", 0.0)),
-                image_count=int(payload.get("image_count", 0)),
+                mean=bank.means[index],
+                std=bank.stds[index],
+                threshold=float(bank.thresholds[index]),
+                image_count=int(bank.image_counts[index]),
             )
+            for index, symbol in enumerate(bank.symbols)
+        }
+        self._symbol_index = {symbol: index for index, symbol in enumerate(bank.symbols)}
+        self._thresholds = np.array(
+            [self._effective_threshold(self.templates[symbol]) for symbol in bank.symbols], dtype=np.float32
+        )
+        self._priority = np.array(
+            [self._symbol_index[symbol] for symbol in self._ordered_symbols(bank.symbols)], dtype=np.intp
+        )
+        self._decor = np.array(
+            [self._symbol_index[symbol] for symbol in self.DECOR_SYMBOLS if symbol in self._symbol_index],
+            dtype=np.intp,
+        )
+        self.cascade = TemplateCascade(bank, self._thresholds, np.concatenate([self._priority, self._decor]))
 
     def classify_cell(self, cell_image: Image.Image | np.ndarray) -> MatchResult:
         """Classifie une cellule unique."""
         cell_rgb = self._to_rgb_array(cell_image)
         if cell_rgb.shape[0] != CELL_SIZE or cell_rgb.shape[1] != CELL_SIZE:
             raise ValueError(f"cell_image doit être de taille {CELL_SIZE}x{CELL_SIZE}")
+        return self.classify_cells(cell_rgb[None])[0]
+
+    def classify_cells(self, cells: np.ndarray) -> List[MatchResult]:
+        """
+        Classifie un lot de cellules (N, CELL_SIZE, CELL_SIZE, 3).
+
+        La décision suit l'ordre historique : zone uniforme (unrevealed /
+        exploded / empty), templates par priorité, décor, inconnu. Les
+        distances passent par la cascade de rejet précoce (`TemplateCascade`) :
+        seuls les couples (cellule, template) qui peuvent matcher sont calculés.
+        """
+        cells = np.asarray(cells, dtype=np.float32)
+        if not len(cells):
+            return []
+        bank = self.bank
+        m = self.margin
+        zones = cells[:, m:CELL_SIZE - m, m:CELL_SIZE - m, :]
+
+        # Étage 0 : zones uniformes (écart-type faible), blanc = unrevealed, gris = empty
+        zone_std = zones.std(axis=(1, 2, 3))
+        zone_mean = zones.mean(axis=(1, 2, 3))
+        uniform = zone_std <= 4.0
+        uniform_unrevealed = uniform & (zone_mean >= 230.0)
+        uniform_empty = uniform & (zone_mean >= 150.0) & (zone_mean <= 215.0)
+        white_border = self._unrevealed_border_white(cells)
+
+        unrevealed_index = self._symbol_index.get("unrevealed", -1)
+        exploded_index = self._symbol_index.get("exploded", -1)
+        empty_index = self._symbol_index.get("empty", -1)
+        forced = np.full(len(cells), -1, dtype=np.intp)
+        if unrevealed_index >= 0:
+            # Blanc sans bordure blanche : case explosée (si le template existe, sinon recherche)
+            forced[uniform_unrevealed] = np.where(white_border, unrevealed_index, exploded_index)[uniform_unrevealed]
+        if empty_index >= 0:
+            forced[uniform_empty] = empty_index
+
+        distances = self.cascade.distances(
+            TemplateBank.guarded(zones, bank.guard).reshape(len(cells), -1), forced
+        )
 
-        zone = self._extract_zone(cell_rgb)
-        zone_distance = self._distance_window(zone)
-
-        uniform_match = self._classify_uniform_zone(zone)
-        if uniform_match:
-            if uniform_match.symbol == "unrevealed" and not self._is_unrevealed_border_white(cell_rgb):
-                exploded_match = self._build_symbol_match("exploded", zone_distance)
-                if exploded_match:
-                    return exploded_match
+        # Premier template (par priorité) sous son seuil, puis décor
+        priority_thresholds = self._thresholds[self._priority]
+        hits = (distances[:, self._priority] < priority_thresholds) & (priority_thresholds > 0)
+        first_hit = np.where(hits.any(axis=1), hits.argmax(axis=1), -1)
+        decor_thresholds = self._thresholds[self._decor]
+        decor_hits = (distances[:, self._decor] < decor_thresholds) & (decor_thresholds > 0)
+        first_decor = np.where(decor_hits.any(axis=1), decor_hits.argmax(axis=1), -1)
+
+        results: List[MatchResult] = []
+        for n in range(len(cells)):
+            if forced[n] >= 0:
+                self._count_path("uniform")
+                results.append(self._match(forced[n], distances[n]))
+            elif first_hit[n] >= 0:
+                self._count_path("template")
+                results.append(self._match(self._priority[first_hit[n]], distances[n]))
+            elif first_decor[n] >= 0:
+                self._count_path("decor")
+                results.append(self._match(self._decor[first_decor[n]], distances[n]))
             else:
-                return uniform_match
-
-        for symbol in self._ordered_symbols(self.templates.keys()):
-            tpl = self.templates.get(symbol)
-            if tpl is None:
-                continue
-            tpl_mean = self._distance_window(tpl.mean)
-            diff = zone_distance - tpl_mean
-            dist = float(np.linalg.norm(diff))
-            threshold = self._effective_threshold(tpl)
-            if threshold > 0 and dist < threshold:
-                return MatchResult(
-                    symbol=symbol,
-                    distance=dist,
-                    threshold=threshold,
-                    confidence=MatchResult.compute_confidence(dist, threshold),
-                )
-
-        decor_match = self._match_decor(zone_distance)
-        if decor_match:
-            return decor_match
-
-        return MatchResult(symbol="unknown", distance=float("inf"), threshold=None, confidence=0.0)
+                self._count_path("unknown")
+                results.append(MatchResult(symbol="unknown", distance=float("inf"), threshold=None, confidence=0.0))
+        return results
+
+    def classify_patches(self, cells: np.ndarray) -> List[MatchResult]:
+        """
+        Classifie des cellules déjà extraites (N, CELL_SIZE, CELL_SIZE, 3) uint8
+        (vision par tuiles) : même pré-filtrage UNREVEALED puis même lot
+        matriciel que `classify_grid`.
+        """
+        unrevealed = self.gpu_downscaler.detect_unrevealed_cells(cells)
+        self._count_path("downscale", int(unrevealed.sum()))
+        results: List[MatchResult] = [
+            MatchResult(symbol="unrevealed", distance=0.0, threshold=100.0, confidence=1.0)
+            for _ in range(len(cells))
+        ]
+        remaining = np.flatnonzero(~unrevealed)
+        for index, result in zip(remaining.tolist(), self.classify_cells(cells[remaining])):
+            results[index] = result
+        return results
 
     def classify_grid(
         self,
-        image: Image.Image,
+        image: Image.Image | np.ndarray,
         grid_top_left: Tuple[int, int],
         grid_size: Tuple[int, int],
         stride: int = CELL_SIZE,
         known_set: Optional[set[Tuple[int, int]]] = None,
         bounds_offset: Optional[Tuple[int, int]] = None,
+        known_mask: Optional[np.ndarray] = None,
     ) -> Dict[Tuple[int, int], MatchResult]:
-        """Classifie une grille entière avec optimisation GPU pour UNREVEALED."""
+        """Classifie une grille entière avec optimisation GPU pour UNREVEALED.
+
+        `known_mask` : masque booléen [row, col] des cellules déjà connues (ignorées),
+        aligné sur la grille ; `known_set` (coordonnées absolues) reste accepté.
+        Un tableau (H, W, 3) uint8 est lu tel quel, sans copie.
+        """
         grid_start = time.time()
         start_x, start_y = grid_top_left
         cols, rows = grid_size
-        image_np = np.array(image.convert("RGB"))
+        image_np = image if isinstance(image, np.ndarray) else np.array(image.convert("RGB"))
         results: Dict[Tuple[int, int], MatchResult] = {}
 
         offset_x, offset_y = bounds_offset if bounds_offset else (0, 0)
 
-        # 🚀 GPU FAST PATH : Détecter UNREVEALED via downscale
-        unrevealed_cells = self.gpu_downscaler.detect_unrevealed(
+        # Cellules connues écartées en une opération, avant tout travail par cellule
+        skip = np.zeros((rows, cols), dtype=bool)
+        if known_mask is not None:
+            h, w = min(rows, known_mask.shape[0]), min(cols, known_mask.shape[1])
+            skip[:h, :w] = known_mask[:h, :w]
+        elif known_set is not None:
+            for row in range(rows):
+                for col in range(cols):
+                    skip[row, col] = (offset_x + col, offset_y + row) in known_set
+
+        # 🚀 FAST PATH : masque UNREVEALED par statistiques de bloc (ou downscale GPU)
+        unrevealed_mask = self.gpu_downscaler.detect_unrevealed(
             image_np, grid_top_left, grid_size, stride
         )
 
         template_count = 0
         template_time = 0.0
-        
-        for row in range(rows):
-            for col in range(cols):
-                abs_x = offset_x + col
-                abs_y = offset_y + row
-                
-                if known_set is not None and (abs_x, abs_y) in known_set:
-                    continue
-
-                # Si cellule détectée comme UNREVEALED par GPU/CPU fast path
-                if (row, col) in unrevealed_cells:
-                    results[(row, col)] = MatchResult(
-                        symbol="unrevealed",
-                        distance=0.0,
-                        threshold=100.0,
-                        confidence=1.0
-                    )
-                    continue
-                    
-                x0 = start_x + col * stride
-                y0 = start_y + row * stride
-                cell = image_np[y0 : y0 + CELL_SIZE, x0 : x0 + CELL_SIZE]
-                if cell.shape[0] != CELL_SIZE or cell.shape[1] != CELL_SIZE:
-                    continue
-                
-                # Tracker template matching
-                cell_start = time.time()
-                result = self.classify_cell(cell)
-                template_time += time.time() - cell_start
-                template_count += 1
-                
-                results[(row, col)] = result
+
+        todo = ~skip
+        downscale_rows, downscale_cols = np.nonzero(todo & unrevealed_mask)
+        downscale_hits = len(downscale_rows)
+        for row, col in zip(downscale_rows.tolist(), downscale_cols.tolist()):
+            results[(row, col)] = MatchResult(
+                symbol="unrevealed",
+                distance=0.0,
+                threshold=100.0,
+                confidence=1.0
+            )
+        template_rows, template_cols = np.nonzero(todo & ~unrevealed_mask)
+        template_rows, template_cols = template_rows.tolist(), template_cols.tolist()
+
+        # Cellules restantes : extraites en un lot et classifiées en un produit matriciel
+        if template_rows:
+            template_start = time.time()
+            ys = start_y + np.array(template_rows) * stride
+            xs = start_x + np.array(template_cols) * stride
+            inside = (ys >= 0) & (xs >= 0) & (ys + CELL_SIZE <= image_np.shape[0]) & (xs + CELL_SIZE <= image_np.shape[1])
+            offsets = np.arange(CELL_SIZE)
+            cells = image_np[
+                ys[inside][:, None, None] + offsets[None, :, None],
+                xs[inside][:, None, None] + offsets[None, None, :],
+            ]
+            coords = [coord for coord, ok in zip(zip(template_rows, template_cols), inside.tolist()) if ok]
+            results.update(zip(coords, self.classify_cells(cells)))
+            template_count = len(coords)
+            template_time = time.time() - template_start
+
+        self._count_path("downscale", downscale_hits)
 
         # Logs de performance
         grid_elapsed = time.time() - grid_start
         total_cells = rows * cols
-        unrevealed_count = len(unrevealed_cells)
+        unrevealed_count = int(unrevealed_mask.sum())
         revealed_count = total_cells - unrevealed_count
         
         print(f"[VISION_PERF] Template matching: {template_time*1000:.2f}ms | {template_count} cells | {template_time*1000/max(template_count, 1):.3f}ms/cell")
@@ -198,57 +495,30 @@ class CenterTemplateMatcher:
         
         return results
 
-    def _extract_zone(self, cell_rgb: np.ndarray) -> np.ndarray:
-        m = self.margin
-        return cell_rgb[m : CELL_SIZE - m, m : CELL_SIZE - m, :].astype(np.float32)
-
     def _ordered_symbols(self, symbols: Iterable[str]) -> Tuple[str, ...]:
         symbol_set = set(symbols)
         ordered = [s for s in self.SYMBOL_PRIORITY if s in symbol_set and s in self.templates]
-        for s in symbol_set:
+        for s in symbols:
             if s not in ordered and s in self.templates and s not in self.DECOR_SYMBOLS:
                 ordered.append(s)
         return tuple(ordered)
 
-    def _match_decor(self, zone_distance: np.ndarray) -> Optional[MatchResult]:
-        for symbol in self.DECOR_SYMBOLS:
-            tpl = self.templates.get(symbol)
-            if not tpl:
-                continue
-            tpl_mean = self._distance_window(tpl.mean)
-            dist = float(np.linalg.norm(zone_distance - tpl_mean))
-            threshold = self._effective_threshold(tpl)
-            if threshold > 0 and dist < threshold:
-                return MatchResult(
-                    symbol=symbol,
-                    distance=dist,
-                    threshold=threshold,
-                    confidence=MatchResult.compute_confidence(dist, threshold),
-                )
-        return None
-
-    def _is_unrevealed_border_white(self, cell_rgb: np.ndarray) -> bool:
-        coords = ((2, 2), (CELL_SIZE - 3, 2), (2, CELL_SIZE - 3), (CELL_SIZE - 3, CELL_SIZE - 3))
-        for y, x in coords:
-            pixel = cell_rgb[y, x]
-            if np.all(pixel >= self.UNREVEALED_WHITE_THRESHOLD):
-                return True
-        return False
-
-    def _build_symbol_match(self, symbol: str, zone_distance: np.ndarray) -> Optional[MatchResult]:
-        tpl = self.templates.get(symbol)
-        if not tpl:
-            return None
-        tpl_mean = self._distance_window(tpl.mean)
-        dist = float(np.linalg.norm(zone_distance - tpl_mean))
-        threshold = self._effective_threshold(tpl)
+    def _match(self, index: int, distances: np.ndarray) -> MatchResult:
+        dist = float(distances[index])
+        threshold = float(self._thresholds[index])
         return MatchResult(
-            symbol=symbol,
+            symbol=self.bank.symbols[index],
             distance=dist,
             threshold=threshold,
             confidence=MatchResult.compute_confidence(dist, threshold),
         )
 
+    def _unrevealed_border_white(self, cells: np.ndarray) -> np.ndarray:
+        """Par cellule : au moins un coin de bordure blanc (unrevealed vs exploded)."""
+        corners = np.array((2, CELL_SIZE - 3))
+        pixels = cells[:, corners[:, None], corners[None, :], :]  # (N, 2, 2, 3)
+        return (pixels >= self.UNREVEALED_WHITE_THRESHOLD).all(axis=-1).any(axis=(1, 2))
+
     @staticmethod
     def _to_rgb_array(cell_image: Image.Image | np.ndarray) -> np.ndarray:
         if isinstance(cell_image, Image.Image):
@@ -258,39 +528,7 @@ class CenterTemplateMatcher:
             arr = np.repeat(arr[:, :, None], 3, axis=2)
         return arr
 
-    def _classify_uniform_zone(self, zone: np.ndarray) -> Optional[MatchResult]:
-        std = float(zone.std())
-        mean = float(zone.mean())
-        if std > 4.0:
-            return None
-        if mean >= 230.0:
-            return self._build_uniform_match("unrevealed", zone)
-        if 150.0 <= mean <= 215.0:
-            return self._build_uniform_match("empty", zone)
-        return None
-
-    def _build_uniform_match(self, symbol: str, zone: np.ndarray) -> Optional[MatchResult]:
-        tpl = self.templates.get(symbol)
-        if not tpl:
-            return None
-        zone_distance = self._distance_window(zone)
-        tpl_mean = self._distance_window(tpl.mean)
-        dist = float(np.linalg.norm(zone_distance - tpl_mean))
-        threshold = self._effective_threshold(tpl)
-        return MatchResult(
-            symbol=symbol,
-            distance=dist,
-            threshold=threshold,
-            confidence=MatchResult.compute_confidence(dist, threshold),
-        )
-
     def _effective_threshold(self, tpl: TemplateData) -> float:
         if tpl.threshold > 0:
             return tpl.threshold
         return self.UNIFORM_THRESHOLDS.get(tpl.symbol, 150.0)
-
-    def _distance_window(self, arr: np.ndarray) -> np.ndarray:
-        guard = self.DISTANCE_GUARD
-        if guard <= 0 or guard * 2 >= arr.shape[0] or guard * 2 >= arr.shape[1]:
-            return arr
-        return arr[guard : arr.shape[0] - guard, guard : arr.shape[1] - guard, :]
@@ -1,17 +1,36 @@
-"""GPU-accelerated downscaler pour détection rapide des cellules UNREVEALED."""
+"""
+Pré-filtrage rapide des cellules UNREVEALED (zones blanches uniformes).
+
+CPU (défaut) : la région de la grille est vue comme un réseau
+(rows, stride, cols, stride, 3) par simple reshape (aucune copie) ; les
+statistiques de bloc (moyenne, écart max − min) de la fenêtre centrale de
+chaque cellule sont calculées pour toute la grille en une opération.
+
+GPU : downscale bilinéaire PyTorch/CUDA, uniquement si demandé
+(`VISION_CONFIG['downscaler_device'] = 'cuda'`) ; torch est alors importé
+à la première détection seulement.
+"""
 
 from __future__ import annotations
 
 import time
-from typing import Set, Tuple, Optional
+from typing import Optional, Tuple
+
 import numpy as np
-from src.config import CELL_SIZE
+
+from src.config import CELL_SIZE, VISION_CONFIG
 
 
 class GPUDownscaler:
-    """Détecte les cellules UNREVEALED via downscale GPU 25× ou CPU fallback."""
+    """Détecte les cellules UNREVEALED : statistiques de bloc CPU vectorisées, ou downscale CUDA sur demande."""
+
+    # Fenêtre centrale [début, fin) de la cellule, commune aux deux axes
+    WINDOW: Tuple[int, int] = (CELL_SIZE // 4, CELL_SIZE - CELL_SIZE // 4 + 1)
+    WHITE_MEAN: float = 230.0   # Moyenne minimale de la fenêtre
+    MAX_SPREAD: float = 12.0    # Écart max − min toléré (une case non révélée est uniforme)
 
-    def __init__(self):
+    def __init__(self, device: str = VISION_CONFIG['downscaler_device']):
+        self.device = device
         self._gpu_available: Optional[bool] = None
 
     def detect_unrevealed(
@@ -20,231 +39,140 @@ class GPUDownscaler:
         grid_top_left: Tuple[int, int],
         grid_size: Tuple[int, int],
         stride: int = CELL_SIZE,
-    ) -> Set[Tuple[int, int]]:
+    ) -> np.ndarray:
         """
         Détecte les cellules UNREVEALED (zones blanches uniformes).
-        
-        Essaie GPU downscale d'abord, fallback CPU pre-screening si indisponible.
-        
+
         Args:
             image_np: Image numpy (H, W, 3) en uint8
             grid_top_left: (x, y) coin supérieur gauche de la grille
             grid_size: (cols, rows) dimensions de la grille en cellules
             stride: Taille en pixels entre deux cellules (défaut: CELL_SIZE=24)
-        
+
         Returns:
-            Set de tuples (row, col) des cellules UNREVEALED détectées
+            Masque booléen (rows, cols) des cellules UNREVEALED détectées
         """
         t0 = time.time()
-        
-        # Vérifier GPU disponibilité une seule fois
-        if self._gpu_available is None:
-            self._gpu_available = self._check_gpu_available()
-
-        if self._gpu_available:
-            try:
-                result = self._downscale_gpu(image_np, grid_top_left, grid_size, stride)
-                elapsed = time.time() - t0
-                cols, rows = grid_size
-                total_cells = rows * cols
-                print(f"[VISION_PERF] GPU downscale: {elapsed*1000:.2f}ms | {total_cells} cells | {elapsed*1000/total_cells:.3f}ms/cell")
-                return result
-            except Exception as e:
-                print(f"[GPU_DOWNSCALER] GPU failed: {e}, fallback to CPU")
-                self._gpu_available = False
-
-        # Fallback CPU
-        result = self._downscale_cpu(image_np, grid_top_left, grid_size, stride)
-        elapsed = time.time() - t0
         cols, rows = grid_size
-        total_cells = rows * cols
+        total_cells = max(1, rows * cols)
+
+        if self.device == "cuda":
+            if self._gpu_available is None:
+                self._gpu_available = self._check_gpu_available()
+            if self._gpu_available:
+                try:
+                    result = self._downscale_gpu(image_np, grid_top_left, grid_size, stride)
+                    elapsed = time.time() - t0
+                    print(f"[VISION_PERF] GPU downscale: {elapsed*1000:.2f}ms | {total_cells} cells | {elapsed*1000/total_cells:.3f}ms/cell")
+                    return result
+                except Exception as e:
+                    print(f"[GPU_DOWNSCALER] GPU failed: {e}, fallback to CPU")
+                    self._gpu_available = False
+
+        result = self._block_statistics(image_np, grid_top_left, grid_size, stride)
+        elapsed = time.time() - t0
         print(f"[VISION_PERF] CPU pre-screening: {elapsed*1000:.2f}ms | {total_cells} cells | {elapsed*1000/total_cells:.3f}ms/cell")
         return result
 
     def _check_gpu_available(self) -> bool:
-        """Vérifie si PyTorch + CUDA sont disponibles."""
+        """Vérifie si PyTorch + CUDA sont disponibles (import de torch à ce moment seulement)."""
         try:
             import torch
-            return torch.cuda.is_available()
+            available = torch.cuda.is_available()
         except ImportError:
-            return False
+            available = False
+        if not available:
+            print("[GPU_DOWNSCALER] CUDA demandé mais indisponible, pré-filtrage CPU")
+        return available
 
-    def _downscale_gpu(
+    def _grid_lattice(
         self,
         image_np: np.ndarray,
         grid_top_left: Tuple[int, int],
         grid_size: Tuple[int, int],
         stride: int,
-    ) -> Set[Tuple[int, int]]:
+    ) -> np.ndarray:
         """
-        Downscale GPU 25× pour détecter UNREVEALED.
-        
-        Stratégie : 512×512 → ~20×20 pixels (1 pixel = 1 cellule)
-        Pixels blancs uniformes = UNREVEALED certains
+        Vue (rows, stride, cols, stride, 3) de la région de la grille.
+        Les parties hors image sont complétées en noir (jamais détectées blanches).
         """
-        import torch
-
         start_x, start_y = grid_top_left
         cols, rows = grid_size
-
-        # Extraire région grille complète
-        grid_height = rows * stride
-        grid_width = cols * stride
-        grid_region = image_np[
-            start_y : start_y + grid_height,
-            start_x : start_x + grid_width
-        ]
-
-        if grid_region.shape[0] < stride or grid_region.shape[1] < stride:
-            return set()
-
-        # Copier vers GPU (float32, normalisé [0, 1])
-        image_tensor = torch.from_numpy(grid_region).float().cuda() / 255.0
-        image_tensor = image_tensor.unsqueeze(0).permute(0, 3, 1, 2)  # (1, 3, H, W)
-
-        # Downscale vers taille grille (chaque pixel = 1 cellule)
-        downscaled = torch.nn.functional.interpolate(
-            image_tensor,
-            size=(rows, cols),
-            mode='bilinear',
-            align_corners=False
-        )  # (1, 3, rows, cols)
-
-        # Détecter pixels blancs uniformes
-        # mean >= 0.88 (225/255) et std < 0.02 (5/255)
-        mean = downscaled.mean(dim=1, keepdim=True)  # (1, 1, rows, cols)
-        std = downscaled.std(dim=1, keepdim=True)    # (1, 1, rows, cols)
-
-        white_mask = (mean >= 0.88) & (std < 0.02)  # (1, 1, rows, cols)
-        white_mask = white_mask.squeeze().cpu().numpy()  # (rows, cols)
-
-        # Convertir en coordonnées de cellules
-        unrevealed_cells = set()
-        if white_mask.ndim == 0:  # Cas 1×1
-            if white_mask:
-                unrevealed_cells.add((0, 0))
-        elif white_mask.ndim == 1:  # Cas 1D
-            for idx in range(len(white_mask)):
-                if white_mask[idx]:
-                    unrevealed_cells.add((0, idx) if rows == 1 else (idx, 0))
-        else:  # Cas 2D normal
-            for row in range(white_mask.shape[0]):
-                for col in range(white_mask.shape[1]):
-                    if white_mask[row, col]:
-                        unrevealed_cells.add((row, col))
-
-        return unrevealed_cells
-
-    def _downscale_cpu(
+        height, width = rows * stride, cols * stride
+        img_h, img_w = image_np.shape[:2]
+        if start_x >= 0 and start_y >= 0 and start_y + height <= img_h and start_x + width <= img_w:
+            region = image_np[start_y:start_y + height, start_x:start_x + width]
+        else:
+            region = np.zeros((height, width, 3), dtype=image_np.dtype)
+            y0, x0 = max(0, start_y), max(0, start_x)
+            y1, x1 = min(img_h, start_y + height), min(img_w, start_x + width)
+            if y1 > y0 and x1 > x0:
+                region[y0 - start_y:y1 - start_y, x0 - start_x:x1 - start_x] = image_np[y0:y1, x0:x1]
+        return region.reshape(rows, stride, cols, stride, 3)
+
+    def _block_statistics(
         self,
         image_np: np.ndarray,
         grid_top_left: Tuple[int, int],
         grid_size: Tuple[int, int],
         stride: int,
-    ) -> Set[Tuple[int, int]]:
+    ) -> np.ndarray:
+        """Moyenne et écart max − min de la fenêtre centrale de chaque cellule, toutes en une fois."""
+        cols, rows = grid_size
+        if rows <= 0 or cols <= 0:
+            return np.zeros((max(0, rows), max(0, cols)), dtype=bool)
+        start, end = self.WINDOW
+        end = min(end, stride)
+        window = self._grid_lattice(image_np, grid_top_left, grid_size, stride)[:, start:end, :, start:end, :]
+        return self._white_uniform(window, axes=(1, 3, 4))
+
+    def detect_unrevealed_cells(self, cells: np.ndarray) -> np.ndarray:
         """
-        Downscale CPU pre-screening (fallback optimisé).
-        
-        Stratégie : Échantillonnage 3 points par cellule (centre + 2 bords)
-        Optimisé différemment selon la taille de la grille.
+        Variante sur cellules déjà extraites (N, CELL_SIZE, CELL_SIZE, 3) uint8
+        (vision par tuiles) : mêmes statistiques de fenêtre centrale, sur CPU.
         """
-        start_x, start_y = grid_top_left
-        cols, rows = grid_size
-        total_cells = rows * cols
-        
-        # Pour les petites grilles (< 50k cellules), utiliser les boucles Python
-        if total_cells < 50000:
-            return self._downscale_cpu_small(image_np, grid_top_left, grid_size, stride)
-        else:
-            return self._downscale_cpu_large(image_np, grid_top_left, grid_size, stride)
-    
-    def _downscale_cpu_small(
+        start, end = self.WINDOW
+        return self._white_uniform(cells[:, start:end, start:end, :], axes=(1, 2, 3))
+
+    def _white_uniform(self, window: np.ndarray, axes: Tuple[int, ...]) -> np.ndarray:
+        mean = window.mean(axis=axes, dtype=np.float32)
+        spread = window.max(axis=axes).astype(np.int16) - window.min(axis=axes)
+        return (mean >= self.WHITE_MEAN) & (spread <= self.MAX_SPREAD)
+
+    def _downscale_gpu(
         self,
         image_np: np.ndarray,
         grid_top_left: Tuple[int, int],
         grid_size: Tuple[int, int],
         stride: int,
-    ) -> Set[Tuple[int, int]]:
-        """Version optimisée pour petites grilles avec boucles Python."""
-        start_x, start_y = grid_top_left
-        cols, rows = grid_size
-        unrevealed_cells = set()
-
-        # Points d'échantillonnage : centre + 2 bords opposés
-        sample_points = [(12, 12), (6, 12), (18, 12)]
+    ) -> np.ndarray:
+        """
+        Downscale GPU 25× pour détecter UNREVEALED.
 
-        for row in range(rows):
-            for col in range(cols):
-                all_white = True
-                for offset_x, offset_y in sample_points:
-                    x0 = start_x + col * stride + offset_x
-                    y0 = start_y + row * stride + offset_y
+        Stratégie : 1 pixel = 1 cellule, pixels blancs uniformes = UNREVEALED certains
+        """
+        import torch
 
-                    if y0 >= image_np.shape[0] or x0 >= image_np.shape[1]:
-                        all_white = False
-                        break
+        cols, rows = grid_size
+        grid_region = self._grid_lattice(image_np, grid_top_left, grid_size, stride).reshape(
+            rows * stride, cols * stride, 3
+        )
 
-                    pixel = image_np[y0, x0]
-                    if pixel.mean() < 230.0:
-                        all_white = False
-                        break
+        # Copier vers GPU (float32, normalisé [0, 1])
+        image_tensor = torch.from_numpy(np.ascontiguousarray(grid_region)).float().cuda() / 255.0
+        image_tensor = image_tensor.unsqueeze(0).permute(0, 3, 1, 2)  # (1, 3, H, W)
 
-                if all_white:
-                    unrevealed_cells.add((row, col))
+        # Downscale vers taille grille (chaque pixel = 1 cellule)
+        downscaled = torch.nn.functional.interpolate(
+            image_tensor,
+            size=(rows, cols),
+            mode='bilinear',
+            align_corners=False
+        )  # (1, 3, rows, cols)
 
-        return unrevealed_cells
-    
-    def _downscale_cpu_large(
-        self,
-        image_np: np.ndarray,
-        grid_top_left: Tuple[int, int],
-        grid_size: Tuple[int, int],
-        stride: int,
-    ) -> Set[Tuple[int, int]]:
-        """Version vectorisée numpy pour grandes grilles."""
-        start_x, start_y = grid_top_left
-        cols, rows = grid_size
-        
-        # Points d'échantillonnage optimisés : centre + 2 bords opposés
-        sample_offsets = np.array([
-            [12, 12],  # Centre
-            [6, 12],   # Gauche
-            [18, 12],  # Droite
-        ])
-        
-        # Précalculer toutes les positions de cellules
-        row_indices, col_indices = np.meshgrid(np.arange(rows), np.arange(cols), indexing='ij')
-        
-        # Calculer positions pour tous les échantillons
-        sample_positions = []
-        for offset in sample_offsets:
-            x_positions = start_x + col_indices * stride + offset[0]
-            y_positions = start_y + row_indices * stride + offset[1]
-            sample_positions.append((x_positions, y_positions))
-        
-        # Vérifier les limites une seule fois
-        img_h, img_w = image_np.shape[:2]
-        valid_mask = np.ones((rows, cols), dtype=bool)
-        
-        for x_pos, y_pos in sample_positions:
-            valid_mask &= (x_pos >= 0) & (x_pos < img_w) & (y_pos >= 0) & (y_pos < img_h)
-        
-        # Échantillonner tous les pixels en une fois
-        all_samples = []
-        for x_pos, y_pos in sample_positions:
-            # Masquer les positions invalides
-            x_valid = np.where(valid_mask, x_pos, 0)
-            y_valid = np.where(valid_mask, y_pos, 0)
-            samples = image_np[y_valid, x_valid]
-            all_samples.append(samples.mean(axis=2))  # Moyenne RGB
-        
-        # Combiner les échantillons
-        sample_array = np.stack(all_samples, axis=2)  # Shape: (rows, cols, 3)
-        
-        # Cellules unrevealed = tous les échantillons blancs (> 230)
-        unrevealed_mask = np.all(sample_array > 230.0, axis=2) & valid_mask
-        
-        # Convertir en set de coordonnées
-        unrevealed_coords = set(zip(*np.where(unrevealed_mask)))
-        
-        return unrevealed_coords
+        # Détecter pixels blancs uniformes
+        # mean >= 0.88 (225/255) et std < 0.02 (5/255)
+        mean = downscaled.mean(dim=1)  # (1, rows, cols)
+        std = downscaled.std(dim=1)    # (1, rows, cols)
+        white_mask = (mean >= 0.88) & (std < 0.02)
+        return white_mask[0].cpu().numpy().reshape(rows, cols)
@@ -0,0 +1,122 @@
+"""
+Cascade de rejet précoce pour la classification des cellules.
+
+Étage 0 (matcher) : zones uniformes décidées sans recherche de template.
+Étage 1 : bornes statistiques vectorisées. Pour une fenêtre x et un template t
+de P pixels par canal, ‖x_c − t_c‖² = P·(μx_c − μt_c)² + ‖x̃_c − t̃_c‖² et
+‖x̃_c − t̃_c‖ ≥ √P·|σx_c − σt_c| (inégalité triangulaire sur les parties
+centrées), d'où la borne inférieure exacte
+    ‖x − t‖² ≥ P · Σ_c [(μx_c − μt_c)² + (σx_c − σt_c)²].
+Un couple (cellule, template) dont la borne dépasse le seuil ne peut pas
+matcher : il est écarté sans calcul de distance.
+Étage 2 : distances complètes pour les seuls survivants, template par
+template dans l'ordre de priorité ; une cellule décidée sort de la cascade.
+
+Les décisions sont identiques à la recherche exhaustive (la borne est exacte).
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Dict
+
+import numpy as np
+
+# Marge relative sur la borne (arrondis float32) : on ne rejette que les cas sûrs
+_BOUND_TOLERANCE = 1e-3
+
+
+@dataclass
+class CascadeStats:
+    """Compteurs cumulés de la cascade (bench : élagage par étage)."""
+    cells: int = 0               # Cellules entrées dans la cascade
+    uniform: int = 0             # Étage 0 : décidées par zone uniforme
+    pairs: int = 0               # Couples (cellule, template) à l'entrée de l'étage 1
+    pruned_bounds: int = 0       # Étage 1 : écartés par les bornes statistiques
+    rejected_cells: int = 0      # Étage 1 : cellules sans aucun candidat (inconnues sans distance)
+    pruned_early_exit: int = 0   # Étage 2 : non calculés, cellule déjà décidée par un template prioritaire
+    distances: int = 0           # Étage 2 : distances complètes calculées
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class TemplateCascade:
+    """Cascade bornes statistiques → distances complètes sur une banque compilée."""
+
+    def __init__(self, bank, thresholds: np.ndarray, order: np.ndarray):
+        self.bank = bank
+        self.thresholds = np.asarray(thresholds, dtype=np.float32)
+        self.order = np.asarray(order, dtype=np.intp)  # Ordre de recherche (priorité puis décor)
+        self.stats = CascadeStats()
+
+        windows = bank.guarded(bank.means, bank.guard).reshape(len(bank.symbols), -1, 3)
+        self.pixels = windows.shape[1]
+        self.template_mean = windows.mean(axis=1)  # (T, 3)
+        self.template_std = windows.std(axis=1)    # (T, 3)
+        limit = self.thresholds.astype(np.float64) ** 2 * (1 + _BOUND_TOLERANCE) + _BOUND_TOLERANCE
+        # Seuil nul : le template ne peut jamais matcher par recherche
+        self._bound_limit = np.where(self.thresholds > 0, limit, -np.inf)
+
+    def reset_stats(self) -> None:
+        self.stats = CascadeStats()
+
+    def lower_bounds(self, windows: np.ndarray) -> np.ndarray:
+        """Bornes inférieures (N, T) du carré des distances, depuis les moyennes/écarts-types par canal."""
+        per_channel = windows.reshape(len(windows), -1, 3)
+        mean = per_channel.mean(axis=1)
+        std = per_channel.std(axis=1)
+        gap = (mean[:, None, :] - self.template_mean[None]) ** 2 + (std[:, None, :] - self.template_std[None]) ** 2
+        return self.pixels * gap.sum(axis=2)
+
+    def distances(self, windows: np.ndarray, forced: np.ndarray) -> np.ndarray:
+        """
+        Distances (N, T) des fenêtres aplaties aux templates ; inf pour les couples non calculés.
+
+        `forced[n] >= 0` : cellule décidée à l'étage 0, seule sa distance au
+        template forcé est calculée. Les autres parcourent `order` jusqu'au
+        premier template sous son seuil.
+        """
+        bank = self.bank
+        count = len(windows)
+        out = np.full((count, len(bank.symbols)), np.inf, dtype=np.float32)
+        if not count:
+            return out
+        x = np.asarray(windows, dtype=np.float32) - bank.center
+        x_sq = np.einsum("nd,nd->n", x, x)
+
+        def fill(rows: np.ndarray, index: int) -> np.ndarray:
+            sq = x_sq[rows] + bank.sq_norms[index] - 2.0 * (x[rows] @ bank.matrix[index])
+            out[rows, index] = np.sqrt(np.maximum(sq, 0.0))
+            return out[rows, index]
+
+        stats = self.stats
+        stats.cells += count
+        decided = forced >= 0
+        stats.uniform += int(decided.sum())
+        for index in np.unique(forced[decided]).tolist():
+            fill(np.flatnonzero(forced == index), index)
+
+        # Étage 1 : bornes sur les cellules restantes
+        pending = np.flatnonzero(~decided)
+        if not len(pending):
+            return out
+        survive = self.lower_bounds(windows[pending]) < self._bound_limit[None, :]
+        survive = survive[:, self.order]
+        stats.pairs += survive.size
+        stats.pruned_bounds += int(survive.size - survive.sum())
+        stats.rejected_cells += int((~survive.any(axis=1)).sum())
+
+        # Étage 2 : distances des survivants, par priorité, avec sortie anticipée
+        open_cells = np.ones(len(pending), dtype=bool)
+        for position, index in enumerate(self.order.tolist()):
+            candidates = survive[:, position]
+            active = candidates & open_cells
+            stats.pruned_early_exit += int((candidates & ~open_cells).sum())
+            if not active.any():
+                continue
+            local = np.flatnonzero(active)
+            stats.distances += len(local)
+            dist = fill(pending[local], index)
+            open_cells[local[dist < self.thresholds[index]]] = False
+        return out
@@ -0,0 +1,159 @@
+"""
+Vision directe sur les tuiles canvas, sans composite.
+
+Les tuiles ont des positions fixes (CANVAS_TILE_SIZE px, indexées par l'ID du
+canvas) et les cellules un pas fixe (CELL_SIZE + CELL_BORDER) depuis
+GRID_REFERENCE_POINT : chaque cellule se projette sur une seule tuile, ou sur
+deux à quatre quand elle chevauche une frontière. Les cellules internes sont
+extraites par un indexage vectorisé par tuile ; les rares cellules à cheval
+sont recollées morceau par morceau. Une tuile absente compte comme blanche,
+comme dans le composite.
+
+`TileVision` garde les tuiles de la passe précédente : seules les cellules
+touchant une tuile modifiée (apparue ou disparue comprise) sont extraites, le
+coût de la vision suit ce qui a changé à l'écran. Les tuiles d'une passe ne
+deviennent la référence qu'au `commit()`, une fois son résultat pris par le
+storage : une itération en échec est reclassifiée à la suivante.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Optional, Set, Tuple
+
+import numpy as np
+
+from src.config import CANVAS_TILE_SIZE, CELL_BORDER, CELL_SIZE, GRID_REFERENCE_POINT
+from src.lib.s0_coordinates.types import GridBounds
+
+TileKey = Tuple[int, int]  # Position du canvas (x, y), en tuiles
+
+_OFFSETS = np.arange(CELL_SIZE)
+
+
+class TileVision:
+    """Extraction des cellules à classifier depuis les tuiles, avec suivi des tuiles modifiées."""
+
+    def __init__(
+        self,
+        grid_reference: Tuple[int, int] = GRID_REFERENCE_POINT,
+        stride: int = CELL_SIZE + CELL_BORDER,
+        tile_size: int = CANVAS_TILE_SIZE,
+    ):
+        self.grid_reference = grid_reference
+        self.stride = stride
+        self.tile_size = tile_size
+        self.source: Any = None  # Partie suivie (ex. storage) : à sa disparition, l'appelant fait reset()
+        self._previous: Dict[TileKey, np.ndarray] = {}
+        self._pending: Optional[Dict[TileKey, np.ndarray]] = None  # Tuiles de la passe en attente de commit
+
+    def reset(self) -> None:
+        """Oublie les tuiles précédentes : la passe suivante reclassifie tout."""
+        self._previous = {}
+        self._pending = None
+
+    def commit(self) -> None:
+        """Valide la dernière passe (résultat pris par le storage) : ses tuiles deviennent la référence."""
+        if self._pending is not None:
+            self._previous = self._pending
+            self._pending = None
+
+    def changed_tiles(self, tiles: Dict[TileKey, np.ndarray]) -> Set[TileKey]:
+        """Tuiles dont le contenu diffère de la passe précédente (apparues et disparues comprises)."""
+        previous = self._previous
+        return {
+            key for key in tiles.keys() | previous.keys()
+            if key not in tiles or key not in previous or not np.array_equal(tiles[key], previous[key])
+        }
+
+    def extract(
+        self,
+        tiles: Dict[TileKey, np.ndarray],
+        bounds: GridBounds,
+        known_mask: Optional[np.ndarray] = None,
+        changed_only: bool = True,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+        """
+        Cellules à classifier : (cols, rows, cells, tuiles modifiées).
+
+        `cols` / `rows` : coordonnées absolues ; `cells` : (N, CELL_SIZE, CELL_SIZE, 3)
+        uint8. Sont retenues les cellules entières de la disposition, dans
+        `bounds`, non connues (`known_mask` [row, col] aligné sur `bounds`) et,
+        si `changed_only`, touchant une tuile modifiée depuis la dernière passe validée (`commit`).
+        """
+        changed = self.changed_tiles(tiles)
+        self._pending = dict(tiles)
+        empty = np.zeros(0, dtype=np.int64)
+        if not tiles or (changed_only and not changed):
+            return empty, empty, np.zeros((0, CELL_SIZE, CELL_SIZE, 3), dtype=np.uint8), len(changed)
+
+        size, stride = self.tile_size, self.stride
+        origin_x, origin_y = self.grid_reference[0] + 1, self.grid_reference[1] + 1
+        min_x = min(x for x, y in tiles)
+        min_y = min(y for x, y in tiles)
+        max_x = max(x for x, y in tiles)
+        max_y = max(y for x, y in tiles)
+
+        # Cellules entières de la disposition (mêmes bornes que le recadrage du composite)
+        col_start = max(bounds.min_col, math.ceil((min_x * size - origin_x) / stride))
+        col_end = min(bounds.max_col, math.floor(((max_x + 1) * size - origin_x) / stride) - 1)
+        row_start = max(bounds.min_row, math.ceil((min_y * size - origin_y) / stride))
+        row_end = min(bounds.max_row, math.floor(((max_y + 1) * size - origin_y) / stride) - 1)
+        if col_start > col_end or row_start > row_end:
+            return empty, empty, np.zeros((0, CELL_SIZE, CELL_SIZE, 3), dtype=np.uint8), len(changed)
+
+        rows, cols = np.mgrid[row_start:row_end + 1, col_start:col_end + 1]
+        todo = np.ones(rows.shape, dtype=bool)
+        if known_mask is not None:
+            top, left = row_start - bounds.min_row, col_start - bounds.min_col
+            known = known_mask[top:top + todo.shape[0], left:left + todo.shape[1]]
+            todo[:known.shape[0], :known.shape[1]] &= ~known
+
+        # Pixels de la cellule dans le CanvasSpace, tuiles de ses coins
+        xs = origin_x + cols * stride
+        ys = origin_y + rows * stride
+        first_x, last_x = xs // size, (xs + CELL_SIZE - 1) // size
+        first_y, last_y = ys // size, (ys + CELL_SIZE - 1) // size
+        if changed_only:
+            touched = np.zeros(rows.shape, dtype=bool)
+            for tile_x, tile_y in changed:
+                touched |= (first_x <= tile_x) & (tile_x <= last_x) & (first_y <= tile_y) & (tile_y <= last_y)
+            todo &= touched
+
+        cols, rows, xs, ys = cols[todo], rows[todo], xs[todo], ys[todo]
+        first_x, last_x, first_y, last_y = first_x[todo], last_x[todo], first_y[todo], last_y[todo]
+        cells = np.full((len(cols), CELL_SIZE, CELL_SIZE, 3), 255, dtype=np.uint8)
+
+        # Cellules internes : un indexage vectorisé par tuile
+        inner = (first_x == last_x) & (first_y == last_y)
+        inner_index = np.flatnonzero(inner)
+        keys = first_x[inner_index] * 0x10000 + first_y[inner_index]  # Regroupement par tuile
+        for key in np.unique(keys).tolist():
+            group = inner_index[keys == key]
+            tile = tiles.get((int(first_x[group[0]]), int(first_y[group[0]])))
+            if tile is None:
+                continue  # Tuile absente : cellules blanches
+            local_y = ys[group] - first_y[group] * size
+            local_x = xs[group] - first_x[group] * size
+            cells[group] = tile[
+                local_y[:, None, None] + _OFFSETS[None, :, None],
+                local_x[:, None, None] + _OFFSETS[None, None, :],
+            ]
+
+        # Cellules à cheval sur deux à quatre tuiles : recollées morceau par morceau
+        for index in np.flatnonzero(~inner).tolist():
+            x, y = int(xs[index]), int(ys[index])
+            for tile_y in range(int(first_y[index]), int(last_y[index]) + 1):
+                for tile_x in range(int(first_x[index]), int(last_x[index]) + 1):
+                    tile = tiles.get((tile_x, tile_y))
+                    if tile is None:
+                        continue
+                    top, left = max(y, tile_y * size), max(x, tile_x * size)
+                    bottom = min(y + CELL_SIZE, (tile_y + 1) * size)
+                    right = min(x + CELL_SIZE, (tile_x + 1) * size)
+                    cells[index, top - y:bottom - y, left - x:right - x] = tile[
+                        top - tile_y * size:bottom - tile_y * size,
+                        left - tile_x * size:right - tile_x * size,
+                    ]
+
+        return cols, rows, cells, len(changed)
@@ -11,9 +11,10 @@ import json
 from pathlib import Path
 from typing import Dict, Tuple, Optional, TYPE_CHECKING
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageFont
 
 from src.config import CELL_SIZE, CELL_BORDER
+from src.lib.s0_interface.s07_overlay.painter import CellPainter, lines_sprite, rect_pattern
 
 if TYPE_CHECKING:
     from src.lib.s0_browser.export_context import ExportContext
@@ -90,54 +91,40 @@ class VisionOverlay:
             stride: Pas entre cellules (défaut: CELL_SIZE + CELL_BORDER)
         """
         stride_px = stride if stride is not None else (CELL_SIZE + CELL_BORDER)
-        
-        overlay = Image.new("RGBA", base_image.size, (0, 0, 0, 0))
-        draw = ImageDraw.Draw(overlay)
-        start_x, start_y = grid_origin
+        painter = CellPainter(base_image.size, grid_origin, stride_px)
 
+        # Regroupement par symbole (couleurs) et par libellé (sprite texte)
+        by_symbol: Dict[str, list] = {}
+        by_label: Dict[Tuple[str, int], list] = {}
         for (row, col), match_data in matches.items():
             symbol = match_data.get("symbol", "unknown")
             confidence = match_data.get("confidence", 0.0)
-            
-            x0 = start_x + col * stride_px
-            y0 = start_y + row * stride_px
-            x1 = x0 + CELL_SIZE - 1
-            y1 = y0 + CELL_SIZE - 1
-
-            fill_color = self.TYPE_COLORS.get(symbol, (255, 255, 0))
-            border_color = self.BORDER_COLORS.get(symbol, (255, 255, 0))
-            fill = (*fill_color, self.opacity)
-
-            # Rectangle avec bordure
-            draw.rectangle([(x0, y0), (x1, y1)], outline=border_color, width=1)
-            draw.rectangle(
-                [(x0 + self.margin, y0 + self.margin), (x1 - self.margin, y1 - self.margin)],
-                fill=fill,
-            )
-
-            # Label (symbole abrégé)
+            by_symbol.setdefault(symbol, []).append((col, row))
+
+            # Label (symbole abrégé) + confiance en pourcentage
             label = symbol.replace("number_", "")
             if label == symbol:
                 label = label[:3].upper()
-            
-            # Confiance en pourcentage
-            percent = int(round(confidence * 100))
-            percent = max(0, min(100, percent))
-
-            label_x = x0 + 2
-            label_y = y0 + 2
-            draw.text((label_x, label_y), label, font=self.font, fill=(255, 255, 255, 255))
-            
-            # Pourcentage sous le label
-            try:
-                label_bbox = self.font.getbbox(label or "0")
-                label_height = label_bbox[3] - label_bbox[1]
-                percent_y = label_y + label_height + 1
-                draw.text((label_x, percent_y), f"{percent}%", font=self.font, fill=(255, 255, 255, 255))
-            except Exception:
-                pass
-
-        return Image.alpha_composite(base_image.convert("RGBA"), overlay)
+            percent = max(0, min(100, int(round(confidence * 100))))
+            by_label.setdefault((label, percent), []).append((col, row))
+
+        # Rectangle avec bordure (contour CELL_SIZE) puis fond en retrait de la marge
+        last = CELL_SIZE - 1
+        outline_pattern = rect_pattern(stride_px, 0, 0, last, last, outline_only=True)
+        fill_pattern = rect_pattern(stride_px, self.margin, self.margin, last - self.margin, last - self.margin)
+        for symbol, coords in by_symbol.items():
+            mask = painter.lattice_mask(coords)
+            painter.fill(mask, outline_pattern, (*self.BORDER_COLORS.get(symbol, (255, 255, 0)), 255))
+            painter.fill(mask, fill_pattern, (*self.TYPE_COLORS.get(symbol, (255, 255, 0)), self.opacity))
+
+        # Pourcentage sous le label (un sprite par couple label/pourcentage)
+        for (label, percent), coords in by_label.items():
+            label_bbox = self.font.getbbox(label or "0")
+            label_height = label_bbox[3] - label_bbox[1]
+            sprite = lines_sprite(((label, 0), (f"{percent}%", label_height + 1)), self.font)
+            painter.stamp(painter.lattice_mask(coords), sprite, (2, 2))
+
+        return painter.composite(base_image)
 
     def render_and_save(
         self,
@@ -195,6 +182,17 @@ class VisionOverlay:
         return json_path
 
 
+def render_and_save_vision_overlay(
+    base_image: Image.Image,
+    matches: Dict[Tuple[int, int], dict],
+    export_ctx: "ExportContext",
+    grid_origin: Tuple[int, int] = (0, 0),
+    stride: Optional[int] = None,
+) -> Optional[Path]:
+    """Version fonction de VisionOverlay.render_and_save (picklable pour le worker overlay)."""
+    return VisionOverlay().render_and_save(base_image, matches, export_ctx, grid_origin, stride)
+
+
 def vision_result_to_matches(vision_result) -> Dict[Tuple[int, int], dict]:
     """Convertit un VisionResult en dictionnaire de matches pour l'overlay."""
     matches = {}
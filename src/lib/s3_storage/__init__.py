@@ -11,10 +11,16 @@ from .types import (
     ActiveRelevance,
     FrontierRelevance,
     GridCell,
+    StorageCounters,
     StorageUpsert,
+    pack_cell_state,
+    unpack_cell_state,
 )
 from .sets import SetManager
 from .grid import GridStore
+from .grid_db import GridDatabase
+from .cold_regions import ColdRegion, KnownCells
+from .journal import ChangeFeed, ChangeSet, TransitionType, UpsertJournal
 from .storage import StorageController
 
 __all__ = [
@@ -29,9 +35,19 @@ __all__ = [
     "ActiveRelevance",
     "FrontierRelevance",
     "GridCell",
+    "StorageCounters",
     "StorageUpsert",
+    "pack_cell_state",
+    "unpack_cell_state",
     # Classes
     "SetManager",
     "GridStore",
+    "GridDatabase",
+    "ColdRegion",
+    "KnownCells",
+    "TransitionType",
+    "ChangeSet",
+    "ChangeFeed",
+    "UpsertJournal",
     "StorageController",
 ]
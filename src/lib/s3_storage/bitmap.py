@@ -0,0 +1,84 @@
+"""Bitmap booléen chunké sur la grille infinie (coordonnées (col, row))."""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from .types import ChunkKey, Coord
+
+
+class ChunkedBitmap:
+    """
+    Ensemble de coordonnées stocké en tableaux booléens (chunk_size × chunk_size)
+    indexés [ligne, colonne] : ajout O(1), extraction d'un masque rectangulaire
+    en O(surface) sans parcourir l'ensemble.
+    """
+
+    def __init__(self, chunk_size: int):
+        self.chunk_size = chunk_size
+        self._chunks: Dict[ChunkKey, np.ndarray] = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, coord) -> bool:
+        size = self.chunk_size
+        chunk = self._chunks.get((coord[0] // size, coord[1] // size))
+        return chunk is not None and bool(chunk[coord[1] % size, coord[0] % size])
+
+    def add(self, coord: Coord) -> None:
+        size = self.chunk_size
+        key = (coord[0] // size, coord[1] // size)
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            chunk = self._chunks[key] = np.zeros((size, size), dtype=bool)
+        local = (coord[1] % size, coord[0] % size)
+        if not chunk[local]:
+            chunk[local] = True
+            self._count += 1
+
+    def discard(self, coord: Coord) -> None:
+        size = self.chunk_size
+        chunk = self._chunks.get((coord[0] // size, coord[1] // size))
+        local = (coord[1] % size, coord[0] % size)
+        if chunk is not None and chunk[local]:
+            chunk[local] = False
+            self._count -= 1
+
+    def discard_chunk(self, key: ChunkKey) -> None:
+        """Retire un chunk entier (éviction : ses bits sont alors portés par la région froide)."""
+        chunk = self._chunks.pop(key, None)
+        if chunk is not None:
+            self._count -= int(chunk.sum())
+
+    def mask(
+        self,
+        min_col: int,
+        min_row: int,
+        max_col: int,
+        max_row: int,
+        fallback: Optional[Callable[[ChunkKey], Optional[np.ndarray]]] = None,
+    ) -> np.ndarray:
+        """
+        Masque (rows, cols) [row - min_row, col - min_col] des bornes incluses.
+        `fallback` : masque (size, size) d'un chunk absent du bitmap (ex. région froide).
+        """
+        size = self.chunk_size
+        out = np.zeros((max_row - min_row + 1, max_col - min_col + 1), dtype=bool)
+        for cy in range(min_row // size, max_row // size + 1):
+            for cx in range(min_col // size, max_col // size + 1):
+                chunk = self._chunks.get((cx, cy))
+                if chunk is None and fallback is not None:
+                    chunk = fallback((cx, cy))
+                if chunk is None:
+                    continue
+                # Intersection chunk ∩ bornes, en coordonnées absolues
+                r0, r1 = max(cy * size, min_row), min((cy + 1) * size, max_row + 1)
+                c0, c1 = max(cx * size, min_col), min((cx + 1) * size, max_col + 1)
+                out[r0 - min_row:r1 - min_row, c0 - min_col:c1 - min_col] = chunk[
+                    r0 - cy * size:r1 - cy * size, c0 - cx * size:c1 - cx * size
+                ]
+        return out
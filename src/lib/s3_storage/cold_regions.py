@@ -0,0 +1,210 @@
+"""
+Régions froides du storage : chunks entièrement résolus, sortis des structures chaudes.
+
+En mode Infinite, les zones résolues (SOLVED/MINE) s'accumulent sans fin dans
+les snapshots. Un chunk dont toutes les cellules sont résolues, et entouré
+(dans le rayon configuré) de chunks eux aussi résolus, est compacté en :
+- les codes packés des cellules (4 octets/cellule) : restauration exacte, et
+  seule source des cellules connues du chunk (requêtes `in known_set` et masques
+  de la vision, le bitmap chaud abandonne le chunk à l'éviction)
+- des compteurs (cellules, connues, mines)
+
+Quand la base de grille de la partie contient déjà ce chunk à l'identique, les
+codes ne sont pas gardés en RAM : ils sont relus dans le mapping de la base.
+
+Toute mise à jour touchant un chunk froid le réchauffe d'abord.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Optional, Set
+
+import numpy as np
+
+from .types import CODE_MASK, PRESENT, ChunkKey, Coord, GridCell, SolverStatus, is_known_code
+
+if TYPE_CHECKING:
+    from .grid_db import GridDatabase
+
+
+@dataclass(frozen=True)
+class ColdRegion:
+    """Résumé compact d'un chunk évincé."""
+    key: ChunkKey
+    chunk_size: int
+    cells: int
+    known: int
+    mines: int
+    packed: Optional[np.ndarray] = None           # (chunk_size²,) uint32 : state_code | PRESENT, 0 = absente
+    database: Optional["GridDatabase"] = None     # Sinon : codes lus dans le mapping de la base
+
+    @property
+    def codes(self) -> np.ndarray:
+        """Codes packés du chunk (copie lue dans la base s'ils n'y sont pas gardés en RAM)."""
+        return self.packed if self.packed is not None else self.database.chunk_codes(self.key)
+
+    def _code(self, coord: Coord) -> int:
+        index = self.local_index(coord)
+        if self.packed is not None:
+            return int(self.packed[index])
+        return self.database.code_at(self.key, index)
+
+    def detached(self) -> "ColdRegion":
+        """Même région avec ses codes en RAM (la base va être fermée)."""
+        return self if self.packed is not None else replace(self, packed=self.codes, database=None)
+
+    def local_index(self, coord: Coord) -> int:
+        size = self.chunk_size
+        return (coord[1] - self.key[1] * size) * size + (coord[0] - self.key[0] * size)
+
+    def is_known(self, coord: Coord) -> bool:
+        return bool(is_known_code(self._code(coord)))
+
+    def known_mask(self) -> np.ndarray:
+        """Masque (chunk_size, chunk_size) [ligne, colonne] des cellules connues."""
+        return is_known_code(self.codes).reshape(self.chunk_size, self.chunk_size)
+
+    def iter_known(self) -> Iterator[Coord]:
+        size = self.chunk_size
+        base_col, base_row = self.key[0] * size, self.key[1] * size
+        for index in np.flatnonzero(self.known_mask()).tolist():
+            yield (base_col + index % size, base_row + index // size)
+
+    def cell(self, coord: Coord) -> Optional[GridCell]:
+        """Cellule d'origine d'une coordonnée du chunk (None si absente)."""
+        code = self._code(coord)
+        return GridCell.from_code(coord, code & CODE_MASK) if code else None
+
+    def iter_coords(self) -> Iterator[Coord]:
+        """Coordonnées de toutes les cellules présentes du chunk."""
+        size = self.chunk_size
+        base_col, base_row = self.key[0] * size, self.key[1] * size
+        for index in np.flatnonzero(self.codes).tolist():
+            yield (base_col + index % size, base_row + index // size)
+
+    def restore(self) -> Dict[Coord, GridCell]:
+        """Cellules d'origine (décodées depuis les codes packés)."""
+        size = self.chunk_size
+        base_col, base_row = self.key[0] * size, self.key[1] * size
+        codes = self.codes
+        positions = np.flatnonzero(codes)
+        return {
+            (base_col + index % size, base_row + index // size): GridCell.from_code(
+                (base_col + index % size, base_row + index // size), code & CODE_MASK
+            )
+            for index, code in zip(positions.tolist(), codes[positions].tolist())
+        }
+
+    @classmethod
+    def compact(
+        cls,
+        key: ChunkKey,
+        chunk_size: int,
+        cells: Iterable[GridCell],
+        database: Optional["GridDatabase"] = None,
+    ) -> "ColdRegion":
+        """
+        Compacte les cellules d'un chunk. Si `database` en porte déjà la dernière
+        version identique, les codes ne sont pas conservés : lecture via son mapping.
+        """
+        codes = np.zeros(chunk_size * chunk_size, dtype=np.uint32)
+        base_col, base_row = key[0] * chunk_size, key[1] * chunk_size
+        mines = 0
+        for cell in cells:
+            codes[(cell.coord[1] - base_row) * chunk_size + (cell.coord[0] - base_col)] = cell.state_code | PRESENT
+            mines += cell.solver_status == SolverStatus.MINE
+        backed = (
+            database is not None
+            and database.chunk_size == chunk_size
+            and np.array_equal(database.chunk_codes(key), codes)
+        )
+        return cls(
+            key=key,
+            chunk_size=chunk_size,
+            cells=int(np.count_nonzero(codes)),
+            known=int(is_known_code(codes).sum()),
+            mines=mines,
+            packed=None if backed else codes,
+            database=database if backed else None,
+        )
+
+
+class KnownCells:
+    """
+    Ensemble des cellules connues (chaudes + régions froides), en lecture seule.
+
+    Compatible avec les usages de l'ancien `Set[Coord]` (`in`, len, itération,
+    test de vacuité) ; les cellules froides sont interrogées via leurs codes.
+    """
+
+    def __init__(self, hot: Set[Coord], regions: Dict[ChunkKey, ColdRegion], chunk_size: int):
+        self._hot = hot
+        self._regions = regions
+        self._chunk_size = chunk_size
+
+    def __contains__(self, coord) -> bool:
+        if coord in self._hot:
+            return True
+        if not self._regions:
+            return False
+        region = self._regions.get((coord[0] // self._chunk_size, coord[1] // self._chunk_size))
+        return region is not None and region.is_known(coord)
+
+    def __len__(self) -> int:
+        return len(self._hot) + sum(region.known for region in self._regions.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._hot) or any(region.known for region in self._regions.values())
+
+    def __iter__(self) -> Iterator[Coord]:
+        yield from self._hot
+        for region in self._regions.values():
+            yield from region.iter_known()
+
+    @property
+    def hot(self) -> Set[Coord]:
+        return self._hot
+
+    @property
+    def regions(self) -> Dict[ChunkKey, ColdRegion]:
+        return self._regions
+
+
+class ColdRegionStore:
+    """Régions froides indexées par chunk."""
+
+    def __init__(self, chunk_size: int):
+        self.chunk_size = chunk_size
+        self.regions: Dict[ChunkKey, ColdRegion] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.regions)
+
+    def chunk_of(self, coord: Coord) -> ChunkKey:
+        return (coord[0] // self.chunk_size, coord[1] // self.chunk_size)
+
+    def chunk_coords(self, key: ChunkKey) -> Iterator[Coord]:
+        size = self.chunk_size
+        for row in range(key[1] * size, (key[1] + 1) * size):
+            for col in range(key[0] * size, (key[0] + 1) * size):
+                yield (col, row)
+
+    def add(self, region: ColdRegion) -> None:
+        self.regions[region.key] = region
+
+    def pop(self, key: ChunkKey) -> Optional[ColdRegion]:
+        return self.regions.pop(key, None)
+
+    def detach(self) -> None:
+        """Rapatrie en RAM les codes lus dans la base (avant sa fermeture)."""
+        self.regions = {key: region.detached() for key, region in self.regions.items()}
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "regions": len(self.regions),
+            "cells": sum(region.cells for region in self.regions.values()),
+            "known": sum(region.known for region in self.regions.values()),
+            "mines": sum(region.mines for region in self.regions.values()),
+            "in_database": sum(region.packed is None for region in self.regions.values()),
+        }
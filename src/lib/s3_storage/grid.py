@@ -2,32 +2,57 @@
 
 from __future__ import annotations
 
-from typing import Dict, Set, Tuple
+from typing import Dict, Iterator, List, Optional, Set
 
+import numpy as np
+
+from src.config import STORAGE_EVICTION_CONFIG
 from .types import (
     Bounds,
+    ChunkKey,
     Coord,
     GridCell,
     LogicalCellState,
     SolverStatus,
+    StorageCounters,
     StorageUpsert,
 )
 from .sets import SetManager
+from .cold_regions import ColdRegion, ColdRegionStore, KnownCells
+from .grid_db import GridDatabase
+from .journal import TransitionType, Transitions
+
+# Statuts définitivement résolus : seuls les chunks qui n'en contiennent pas d'autres sont évinçables
+_SETTLED_STATUSES = frozenset({SolverStatus.SOLVED, SolverStatus.MINE})
+# États comptés comme révélés (compteurs et revealed_set)
+_REVEALED_STATES = frozenset({LogicalCellState.OPEN_NUMBER, LogicalCellState.EMPTY})
 
 
 class GridStore:
     """Stockage sparse de la grille avec gestion des ensembles."""
 
-    def __init__(self) -> None:
+    def __init__(self, chunk_size: int = STORAGE_EVICTION_CONFIG['chunk_size']) -> None:
         self._cells: Dict[Coord, GridCell] = {}
         self._sets = SetManager()
+        self._cold = ColdRegionStore(chunk_size)
+        # Par chunk chaud : [cellules présentes, cellules non résolues]
+        self._chunk_counts: Dict[ChunkKey, List[int]] = {}
+        self._counters = StorageCounters()
 
-    def apply_upsert(self, data: StorageUpsert) -> None:
-        """Applique les mises à jour en batch."""
+    def apply_upsert(self, data: StorageUpsert) -> Transitions:
+        """Applique les mises à jour en batch ; retourne les transitions effectives."""
+        transitions: Transitions = {}
+        if self._cold:
+            for key in {self._cold.chunk_of(coord) for coord in data.cells}:
+                if key in self._cold.regions:
+                    transitions.setdefault(TransitionType.RESTORED, set()).update(self._thaw(key))
+        self._track_changes(data.cells, transitions)
+        self._count_changes(data.cells)
         self._cells.update(data.cells)
         self._recalculate_sets(data.cells)
         
         if data.to_visualize:
+            transitions[TransitionType.TO_VISUALIZE] = set(data.to_visualize)
             self._sets.apply_set_updates(
                 revealed_add=set(),
                 active_add=set(),
@@ -36,6 +61,7 @@ class GridStore:
                 frontier_remove=set(),
                 to_visualize=data.to_visualize,
             )
+        return transitions
 
     def get_frontier(self) -> Set[Coord]:
         return self._sets.get_frontier()
@@ -49,8 +75,17 @@ class GridStore:
     def get_to_visualize(self) -> Set[Coord]:
         return self._sets.get_to_visualize()
 
-    def get_known(self) -> Set[Coord]:
-        return self._sets.get_known()
+    def get_known(self) -> KnownCells:
+        """Cellules connues, régions froides comprises (requêtes sur leurs codes)."""
+        return KnownCells(self._sets.get_known(), dict(self._cold.regions), self._cold.chunk_size)
+
+    def get_known_mask(self, bounds: Bounds) -> np.ndarray:
+        """Masque booléen (rows, cols) des cellules connues dans les bornes (x_min, y_min, x_max, y_max)."""
+        return self._sets.get_known_bitmap().mask(*bounds, fallback=self._cold_known_mask)
+
+    def _cold_known_mask(self, key: ChunkKey) -> Optional[np.ndarray]:
+        region = self._cold.regions.get(key)
+        return None if region is None else region.known_mask()
 
     def get_cells_in_bounds(self, bounds: Bounds) -> Dict[Coord, GridCell]:
         """Retourne les cellules dans les bornes."""
@@ -62,9 +97,137 @@ class GridStore:
         }
 
     def get_all_cells(self) -> Dict[Coord, GridCell]:
-        """Retourne toutes les cellules."""
+        """Retourne toutes les cellules (chaudes : les régions froides sont exclues)."""
         return dict(self._cells)
 
+    def get_cell(self, coord: Coord) -> Optional[GridCell]:
+        """Cellule chaude, ou décodée depuis sa région froide (lecture seule : le chunk reste froid)."""
+        cell = self._cells.get(coord)
+        if cell is None and self._cold:
+            region = self._cold.regions.get(self._cold.chunk_of(coord))
+            if region is not None:
+                cell = region.cell(coord)
+        return cell
+
+    def iter_coords(self) -> Iterator[Coord]:
+        """Coordonnées de toutes les cellules, régions froides comprises."""
+        yield from self._cells
+        for region in self._cold.regions.values():
+            yield from region.iter_coords()
+
+    def get_cold_stats(self) -> Dict[str, int]:
+        return self._cold.stats()
+
+    def get_counters(self) -> StorageCounters:
+        return self._counters.copy()
+
+    @staticmethod
+    def _add_to_counters(counters: StorageCounters, cell: GridCell, sign: int) -> None:
+        # Même règle que revealed_set (_recalculate_sets) : seules les cases ouvertes sont révélées
+        if cell.logical_state in _REVEALED_STATES:
+            counters.revealed += sign
+        elif cell.logical_state == LogicalCellState.CONFIRMED_MINE or cell.solver_status == SolverStatus.MINE:
+            counters.flagged += sign
+        counters.by_status[cell.solver_status] = counters.by_status.get(cell.solver_status, 0) + sign
+
+    def _track_changes(self, modified_cells: Dict[Coord, GridCell], transitions: Transitions) -> None:
+        """
+        Avant écriture : met à jour les compteurs et groupe les cellules réellement
+        modifiées par type de transition.
+        """
+        cells = self._cells
+        counters = self._counters
+        for coord, cell in modified_cells.items():
+            old = cells.get(coord)
+            if old is None:
+                transitions.setdefault(TransitionType.ADDED, set()).add(coord)
+                counters.cells += 1
+                self._add_to_counters(counters, cell, 1)
+                continue
+            if old.state_code == cell.state_code:
+                continue
+            self._add_to_counters(counters, old, -1)
+            self._add_to_counters(counters, cell, 1)
+            if old.logical_state != cell.logical_state or old.raw_state != cell.raw_state:
+                revealed = old.logical_state == LogicalCellState.UNREVEALED
+                transitions.setdefault(
+                    TransitionType.REVEALED if revealed else TransitionType.STATE, set()
+                ).add(coord)
+            if old.solver_status != cell.solver_status:
+                transitions.setdefault(TransitionType.STATUS, set()).add(coord)
+            elif (old.focus_level_active != cell.focus_level_active
+                  or old.focus_level_frontier != cell.focus_level_frontier):
+                transitions.setdefault(TransitionType.FOCUS, set()).add(coord)
+
+    # ------------------------------------------------------------------
+    # Éviction des régions froides
+    # ------------------------------------------------------------------
+
+    def _count_changes(self, modified_cells: Dict[Coord, GridCell]) -> None:
+        """Met à jour les compteurs par chunk (présentes / non résolues) avant écriture."""
+        size = self._cold.chunk_size
+        counts = self._chunk_counts
+        cells = self._cells
+        for coord, cell in modified_cells.items():
+            key = (coord[0] // size, coord[1] // size)
+            entry = counts.get(key)
+            if entry is None:
+                entry = counts[key] = [0, 0]
+            old = cells.get(coord)
+            if old is None:
+                entry[0] += 1
+            elif old.solver_status not in _SETTLED_STATUSES:
+                entry[1] -= 1
+            if cell.solver_status not in _SETTLED_STATUSES:
+                entry[1] += 1
+
+    def evict_cold_regions(self, radius: int, database: Optional[GridDatabase] = None) -> List[Coord]:
+        """
+        Compacte les chunks entièrement résolus dont aucun chunk à moins de
+        `radius` chunks ne contient de cellule non résolue (ACTIVE, FRONTIER,
+        à revoir...). Retourne les coordonnées évincées. Avec `database`, les
+        chunks qu'elle porte à l'identique sont relus dans son mapping (hors RAM).
+        """
+        radius = max(1, radius)  # Les voisins des cellules vivantes restent toujours chauds
+        unsettled = [key for key, (_, pending) in self._chunk_counts.items() if pending]
+        blocked = {
+            (cx + dx, cy + dy)
+            for cx, cy in unsettled
+            for dx in range(-radius, radius + 1)
+            for dy in range(-radius, radius + 1)
+        }
+        evicted: List[Coord] = []
+        for key, (present, pending) in list(self._chunk_counts.items()):
+            if pending or not present or key in blocked:
+                continue
+            cells = []
+            for coord in self._cold.chunk_coords(key):
+                cell = self._cells.pop(coord, None)
+                if cell is not None:
+                    cells.append(cell)
+                    self._sets.remove_from_state_sets(coord)
+                    self._sets.discard_known(coord)
+            self._sets.discard_known_chunk(key)
+            self._cold.add(ColdRegion.compact(key, self._cold.chunk_size, cells, database))
+            del self._chunk_counts[key]
+            evicted.extend(cell.coord for cell in cells)
+        return evicted
+
+    def detach_cold_regions(self) -> None:
+        """Codes des régions froides rapatriés en RAM : la base de grille va être fermée."""
+        self._cold.detach()
+
+    def _thaw(self, key: ChunkKey) -> Set[Coord]:
+        """Réintègre un chunk froid dans les structures chaudes ; retourne les coordonnées restaurées."""
+        region = self._cold.pop(key)
+        if region is None:
+            return set()
+        cells = region.restore()
+        self._count_changes(cells)
+        self._cells.update(cells)
+        self._recalculate_sets(cells)
+        return set(cells)
+
     def _recalculate_sets(self, modified_cells: Dict[Coord, GridCell]) -> None:
         """Recalcule les ensembles basés sur les cellules modifiées.
         
@@ -80,7 +243,7 @@ class GridStore:
             if cell.logical_state != LogicalCellState.UNREVEALED:
                 self._sets.add_to_known(coord)
             
-            if cell.logical_state in {LogicalCellState.OPEN_NUMBER, LogicalCellState.EMPTY}:
+            if cell.logical_state in _REVEALED_STATES:
                 self._sets.add_to_revealed(coord)
             
             if cell.solver_status == SolverStatus.ACTIVE:
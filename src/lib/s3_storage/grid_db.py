@@ -0,0 +1,251 @@
+"""
+Base de grille persistante sur disque (une par partie) : temp/games/<game_id>/grid_state.db
+
+Format binaire adressé par chunks (chunk_size × chunk_size cellules) :
+- en-tête : magic b"GRDB", version (u16), côté de chunk (u16), enregistrements valides (u32)
+- puis des enregistrements ajoutés à la suite (append-only) :
+  (cx i32, cy i32) + chunk_size² codes uint32 (`state_code | PRESENT`, 0 = absente)
+
+La dernière version d'un chunk gagne. Le fichier entier est mappé en écriture :
+seul l'index (chunk → offset) reste en RAM, les chunks (dont ceux des régions
+froides du storage) sont lus dans le mapping et paginés par l'OS. Le fichier
+est pré-alloué par paliers doublés : le mapping n'est refait que lorsque
+l'écriture dépasse la taille mappée. Le compteur d'enregistrements de
+l'en-tête n'avance qu'après l'écriture : un enregistrement interrompu (crash)
+est ignoré à la réouverture. Compaction automatique quand les données
+dépassent `compact_ratio` × la taille des versions vivantes.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from src.config import GRID_DB_CONFIG, get_game_paths
+from .types import CODE_MASK, PRESENT, ChunkKey, Coord, GridCell
+
+MAGIC = b"GRDB"
+DB_VERSION = 2
+_HEADER = struct.Struct("<4sHHI")
+_MIN_RECORDS = 64  # Pré-allocation initiale (enregistrements)
+_RECORD_HEADER = struct.Struct("<ii")
+
+
+class GridDatabase:
+    """Fichier de grille chunké, append-only, mappé en mémoire."""
+
+    def __init__(
+        self,
+        path: Path,
+        chunk_size: int = GRID_DB_CONFIG['chunk_size'],
+        compact_ratio: float = GRID_DB_CONFIG['compact_ratio'],
+        fsync: bool = GRID_DB_CONFIG['fsync'],
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = chunk_size
+        self.compact_ratio = compact_ratio
+        self.fsync = fsync
+        self.records_written = 0
+        self.remaps = 0
+        self._index: Dict[ChunkKey, int] = {}  # chunk → offset du payload
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._records = 0  # Enregistrements valides (en-tête)
+        self._open()
+
+    @classmethod
+    def for_game(cls, game_id: str, **kwargs) -> "GridDatabase":
+        """Base standard d'une partie : temp/games/<game_id>/grid_state.db."""
+        return cls(Path(get_game_paths(game_id)['grid_db']), **kwargs)
+
+    # ------------------------------------------------------------------
+    # Fichier
+    # ------------------------------------------------------------------
+
+    @property
+    def _payload_size(self) -> int:
+        return self.chunk_size * self.chunk_size * 4
+
+    @property
+    def _record_size(self) -> int:
+        return _RECORD_HEADER.size + self._payload_size
+
+    @property
+    def chunk_count(self) -> int:
+        return len(self._index)
+
+    @property
+    def _end(self) -> int:
+        """Fin des données valides (offset du prochain enregistrement)."""
+        return _HEADER.size + self._records * self._record_size
+
+    def _open(self) -> None:
+        if not self.path.exists() or self.path.stat().st_size < _HEADER.size:
+            with open(self.path, "wb") as f:
+                f.write(_HEADER.pack(MAGIC, DB_VERSION, self.chunk_size, 0))
+        self._file = open(self.path, "r+b")
+        magic, version, chunk_size, records = _HEADER.unpack(self._file.read(_HEADER.size))
+        if magic != MAGIC or version != DB_VERSION:
+            raise ValueError(f"Fichier de grille invalide : {self.path}")
+        self.chunk_size = chunk_size  # Le fichier fait foi
+        self._scan(records)
+
+    def _scan(self, records: int) -> None:
+        """Reconstruit l'index (dernière version de chaque chunk) des enregistrements valides."""
+        size = os.fstat(self._file.fileno()).st_size
+        available = (size - _HEADER.size) // self._record_size
+        if records > available:
+            print(f"[GRID_DB] Fichier tronqué : {records - available} enregistrement(s) perdu(s)")
+            records = available
+        self._records = records
+        self._remap()
+        self._index.clear()
+        for offset in range(_HEADER.size, self._end, self._record_size):
+            key = _RECORD_HEADER.unpack_from(self._mmap, offset)
+            self._index[key] = offset + _RECORD_HEADER.size
+
+    def _remap(self) -> None:
+        """Mappe le fichier entier (pré-allocation comprise) ; ferme le mapping précédent."""
+        if self._mmap is not None:
+            self._mmap.close()
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_WRITE)
+        self.remaps += 1
+
+    def _reserve(self, size: int) -> None:
+        """Garantit `size` octets mappés : agrandit le fichier par paliers doublés, puis remappe."""
+        if size <= len(self._mmap):
+            return
+        capacity = max(size, 2 * len(self._mmap), _HEADER.size + _MIN_RECORDS * self._record_size)
+        self._mmap.close()  # Windows : le mapping doit être fermé avant de redimensionner
+        self._mmap = None
+        self._file.truncate(capacity)
+        self._remap()
+
+    def _chunk_view(self, key: ChunkKey) -> Optional[np.ndarray]:
+        """
+        Vue (non copiée, paginée à la demande) de la dernière version d'un chunk.
+        À ne pas conserver : elle empêcherait de fermer le mapping à l'agrandissement.
+        """
+        offset = self._index.get(key)
+        if offset is None:
+            return None
+        return np.frombuffer(self._mmap, dtype="<u4", count=self.chunk_size * self.chunk_size, offset=offset)
+
+    # ------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------
+
+    def chunk_of(self, coord: Coord) -> ChunkKey:
+        return (coord[0] // self.chunk_size, coord[1] // self.chunk_size)
+
+    def write_cells(self, cells: Dict[Coord, GridCell]) -> int:
+        """
+        Ajoute à la suite une nouvelle version de chaque chunk modifié
+        (lecture-modification-écriture), puis valide l'en-tête. Retourne le nombre de chunks écrits.
+        """
+        if not cells:
+            return 0
+        size = self.chunk_size
+        dirty: Dict[ChunkKey, list] = {}
+        for (col, row), cell in cells.items():
+            dirty.setdefault((col // size, row // size), []).append(
+                ((row % size) * size + col % size, cell.state_code | PRESENT)
+            )
+
+        buffer = bytearray()
+        offsets: Dict[ChunkKey, int] = {}
+        end = self._end
+        for key, updates in dirty.items():
+            chunk = self.chunk_codes(key)
+            if chunk is None:
+                chunk = np.zeros(size * size, dtype="<u4")
+            positions, codes = zip(*updates)
+            chunk[list(positions)] = codes
+            offsets[key] = end + len(buffer) + _RECORD_HEADER.size
+            buffer += _RECORD_HEADER.pack(*key)
+            buffer += chunk.tobytes()
+
+        self._reserve(end + len(buffer))
+        self._mmap[end:end + len(buffer)] = buffer
+        self._records += len(dirty)
+        # Compteur écrit après les données : un crash au milieu laisse l'ancien état valide
+        _HEADER.pack_into(self._mmap, 0, MAGIC, DB_VERSION, self.chunk_size, self._records)
+        if self.fsync:
+            self._mmap.flush()
+        self._index.update(offsets)
+        self.records_written += len(dirty)
+
+        if self._end > self.compact_ratio * max(1, self.chunk_count) * self._record_size:
+            self.compact()
+        return len(dirty)
+
+    def compact(self) -> None:
+        """Réécrit le fichier avec les seules versions vivantes des chunks (remplacement atomique)."""
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "wb") as out:
+            out.write(_HEADER.pack(MAGIC, DB_VERSION, self.chunk_size, len(self._index)))
+            for key, offset in self._index.items():
+                out.write(_RECORD_HEADER.pack(*key))
+                out.write(self._mmap[offset:offset + self._payload_size])
+            out.truncate(max(out.tell(), len(self._mmap)))  # Pré-allocation conservée
+        # Windows : le mapping et le descripteur doivent être fermés avant le remplacement
+        self._mmap.close()
+        self._mmap = None
+        self._file.close()
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, "r+b")
+        self._scan(len(self._index))
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def has_chunk(self, key: ChunkKey) -> bool:
+        return key in self._index
+
+    def chunk_codes(self, key: ChunkKey) -> Optional[np.ndarray]:
+        """Codes (chunk_size²,) uint32 de la dernière version d'un chunk, copiés depuis le mapping."""
+        view = self._chunk_view(key)
+        return None if view is None else view.copy()
+
+    def code_at(self, key: ChunkKey, index: int) -> int:
+        """Code d'une cellule (index local ligne × chunk_size + colonne) ; 0 si absente."""
+        offset = self._index.get(key)
+        if offset is None:
+            return 0
+        return int.from_bytes(self._mmap[offset + 4 * index:offset + 4 * index + 4], "little")
+
+    def chunk_cells(self, key: ChunkKey) -> Dict[Coord, GridCell]:
+        """Cellules présentes d'un chunk (décodées depuis le mapping)."""
+        view = self._chunk_view(key)
+        if view is None:
+            return {}
+        size = self.chunk_size
+        base_col, base_row = key[0] * size, key[1] * size
+        cells: Dict[Coord, GridCell] = {}
+        positions = np.flatnonzero(view)
+        for position, code in zip(positions.tolist(), view[positions].tolist()):
+            coord = (base_col + position % size, base_row + position // size)
+            cells[coord] = GridCell.from_code(coord, code & CODE_MASK)
+        return cells
+
+    def load_cells(self, chunks: Optional[Iterable[ChunkKey]] = None) -> Dict[Coord, GridCell]:
+        """Toutes les cellules (ou celles des chunks demandés) : reprise d'une partie."""
+        cells: Dict[Coord, GridCell] = {}
+        for key in (self._index if chunks is None else chunks):
+            cells.update(self.chunk_cells(key))
+        return cells
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,115 @@
+"""
+Journal des upserts du storage (flux de changements).
+
+Chaque upsert qui modifie effectivement des cellules reçoit une version
+monotone ; le journal garde les N dernières entrées (ring buffer) avec les
+coordonnées touchées, groupées par type de transition. Un consommateur
+incrémental mémorise la dernière version vue et ne traite que le delta
+(`changes_since`). Si son retard dépasse la capacité du journal, le
+ChangeSet est marqué incomplet : il doit alors se resynchroniser en entier.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Deque, Dict, Set
+
+from src.config import STORAGE_JOURNAL_CONFIG
+from .types import Coord
+
+
+class TransitionType(str, Enum):
+    """Type de transition d'une cellule dans un upsert."""
+    ADDED = "ADDED"                # Nouvelle cellule
+    REVEALED = "REVEALED"          # UNREVEALED → révélée (nombre, vide, mine)
+    STATE = "STATE"                # Autre changement d'état brut/logique
+    STATUS = "STATUS"              # solver_status modifié
+    FOCUS = "FOCUS"                # Focus levels modifiés (status inchangé)
+    TO_VISUALIZE = "TO_VISUALIZE"  # Ajoutée à l'ensemble to_visualize
+    EVICTED = "EVICTED"            # Sortie vers une région froide
+    RESTORED = "RESTORED"          # Réintégrée depuis une région froide
+
+
+Transitions = Dict[TransitionType, Set[Coord]]
+
+
+@dataclass
+class JournalEntry:
+    """Changements d'un upsert."""
+    version: int
+    changes: Transitions
+
+
+@dataclass
+class ChangeSet:
+    """Changements cumulés entre deux versions du storage."""
+    since: int
+    version: int
+    complete: bool = True  # False : journal dépassé, resynchronisation complète requise
+    changes: Transitions = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return any(self.changes.values())
+
+    def get(self, transition: TransitionType) -> Set[Coord]:
+        return self.changes.get(transition, set())
+
+    @property
+    def coords(self) -> Set[Coord]:
+        """Toutes les coordonnées touchées, toutes transitions confondues."""
+        coords: Set[Coord] = set()
+        for touched in self.changes.values():
+            coords |= touched
+        return coords
+
+
+class UpsertJournal:
+    """Ring buffer borné des derniers upserts versionnés."""
+
+    def __init__(self, capacity: int = STORAGE_JOURNAL_CONFIG['capacity']):
+        self._entries: Deque[JournalEntry] = deque(maxlen=capacity)
+        self.version = 0
+
+    def record(self, changes: Transitions) -> int:
+        """Enregistre les transitions non vides ; retourne la version courante."""
+        changes = {transition: coords for transition, coords in changes.items() if coords}
+        if changes:
+            self.version += 1
+            self._entries.append(JournalEntry(version=self.version, changes=changes))
+        return self.version
+
+    def invalidate(self) -> int:
+        """Storage vidé : nouvelle version sans historique (tous les abonnés se resynchronisent)."""
+        self._entries.clear()
+        self.version += 1
+        return self.version
+
+    def changes_since(self, version: int) -> ChangeSet:
+        """Transitions cumulées de toutes les versions > `version`."""
+        result = ChangeSet(since=version, version=self.version)
+        if version >= self.version:
+            return result
+        oldest = self._entries[0].version if self._entries else self.version + 1
+        result.complete = version >= oldest - 1
+        for entry in self._entries:
+            if entry.version <= version:
+                continue
+            for transition, coords in entry.changes.items():
+                result.changes.setdefault(transition, set()).update(coords)
+        return result
+
+
+class ChangeFeed:
+    """Abonnement d'un consommateur : chaque `poll()` rend le delta depuis le précédent."""
+
+    def __init__(self, journal: UpsertJournal, name: str = "", since: int = 0):
+        self.journal = journal
+        self.name = name
+        self.cursor = since
+
+    def poll(self) -> ChangeSet:
+        changes = self.journal.changes_since(self.cursor)
+        self.cursor = changes.version
+        return changes
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-from typing import Set, Tuple
+from typing import Set
 
-Coord = Tuple[int, int]
+from src.config import STORAGE_EVICTION_CONFIG
+from .bitmap import ChunkedBitmap
+from .types import ChunkKey, Coord
 
 
 class SetManager:
@@ -13,6 +15,8 @@ class SetManager:
     def __init__(self) -> None:
         self._revealed_set: Set[Coord] = set()
         self._known_set: Set[Coord] = set()
+        # Cellules connues chaudes en bitmap (masques pour la vision) ; les régions froides portent les leurs
+        self._known_bitmap = ChunkedBitmap(STORAGE_EVICTION_CONFIG['chunk_size'])
         self._active_set: Set[Coord] = set()
         self._frontier_set: Set[Coord] = set()
         self._to_visualize: Set[Coord] = set()
@@ -52,6 +56,9 @@ class SetManager:
     def get_known(self) -> Set[Coord]:
         return set(self._known_set)
 
+    def get_known_bitmap(self) -> ChunkedBitmap:
+        return self._known_bitmap
+
     def remove_from_state_sets(self, coord: Coord) -> None:
         """Retire une coord des ensembles d'état (sauf known)."""
         self._revealed_set.discard(coord)
@@ -60,6 +67,15 @@ class SetManager:
 
     def add_to_known(self, coord: Coord) -> None:
         self._known_set.add(coord)
+        self._known_bitmap.add(coord)
+
+    def discard_known(self, coord: Coord) -> None:
+        """Retire une coord de known_set (éviction vers une région froide)."""
+        self._known_set.discard(coord)
+
+    def discard_known_chunk(self, key: ChunkKey) -> None:
+        """Retire un chunk évincé du bitmap : ses cellules connues sont lues dans la région froide."""
+        self._known_bitmap.discard_chunk(key)
 
     def add_to_revealed(self, coord: Coord) -> None:
         self._revealed_set.add(coord)
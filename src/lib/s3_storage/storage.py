@@ -2,15 +2,22 @@
 
 from __future__ import annotations
 
-from typing import Dict, Set, Optional, TYPE_CHECKING
+import math
+from typing import Dict, Iterator, Set, Optional, TYPE_CHECKING
 
+import numpy as np
+
+from src.config import STORAGE_EVICTION_CONFIG
 from src.lib.s0_coordinates.types import GridBounds
 from .types import (
-    Bounds, Coord, GridCell, StorageUpsert,
+    Bounds, Coord, GridCell, StorageCounters, StorageUpsert,
     RawCellState, LogicalCellState, SolverStatus,
     ActiveRelevance, FrontierRelevance,
 )
 from .grid import GridStore
+from .grid_db import GridDatabase
+from .cold_regions import KnownCells
+from .journal import ChangeFeed, ChangeSet, TransitionType, UpsertJournal
 
 if TYPE_CHECKING:
     from src.lib.s2_vision.types import VisionResult
@@ -64,12 +71,91 @@ def _symbol_to_number(symbol: str) -> Optional[int]:
 class StorageController:
     """Façade principale pour le storage."""
 
-    def __init__(self) -> None:
+    def __init__(self, database: Optional[GridDatabase] = None) -> None:
         self._store = GridStore()
+        self._journal = UpsertJournal()
+        self._database: Optional[GridDatabase] = None
+        if database is not None:
+            self.attach_database(database)
+
+    @property
+    def database(self) -> Optional[GridDatabase]:
+        return self._database
+
+    def attach_database(self, database: GridDatabase) -> int:
+        """
+        Branche la base persistante de la partie : les cellules déjà écrites
+        sont rechargées (reprise), puis chaque upsert y est écrit.
+        Retourne le nombre de cellules reprises.
+        """
+        cells = database.load_cells()
+        if cells:
+            self._journal.record(self._store.apply_upsert(StorageUpsert(cells=cells)))
+            print(f"[STORAGE] Reprise : {len(cells)} cellules rechargées depuis {database.path}")
+        self._database = database
+        return len(cells)
+
+    def resume_from(self, database: GridDatabase, vision_result: "VisionResult") -> int:
+        """
+        Reprise d'une partie interrompue : recharge les cellules de `database`
+        seulement si la page montre toujours cette partie, c.-à-d. si les cases
+        ouvertes de la base visibles dans `vision_result` (au moins une) y sont
+        vues à l'identique. Sinon (plateau relancé), rien n'est chargé.
+        Retourne le nombre de cellules reprises.
+        """
+        cells = database.load_cells()
+        checked = 0
+        for match in vision_result.matches:
+            saved = cells.get((match.coord.col, match.coord.row))
+            if saved is None or saved.logical_state not in (LogicalCellState.OPEN_NUMBER, LogicalCellState.EMPTY):
+                continue
+            if (saved.logical_state != _symbol_to_logical_state(match.symbol)
+                    or saved.number_value != _symbol_to_number(match.symbol)):
+                print(
+                    f"[STORAGE] Reprise refusée : {saved.coord} vue '{match.symbol}' "
+                    f"au lieu de {saved.logical_state.value} (autre partie à l'écran)"
+                )
+                return 0
+            checked += 1
+        if not checked:
+            print("[STORAGE] Reprise refusée : aucune case ouverte de la base n'est visible à l'écran")
+            return 0
+        self.apply_upsert(StorageUpsert(cells=cells))
+        print(f"[STORAGE] Reprise : {len(cells)} cellules rechargées depuis {database.path} ({checked} vérifiées)")
+        return len(cells)
+
+    def detach_database(self) -> None:
+        """Ferme la base persistante (le storage en mémoire est conservé)."""
+        if self._database is not None:
+            self._store.detach_cold_regions()
+            self._database.close()
+            self._database = None
 
     def apply_upsert(self, data: StorageUpsert) -> None:
-        """Applique un batch de mises à jour."""
-        self._store.apply_upsert(data)
+        """Applique un batch de mises à jour (et flush des chunks modifiés si une base est branchée)."""
+        self._journal.record(self._store.apply_upsert(data))
+        if self._database is not None and data.cells:
+            try:
+                self._database.write_cells(data.cells)
+            except Exception as e:
+                print(f"[STORAGE] Erreur écriture base de grille, persistance désactivée: {e}")
+                self.detach_database()
+
+    @property
+    def version(self) -> int:
+        """Version courante : incrémentée à chaque upsert qui modifie effectivement le storage."""
+        return self._journal.version
+
+    def changes_since(self, version: int) -> ChangeSet:
+        """Coordonnées modifiées depuis `version`, groupées par type de transition."""
+        return self._journal.changes_since(version)
+
+    def subscribe(self, name: str = "", from_start: bool = False) -> ChangeFeed:
+        """
+        Abonne un consommateur incrémental au journal. `from_start` : le premier
+        poll rend tout l'historique encore journalisé (sinon, uniquement la suite).
+        """
+        return ChangeFeed(self._journal, name=name, since=0 if from_start else self._journal.version)
 
     def get_snapshot(self, bounds: Optional[GridBounds] = None) -> Dict[Coord, GridCell]:
         """Retourne un snapshot des cellules."""
@@ -91,17 +177,61 @@ class StorageController:
         """Retourne les coordonnées révélées."""
         return self._store.get_revealed()
 
-    def get_known(self) -> Set[Coord]:
-        """Retourne les coordonnées connues."""
+    def get_known(self) -> KnownCells:
+        """Retourne les coordonnées connues (régions froides comprises)."""
         return self._store.get_known()
 
+    def get_counters(self) -> StorageCounters:
+        """Compteurs (cellules, révélées, drapeaux, par status) en O(1), régions froides comprises."""
+        return self._store.get_counters()
+
+    def get_known_mask(self, bounds: GridBounds) -> np.ndarray:
+        """
+        Masque booléen (rows, cols) des cellules connues, aligné sur `bounds`
+        ([row - min_row, col - min_col]) : régions froides comprises, sans copie d'ensemble.
+        """
+        return self._store.get_known_mask(
+            (bounds.min_col, bounds.min_row, bounds.max_col, bounds.max_row)
+        )
+
+    def evict_cold_regions(self, radius: int = STORAGE_EVICTION_CONFIG['radius']) -> int:
+        """
+        Sort des structures chaudes les régions entièrement résolues situées à plus
+        de `radius` cases de toute cellule non résolue. Retourne le nombre de cellules évincées.
+        """
+        chunk_radius = math.ceil(radius / STORAGE_EVICTION_CONFIG['chunk_size'])
+        coords = self._store.evict_cold_regions(chunk_radius, self._database)
+        self._journal.record({TransitionType.EVICTED: set(coords)})
+        evicted = len(coords)
+        if evicted:
+            stats = self._store.get_cold_stats()
+            print(
+                f"[STORAGE] Éviction : {evicted} cellules → {stats['regions']} régions froides "
+                f"({stats['cells']} cellules, {stats['mines']} mines, {stats['in_database']} lues dans la base)"
+            )
+        return evicted
+
+    def get_cell(self, coord: Coord) -> Optional[GridCell]:
+        """Cellule d'une coordonnée, lue dans sa région froide si elle a été évincée (sans la réchauffer)."""
+        return self._store.get_cell(coord)
+
+    def iter_coords(self) -> Iterator[Coord]:
+        """Coordonnées de toutes les cellules, régions froides comprises."""
+        return self._store.iter_coords()
+
+    def get_cold_stats(self) -> Dict[str, int]:
+        """Compteurs des régions froides (regions, cells, known, mines, in_database)."""
+        return self._store.get_cold_stats()
+
     def get_to_visualize(self) -> Set[Coord]:
         """Retourne les coordonnées à re-capturer."""
         return self._store.get_to_visualize()
     
     def reset(self) -> None:
-        """Réinitialise complètement le storage (vide toutes les cellules)."""
+        """Réinitialise complètement le storage (vide toutes les cellules, détache la base)."""
+        self.detach_database()
         self._store = GridStore()
+        self._journal.invalidate()
 
     def update_from_vision(self, vision_result: "VisionResult") -> Dict[str, int]:
         """Met à jour le storage depuis les résultats vision (boîte noire).
@@ -1,11 +1,12 @@
 """Types et énumérations pour le storage et le solver."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Dict, Optional, Tuple
 
 Coord = Tuple[int, int]
 Bounds = Tuple[int, int, int, int]
+ChunkKey = Tuple[int, int]  # Position d'un chunk (cx, cy), en chunks
 
 
 class RawCellState(str, Enum):
@@ -73,9 +74,82 @@ class FrontierRelevance(str, Enum):
     PROCESSED = "PROCESSED"
 
 
+# ---------------------------------------------------------------------------
+# Encodage compact des enums : code int8 par membre (0 réservé à None)
+# ---------------------------------------------------------------------------
+
+def _code_table(enum_cls) -> Tuple[Dict[Optional[Enum], int], Tuple[Optional[Enum], ...]]:
+    members = (None, *enum_cls)
+    return {member: code for code, member in enumerate(members)}, members
+
+
+RAW_STATE_CODES, RAW_STATE_MEMBERS = _code_table(RawCellState)
+LOGICAL_STATE_CODES, LOGICAL_STATE_MEMBERS = _code_table(LogicalCellState)
+SOLVER_STATUS_CODES, SOLVER_STATUS_MEMBERS = _code_table(SolverStatus)
+ACTIVE_RELEVANCE_CODES, ACTIVE_RELEVANCE_MEMBERS = _code_table(ActiveRelevance)
+FRONTIER_RELEVANCE_CODES, FRONTIER_RELEVANCE_MEMBERS = _code_table(FrontierRelevance)
+
+# Disposition du code d'état packé (un int par cellule) :
+#   bits 0-4   raw_state          bits 12-15  solver_status
+#   bits 5-7   logical_state      bits 16-17  focus_level_active
+#   bits 8-11  number_value + 1   bits 18-19  focus_level_frontier
+_RAW_SHIFT, _LOGICAL_SHIFT, _NUMBER_SHIFT = 0, 5, 8
+_STATUS_SHIFT, _ACTIVE_SHIFT, _FRONTIER_SHIFT = 12, 16, 18
+_STATUS_MASK = 0xF << _STATUS_SHIFT
+_ACTIVE_MASK = 0x3 << _ACTIVE_SHIFT
+_FRONTIER_MASK = 0x3 << _FRONTIER_SHIFT
+_LOGICAL_MASK = 0x7 << _LOGICAL_SHIFT
+
+# Codes stockés par chunk (régions froides, base de grille) : state_code | PRESENT, 0 = absente
+PRESENT = 1 << 31
+CODE_MASK = PRESENT - 1
+_UNREVEALED_BITS = LOGICAL_STATE_CODES[LogicalCellState.UNREVEALED] << _LOGICAL_SHIFT
+
+
+def is_known_code(codes):
+    """Codes de chunk présents et d'état logique connu (≠ UNREVEALED) ; int ou tableau numpy."""
+    return (codes != 0) & ((codes & _LOGICAL_MASK) != _UNREVEALED_BITS)
+
+
+def pack_cell_state(
+    raw_state: Optional[RawCellState],
+    logical_state: Optional[LogicalCellState],
+    number_value: Optional[int],
+    solver_status: Optional[SolverStatus],
+    focus_level_active: Optional[ActiveRelevance],
+    focus_level_frontier: Optional[FrontierRelevance],
+) -> int:
+    """Code d'état packé d'une cellule (hors coordonnées)."""
+    return (
+        RAW_STATE_CODES[raw_state] << _RAW_SHIFT
+        | LOGICAL_STATE_CODES[logical_state] << _LOGICAL_SHIFT
+        | (0 if number_value is None else number_value + 1) << _NUMBER_SHIFT
+        | SOLVER_STATUS_CODES[solver_status] << _STATUS_SHIFT
+        | ACTIVE_RELEVANCE_CODES[focus_level_active] << _ACTIVE_SHIFT
+        | FRONTIER_RELEVANCE_CODES[focus_level_frontier] << _FRONTIER_SHIFT
+    )
+
+
+def unpack_cell_state(code: int) -> tuple:
+    """Inverse de pack_cell_state : (raw, logical, number, status, focus_active, focus_frontier)."""
+    number = (code >> _NUMBER_SHIFT) & 0xF
+    return (
+        RAW_STATE_MEMBERS[(code >> _RAW_SHIFT) & 0x1F],
+        LOGICAL_STATE_MEMBERS[(code >> _LOGICAL_SHIFT) & 0x7],
+        number - 1 if number else None,
+        SOLVER_STATUS_MEMBERS[(code >> _STATUS_SHIFT) & 0xF],
+        ACTIVE_RELEVANCE_MEMBERS[(code >> _ACTIVE_SHIFT) & 0x3],
+        FRONTIER_RELEVANCE_MEMBERS[(code >> _FRONTIER_SHIFT) & 0x3],
+    )
+
+
+# Sentinel "champ inchangé" pour with_status (None est une valeur de focus valide)
+_KEEP = object()
+
+
 @dataclass
-class GridCell:
-    """Représentation d'une cellule de la grille."""
+class _GridCellFields:
+    """Description dataclass de GridCell (shim pour dataclasses.replace/fields/asdict)."""
     coord: Coord
     raw_state: RawCellState = RawCellState.UNREVEALED
     logical_state: LogicalCellState = LogicalCellState.UNREVEALED
@@ -84,9 +158,152 @@ class GridCell:
     focus_level_active: ActiveRelevance = ActiveRelevance.TO_REDUCE
     focus_level_frontier: FrontierRelevance = FrontierRelevance.TO_PROCESS
 
-    def __post_init__(self):
-        """Support pour ancien constructeur avec x, y."""
-        pass
+
+class GridCell:
+    """
+    Représentation d'une cellule de la grille.
+
+    Enregistrement à __slots__ traité comme immuable (jamais muté : une mise à
+    jour crée une nouvelle cellule). Les champs restent des membres d'enum pour
+    la lecture ; `state_code` est leur encodage packé (codes int8 par enum),
+    utilisé pour l'égalité (une comparaison d'entiers) et la sérialisation.
+
+    Transitions de status : `with_status()` (chemin rapide, sans
+    dataclasses.replace). `dataclasses.replace(cell, ...)` reste supporté.
+    """
+
+    __slots__ = (
+        "coord",
+        "raw_state",
+        "logical_state",
+        "number_value",
+        "solver_status",
+        "focus_level_active",
+        "focus_level_frontier",
+        "state_code",
+    )
+
+    # Shim : GridCell est vu comme une dataclass par le module dataclasses
+    __dataclass_fields__ = _GridCellFields.__dataclass_fields__
+    __dataclass_params__ = _GridCellFields.__dataclass_params__
+    __match_args__ = tuple(_GridCellFields.__dataclass_fields__)
+
+    def __init__(
+        self,
+        coord: Coord,
+        raw_state: RawCellState = RawCellState.UNREVEALED,
+        logical_state: LogicalCellState = LogicalCellState.UNREVEALED,
+        number_value: Optional[int] = None,
+        solver_status: SolverStatus = SolverStatus.NONE,
+        focus_level_active: Optional[ActiveRelevance] = ActiveRelevance.TO_REDUCE,
+        focus_level_frontier: Optional[FrontierRelevance] = FrontierRelevance.TO_PROCESS,
+    ):
+        self.coord = coord
+        self.raw_state = raw_state
+        self.logical_state = logical_state
+        self.number_value = number_value
+        self.solver_status = solver_status
+        self.focus_level_active = focus_level_active
+        self.focus_level_frontier = focus_level_frontier
+        self.state_code = pack_cell_state(
+            raw_state, logical_state, number_value,
+            solver_status, focus_level_active, focus_level_frontier,
+        )
+
+    @classmethod
+    def from_code(cls, coord: Coord, code: int) -> "GridCell":
+        """Reconstruit une cellule depuis son code packé."""
+        cell = cls.__new__(cls)
+        cell.coord = coord
+        (
+            cell.raw_state,
+            cell.logical_state,
+            cell.number_value,
+            cell.solver_status,
+            cell.focus_level_active,
+            cell.focus_level_frontier,
+        ) = unpack_cell_state(code)
+        cell.state_code = code
+        return cell
+
+    def with_status(
+        self,
+        solver_status=_KEEP,
+        focus_level_active=_KEEP,
+        focus_level_frontier=_KEEP,
+        logical_state=_KEEP,
+    ) -> "GridCell":
+        """
+        Copie avec status/focus (et éventuellement logical_state) modifiés.
+
+        Chemin rapide des transitions du solver : copie des slots et mise à
+        jour des seuls bits concernés du code packé.
+        """
+        cell = GridCell.__new__(GridCell)
+        code = self.state_code
+        cell.coord = self.coord
+        cell.raw_state = self.raw_state
+        cell.number_value = self.number_value
+
+        if logical_state is _KEEP:
+            cell.logical_state = self.logical_state
+        else:
+            cell.logical_state = logical_state
+            code = code & ~_LOGICAL_MASK | LOGICAL_STATE_CODES[logical_state] << _LOGICAL_SHIFT
+        if solver_status is _KEEP:
+            cell.solver_status = self.solver_status
+        else:
+            cell.solver_status = solver_status
+            code = code & ~_STATUS_MASK | SOLVER_STATUS_CODES[solver_status] << _STATUS_SHIFT
+        if focus_level_active is _KEEP:
+            cell.focus_level_active = self.focus_level_active
+        else:
+            cell.focus_level_active = focus_level_active
+            code = code & ~_ACTIVE_MASK | ACTIVE_RELEVANCE_CODES[focus_level_active] << _ACTIVE_SHIFT
+        if focus_level_frontier is _KEEP:
+            cell.focus_level_frontier = self.focus_level_frontier
+        else:
+            cell.focus_level_frontier = focus_level_frontier
+            code = code & ~_FRONTIER_MASK | FRONTIER_RELEVANCE_CODES[focus_level_frontier] << _FRONTIER_SHIFT
+
+        cell.state_code = code
+        return cell
+
+    def __eq__(self, other):
+        if other.__class__ is not GridCell:
+            return NotImplemented
+        return self.state_code == other.state_code and self.coord == other.coord
+
+    __hash__ = None  # Comme la dataclass d'origine (eq sans frozen)
+
+    def __repr__(self) -> str:
+        return (
+            f"GridCell(coord={self.coord!r}, raw_state={self.raw_state!r}, "
+            f"logical_state={self.logical_state!r}, number_value={self.number_value!r}, "
+            f"solver_status={self.solver_status!r}, focus_level_active={self.focus_level_active!r}, "
+            f"focus_level_frontier={self.focus_level_frontier!r})"
+        )
+
+    def __reduce__(self):
+        # Pickle compact (worker d'overlay, enregistreur) : coordonnées + code packé
+        return (GridCell.from_code, (self.coord, self.state_code))
+
+
+@dataclass
+class StorageCounters:
+    """Compteurs du storage maintenus à chaque upsert (régions froides comprises)."""
+    cells: int = 0
+    revealed: int = 0          # Cases ouvertes (OPEN_NUMBER / EMPTY)
+    flagged: int = 0           # Mines : drapeaux et explosions (CONFIRMED_MINE) ou status MINE
+    by_status: Dict[SolverStatus, int] = field(default_factory=dict)
+
+    @property
+    def progress(self) -> int:
+        """Mesure de progression de la partie (stuck detection) : révélées + drapeaux."""
+        return self.revealed + self.flagged
+
+    def copy(self) -> "StorageCounters":
+        return StorageCounters(self.cells, self.revealed, self.flagged, dict(self.by_status))
 
 
 class StorageUpsert:
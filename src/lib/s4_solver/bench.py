@@ -0,0 +1,228 @@
+"""Benchmark du solver sur plateaux simulés (sortie JSON comparable entre moteurs).
+
+Usage :
+    python -m src.lib.s4_solver.bench --size 60 --density 0.2 --seeds 1 2 3 --reveal 0.35
+
+Pour chaque (seed, taille, densité) : génère un plateau déterministe
+(s0_simulator), révèle une partie des cases par jeu simulé, puis chronomètre
+chaque étape du solver (status, reducer, propagateurs s41, segmentation,
+CSP par composante, post-solver, sweep) et mesure la mémoire de pointe.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import random
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+from src.config import CELL_SIZE, CELL_BORDER
+from src.lib.s0_coordinates.types import Coord as GridCoord
+from src.lib.s0_simulator import SimulatedBoard, SimulatorConfig
+from src.lib.s0_simulator.board import TILE_SIZE
+from src.lib.s2_vision.s2_types import CellMatch, VisionResult
+from src.lib.s3_storage import StorageController
+from src.lib.s3_storage.types import SolverStatus
+from src.lib.s4_solver.types import SolverInput
+from src.lib.s4_solver.s4a_status_analyzer import StatusManager
+from src.lib.s4_solver.s4b_csp_solver.csp_manager import solve as csp_solve
+from src.lib.s4_solver.s4d_post_solver_sweep import build_sweep_actions
+
+
+def build_board(seed: int, size: int, density: float) -> SimulatedBoard:
+    """Plateau simulé d'environ size×size cases centré sur l'origine."""
+    half_tiles = max(1, math.ceil(size * (CELL_SIZE + CELL_BORDER) / 2 / TILE_SIZE))
+    config = SimulatorConfig(
+        seed=seed,
+        tiles_x=(-half_tiles, half_tiles - 1),
+        tiles_y=(-half_tiles, half_tiles - 1),
+        density=density,
+        lives=1,
+    )
+    return SimulatedBoard(config)
+
+
+def play_until(board: SimulatedBoard, reveal_ratio: float, seed: int) -> None:
+    """Joue des coups sûrs au bord de la zone révélée jusqu'à atteindre le ratio demandé."""
+    rng = random.Random(seed)
+    total = (board.max_col - board.min_col + 1) * (board.max_row - board.min_row + 1)
+    target = int(total * (1 - board.config.mine_density) * reveal_ratio)
+
+    # Candidats maintenus incrémentalement à partir des cellules modifiées
+    candidates = set()
+    changed = board.pop_changes() | set(board.revealed)
+    while True:
+        for coord in changed:
+            candidates.discard(coord)
+            if coord in board.revealed:
+                candidates.update(
+                    n for n in board.neighbors(coord)
+                    if n not in board.revealed and not board.is_mine(n)
+                )
+        if board.stats.revealed >= target or not candidates:
+            break
+        board.left_click(rng.choice(sorted(candidates)))
+        changed = board.pop_changes()
+
+
+def board_to_storage(board: SimulatedBoard) -> StorageController:
+    """Charge l'état visible du plateau dans un storage (comme après la vision)."""
+    matches = [
+        CellMatch(coord=GridCoord(row=row, col=col), symbol=board.symbol_at((col, row)), confidence=1.0)
+        for row in range(board.min_row, board.max_row + 1)
+        for col in range(board.min_col, board.max_col + 1)
+    ]
+    storage = StorageController()
+    storage.update_from_vision(VisionResult(matches=matches))
+    return storage
+
+
+def _time_s41(cells) -> Dict[str, Any]:
+    try:
+        from src.lib.s4_solver.s41_propagator_solver.s410_propagator_pipeline import PropagatorPipeline
+    except Exception as e:  # Module legacy : imports cassés dans cet arbre
+        return {"available": False, "error": f"{type(e).__name__}: {e}"}
+    t0 = time.perf_counter()
+    result = PropagatorPipeline(dict(cells)).run()
+    return {
+        "available": True,
+        "ms": (time.perf_counter() - t0) * 1000,
+        "safe": len(result.safe_cells),
+        "flags": len(result.flag_cells),
+    }
+
+
+def run_solver_stages(storage: StorageController) -> Dict[str, Any]:
+    """Exécute le pipeline solver étape par étape (mêmes appels que solver.solve)."""
+    cells = storage.get_snapshot()
+    status_manager = StatusManager()
+
+    t0 = time.perf_counter()
+    upsert = status_manager.pipeline_post_vision(cells)
+    cells.update(upsert.cells)
+    status_ms = (time.perf_counter() - t0) * 1000
+
+    frontier = {c for c, cell in cells.items() if cell.solver_status == SolverStatus.FRONTIER}
+    active = {c for c, cell in cells.items() if cell.solver_status == SolverStatus.ACTIVE}
+
+    s41 = _time_s41(cells)
+
+    t0 = time.perf_counter()
+    output = csp_solve(SolverInput(cells=dict(cells), frontier=frontier, active_set=active))
+    csp_total_ms = (time.perf_counter() - t0) * 1000
+    stats = output.metadata.get("stats", {})
+
+    t0 = time.perf_counter()
+    post_upsert = status_manager.pipeline_post_solver(cells, output)
+    cells.update(post_upsert.cells)
+    post_ms = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    sweep = build_sweep_actions(cells)
+    sweep_ms = (time.perf_counter() - t0) * 1000
+
+    components = stats.get("components", [])
+    solved = [c for c in components if not c["skipped"]]
+    resolved = output.safe_count + output.flag_count
+    total_ms = status_ms + csp_total_ms + post_ms + sweep_ms
+    return {
+        "frontier": len(frontier),
+        "active": len(active),
+        "status_ms": status_ms,
+        "reducer_ms": stats.get("reducer_ms", 0.0),
+        "s41": s41,
+        "segmentation_ms": stats.get("segmentation_ms", 0.0),
+        "csp_ms": sum(c["ms"] for c in solved),
+        "csp_total_ms": csp_total_ms,
+        "post_solver_ms": post_ms,
+        "sweep_ms": sweep_ms,
+        "total_ms": total_ms,
+        "components": components,
+        "components_skipped": len(components) - len(solved),
+        "csp_nodes": sum(c["nodes"] for c in solved),
+        "csp_solutions": sum(c["solutions"] for c in solved),
+        "safe": output.safe_count,
+        "flags": output.flag_count,
+        "sweep_actions": len(sweep),
+        "cells_resolved_per_s": resolved / (total_ms / 1000) if total_ms > 0 else 0.0,
+    }
+
+
+def bench_case(seed: int, size: int, density: float, reveal: float) -> Dict[str, Any]:
+    """Un cas de bench : passe chronométrée puis passe mémoire (tracemalloc)."""
+    board = build_board(seed, size, density)
+    play_until(board, reveal, seed)
+
+    # Les modules solver loggent abondamment : sortie capturée pour garder un JSON propre
+    with contextlib.redirect_stdout(io.StringIO()):
+        timings = run_solver_stages(board_to_storage(board))
+        storage = board_to_storage(board)
+        tracemalloc.start()
+        run_solver_stages(storage)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "seed": seed,
+        "size": size,
+        "density": density,
+        "reveal": reveal,
+        "cells": (board.max_col - board.min_col + 1) * (board.max_row - board.min_row + 1),
+        "revealed": board.stats.revealed,
+        "peak_memory_kb": peak / 1024,
+        **timings,
+    }
+
+
+def run_bench(
+    seeds: List[int],
+    sizes: List[int],
+    densities: List[float],
+    reveal: float,
+) -> Dict[str, Any]:
+    cases = [
+        bench_case(seed, size, density, reveal)
+        for size in sizes
+        for density in densities
+        for seed in seeds
+    ]
+    keys = ("status_ms", "reducer_ms", "segmentation_ms", "csp_ms", "post_solver_ms", "sweep_ms", "total_ms")
+    summary = {key: sum(c[key] for c in cases) for key in keys}
+    summary.update(
+        csp_nodes=sum(c["csp_nodes"] for c in cases),
+        csp_solutions=sum(c["csp_solutions"] for c in cases),
+        resolved=sum(c["safe"] + c["flags"] for c in cases),
+        peak_memory_kb=max((c["peak_memory_kb"] for c in cases), default=0.0),
+    )
+    summary["cells_resolved_per_s"] = (
+        summary["resolved"] / (summary["total_ms"] / 1000) if summary["total_ms"] > 0 else 0.0
+    )
+    return {"cases": cases, "summary": summary}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark du solver s4 sur plateaux simulés")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--size", type=int, nargs="+", default=[60], help="Côté du plateau en cases")
+    parser.add_argument("--density", type=float, nargs="+", default=[0.2])
+    parser.add_argument("--reveal", type=float, default=0.35, help="Part des cases sûres révélées avant mesure")
+    parser.add_argument("--output", help="Fichier JSON de sortie (stdout par défaut)")
+    args = parser.parse_args(argv)
+
+    report = run_bench(args.seeds, args.size, args.density, args.reveal)
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload)
+        print(f"[BENCH] Rapport écrit : {args.output}")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,6 @@ Après que le solver émet des actions (SAFE/FLAG/GUESS), ce module :
 
 from __future__ import annotations
 
-from dataclasses import replace
 from typing import Dict, List, Set
 
 from src.lib.s3_storage.types import (
@@ -61,8 +60,7 @@ class ActionMapper:
             resolved_coords.add(coord)
 
             if action.action == ActionType.FLAG:
-                updated_cells[coord] = replace(
-                    cell,
+                updated_cells[coord] = cell.with_status(
                     logical_state=LogicalCellState.CONFIRMED_MINE,
                     solver_status=SolverStatus.MINE,
                     focus_level_active=ActiveRelevance.TO_REDUCE,
@@ -71,8 +69,7 @@ class ActionMapper:
                 frontier_remove.add(coord)
 
             elif action.action in (ActionType.SAFE, ActionType.GUESS):
-                updated_cells[coord] = replace(
-                    cell,
+                updated_cells[coord] = cell.with_status(
                     solver_status=SolverStatus.TO_VISUALIZE,
                     focus_level_active=ActiveRelevance.TO_REDUCE,
                     focus_level_frontier=FrontierRelevance.TO_PROCESS,
@@ -87,8 +84,7 @@ class ActionMapper:
             
             cell = cells[coord]
             if cell.solver_status == SolverStatus.ACTIVE:
-                updated_cells[coord] = replace(
-                    cell,
+                updated_cells[coord] = cell.with_status(
                     solver_status=SolverStatus.SOLVED,
                     focus_level_active=ActiveRelevance.REDUCED,
                 )
@@ -101,15 +97,13 @@ class ActionMapper:
                 continue
             
             if cell.solver_status == SolverStatus.ACTIVE:
-                updated_cells[coord] = replace(
-                    cell,
+                updated_cells[coord] = cell.with_status(
                     focus_level_active=ActiveRelevance.REDUCED,
                 )
                 active_remove.add(coord)
             
             elif cell.solver_status == SolverStatus.FRONTIER:
-                updated_cells[coord] = replace(
-                    cell,
+                updated_cells[coord] = cell.with_status(
                     focus_level_frontier=FrontierRelevance.PROCESSED,
                 )
                 frontier_remove.add(coord)
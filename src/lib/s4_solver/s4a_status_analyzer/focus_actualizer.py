@@ -9,7 +9,6 @@ Centralise 100% de la logique de gestion des focus levels.
 
 from __future__ import annotations
 
-from dataclasses import replace
 from typing import Dict, Set, Iterable
 
 from src.lib.s3_storage.types import (
@@ -59,20 +58,17 @@ class FocusActualizer:
                 cell = cells[nb]
                 if cell.solver_status == SolverStatus.ACTIVE:
                     if cell.focus_level_active in (None, ActiveRelevance.REDUCED):
-                        updated_cells[nb] = replace(
-                            cell,
+                        updated_cells[nb] = cell.with_status(
                             focus_level_active=ActiveRelevance.TO_REDUCE,
                         )
                 elif cell.solver_status == SolverStatus.FRONTIER:
                     if cell.focus_level_frontier in (None, FrontierRelevance.PROCESSED):
-                        updated_cells[nb] = replace(
-                            cell,
+                        updated_cells[nb] = cell.with_status(
                             focus_level_frontier=FrontierRelevance.TO_PROCESS,
                         )
                 # NOUVEAU : Réveiller les SOLVED si un voisin change (ex: régression suite à échec action)
                 elif cell.solver_status == SolverStatus.SOLVED:
-                    updated_cells[nb] = replace(
-                        cell,
+                    updated_cells[nb] = cell.with_status(
                         solver_status=SolverStatus.ACTIVE,
                         focus_level_active=ActiveRelevance.TO_REDUCE,
                     )
@@ -100,8 +96,7 @@ class FocusActualizer:
             cell = cells[coord]
             if cell.solver_status == SolverStatus.ACTIVE:
                 if cell.focus_level_active == ActiveRelevance.TO_REDUCE:
-                    updated_cells[coord] = replace(
-                        cell,
+                    updated_cells[coord] = cell.with_status(
                         focus_level_active=ActiveRelevance.REDUCED,
                     )
 
@@ -128,8 +123,7 @@ class FocusActualizer:
             cell = cells[coord]
             if cell.solver_status == SolverStatus.FRONTIER:
                 if cell.focus_level_frontier == FrontierRelevance.TO_PROCESS:
-                    updated_cells[coord] = replace(
-                        cell,
+                    updated_cells[coord] = cell.with_status(
                         focus_level_frontier=FrontierRelevance.PROCESSED,
                     )
 
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, replace
+from dataclasses import dataclass
 from typing import Dict, Set, Tuple, Optional, TYPE_CHECKING
 
 from PIL import Image
@@ -146,21 +146,17 @@ class StatusAnalyzer:
             cell = cells[coord]
 
             if action.action == ActionType.FLAG:
-                updated_cells[coord] = replace(
-                    cell,
+                updated_cells[coord] = cell.with_status(
                     logical_state=LogicalCellState.CONFIRMED_MINE,
                     solver_status=SolverStatus.SOLVED,
-                    topological_state=SolverStatus.SOLVED,
                     focus_level_active=None,
                     focus_level_frontier=None,
                 )
                 frontier_remove.add(coord)
 
             elif action.action in (ActionType.SAFE, ActionType.GUESS):
-                updated_cells[coord] = replace(
-                    cell,
+                updated_cells[coord] = cell.with_status(
                     solver_status=SolverStatus.TO_VISUALIZE,
-                    topological_state=SolverStatus.TO_VISUALIZE,
                     focus_level_active=None,
                     focus_level_frontier=None,
                 )
@@ -195,8 +191,7 @@ class StatusAnalyzer:
         # Cela inclut les mines explosées des itérations précédentes
         for coord, cell in cells.items():
             if cell.logical_state == LogicalCellState.CONFIRMED_MINE and cell.solver_status != SolverStatus.MINE:
-                updated_cells[coord] = replace(
-                    cell,
+                updated_cells[coord] = cell.with_status(
                     solver_status=SolverStatus.MINE,
                     focus_level_active=None,
                     focus_level_frontier=None
@@ -220,8 +215,7 @@ class StatusAnalyzer:
             cell = cells[coord]
             # On ne met à jour que si le statut change (pour éviter de reset le focus REDUCED)
             if cell.solver_status != SolverStatus.ACTIVE:
-                updated_cells[coord] = replace(
-                    cell,
+                updated_cells[coord] = cell.with_status(
                     solver_status=SolverStatus.ACTIVE,
                     focus_level_active=ActiveRelevance.TO_REDUCE,
                     focus_level_frontier=None
@@ -232,8 +226,7 @@ class StatusAnalyzer:
         for coord in classification.frontier:
             cell = cells[coord]
             if cell.solver_status != SolverStatus.FRONTIER:
-                updated_cells[coord] = replace(
-                    cell,
+                updated_cells[coord] = cell.with_status(
                     solver_status=SolverStatus.FRONTIER,
                     focus_level_active=None,
                     focus_level_frontier=FrontierRelevance.TO_PROCESS
@@ -243,8 +236,7 @@ class StatusAnalyzer:
         # On ne le fait que si on a une vue globale (ce qui est le cas ici)
         for coord, cell in cells.items():
             if cell.solver_status == SolverStatus.FRONTIER and coord not in classification.frontier:
-                updated_cells[coord] = replace(
-                    cell,
+                updated_cells[coord] = cell.with_status(
                     solver_status=SolverStatus.NONE,
                     focus_level_frontier=None
                 )
@@ -253,8 +245,7 @@ class StatusAnalyzer:
         for coord in classification.solved:
             cell = cells[coord]
             if cell.solver_status != SolverStatus.SOLVED:
-                updated_cells[coord] = replace(
-                    cell,
+                updated_cells[coord] = cell.with_status(
                     solver_status=SolverStatus.SOLVED,
                     focus_level_active=None,
                     focus_level_frontier=None
@@ -264,8 +255,7 @@ class StatusAnalyzer:
         for coord in classification.mine:
             cell = cells[coord]
             if cell.solver_status != SolverStatus.MINE:
-                updated_cells[coord] = replace(
-                    cell,
+                updated_cells[coord] = cell.with_status(
                     solver_status=SolverStatus.MINE,
                     focus_level_active=None,
                     focus_level_frontier=None
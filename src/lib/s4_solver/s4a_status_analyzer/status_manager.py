@@ -20,7 +20,7 @@ from src.lib.s3_storage.types import Coord, GridCell, StorageUpsert, SolverStatu
 from .status_analyzer import StatusAnalyzer
 from .focus_actualizer import FocusActualizer
 from .action_mapper import ActionMapper
-from src.lib.s4_solver.s4c_overlays import render_and_save_status
+from src.lib.s0_browser.overlay_queue import submit_overlay
 
 if TYPE_CHECKING:
     from src.lib.s0_browser.export_context import ExportContext
@@ -56,7 +56,10 @@ class StatusManager:
         """
         # Étape 0 : Overlay des statuts (AVANT classification, état brut du storage)
         if overlay_ctx and overlay_ctx.overlay_enabled and base_image:
-            render_and_save_status(
+            from src.lib.s4_solver.s4c_overlays import render_and_save_status  # Chargé à la demande
+
+            submit_overlay(
+                render_and_save_status,
                 base_image=base_image.copy(),
                 cells=cells,
                 export_ctx=overlay_ctx,
@@ -84,9 +87,12 @@ class StatusManager:
         
         # Étape 3 : Overlay des statuts (APRÈS classification)
         if overlay_ctx and overlay_ctx.overlay_enabled and base_image:
+            from src.lib.s4_solver.s4c_overlays import render_and_save_status
+
             # On applique l'upsert à un snapshot local pour l'overlay
             snapshot = {**cells, **upsert_analysis.cells}
-            render_and_save_status(
+            submit_overlay(
+                render_and_save_status,
                 base_image=base_image.copy(),
                 cells=snapshot,
                 export_ctx=overlay_ctx,
@@ -65,10 +65,12 @@ class CSPSolver:
     def __init__(self, analyzer: GridAnalyzerProtocol):
         self.analyzer = analyzer
         self.solutions: List[Solution] = []
+        self.nodes_explored = 0  # Nœuds visités par le dernier solve_component (bench)
 
     def solve_component(self, component: Component) -> List[Solution]:
         """Résout une composante et retourne toutes les solutions valides."""
         self.solutions = []
+        self.nodes_explored = 0
 
         zone_to_constraints: Dict[int, List[ConstraintModel]] = {}
 
@@ -125,6 +127,7 @@ class CSPSolver:
         domains: Dict[int, List[int]],
         zone_to_constraints: Dict[int, List[ConstraintModel]],
     ) -> None:
+        self.nodes_explored += 1
         if not unassigned:
             self.solutions.append(Solution(assignment.copy()))
             return
@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-from dataclasses import replace
-from typing import Dict, List, Optional, Set, TYPE_CHECKING
+import time
+from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING
 
 from src.config import CSP_CONFIG
 from src.lib.s3_storage.types import (
@@ -41,6 +41,8 @@ class CspManager:
         self.flag_cells: Set[Coord] = set()
         self.reducer_result: PropagationResult | None = None
         self.focus_updates: Dict[Coord, GridCell] = {}
+        # Mesures par étape (lues par le bench solver)
+        self.stats: Dict[str, Any] = {}
 
     def run(self, *, bypass_ratio: float | None = None) -> None:
         """Pipeline complet: reducer puis CSP."""
@@ -48,9 +50,11 @@ class CspManager:
 
         # Étape 1: Reducer (propagation contrainte)
         print(f"[CSP] Reducer : active={len(self.active_set)}")
+        t0 = time.perf_counter()
         reducer = IterativePropagator(self.cells)
         self.reducer_result = reducer.propagate(self.active_set)
         self._apply_reducer_results()
+        self.stats["reducer_ms"] = (time.perf_counter() - t0) * 1000
         print(f"[CSP] Reducer : safe={len(self.reducer_result.safe_cells)}, flag={len(self.reducer_result.flag_cells)}")
 
         # Bypass CSP si le reducer produit assez d'actions
@@ -72,6 +76,7 @@ class CspManager:
         self.flag_cells.clear()
         self.reducer_result = None
         self.focus_updates = {}
+        self.stats = {"reducer_ms": 0.0, "segmentation_ms": 0.0, "components": []}
 
     def _apply_reducer_results(self) -> None:
         """Applique les résultats du reducer."""
@@ -86,8 +91,7 @@ class CspManager:
             cell = self.cells.get(coord)
             if not cell:
                 continue
-            self.cells[coord] = replace(
-                cell,
+            self.cells[coord] = cell.with_status(
                 logical_state=LogicalCellState.CONFIRMED_MINE,
                 solver_status=SolverStatus.SOLVED,
                 focus_level_active=ActiveRelevance.TO_REDUCE,
@@ -99,8 +103,7 @@ class CspManager:
             if not cell:
                 continue
             # On les sort de la frontière en les marquant vides pour le CSP
-            self.cells[coord] = replace(
-                cell,
+            self.cells[coord] = cell.with_status(
                 logical_state=LogicalCellState.EMPTY,
                 solver_status=SolverStatus.TO_VISUALIZE,
                 focus_level_active=ActiveRelevance.TO_REDUCE,
@@ -111,8 +114,7 @@ class CspManager:
         for coord in self.reducer_result.solved_cells:
             cell = self.cells.get(coord)
             if cell and cell.solver_status == SolverStatus.ACTIVE:
-                self.focus_updates[coord] = replace(
-                    cell,
+                self.focus_updates[coord] = cell.with_status(
                     solver_status=SolverStatus.SOLVED,
                     focus_level_active=ActiveRelevance.REDUCED,
                 )
@@ -126,8 +128,10 @@ class CspManager:
             return
 
         print(f"[CSP] Segmentation : frontier={len(working_frontier)}")
+        t0 = time.perf_counter()
         self.view = SolverFrontierView(self.cells, working_frontier)
         self.segmentation = Segmentation(self.view)
+        self.stats["segmentation_ms"] = (time.perf_counter() - t0) * 1000
         print(f"[CSP] Composantes : {len(self.segmentation.components)}, zones={len(self.segmentation.zones)}")
 
         csp = CSPSolver(self.view)
@@ -147,11 +151,20 @@ class CspManager:
             else:
                 avg_x, avg_y = 0, 0
             
+            component_stats = {"zones": num_zones, "cells": total_cells, "skipped": num_zones > max_zones}
+            self.stats["components"].append(component_stats)
+
             if num_zones > max_zones:
                 print(f"[CSP] SKIP composante {idx+1} @ ({avg_x:.0f},{avg_y:.0f}) : trop grande ({num_zones} zones > {max_zones}, {total_cells} cells)")
                 continue
             
+            t0 = time.perf_counter()
             solutions = csp.solve_component(component)
+            component_stats.update(
+                ms=(time.perf_counter() - t0) * 1000,
+                nodes=csp.nodes_explored,
+                solutions=len(solutions),
+            )
             if not solutions:
                 print(f"[CSP] Composante {idx+1} @ ({avg_x:.0f},{avg_y:.0f}) : {num_zones} zones, AUCUNE solution")
                 continue
@@ -242,8 +255,7 @@ class CspManager:
                     cell = self.cells.get(coord)
                     if not cell or cell.solver_status != SolverStatus.FRONTIER:
                         continue
-                    self.focus_updates[coord] = replace(
-                        cell,
+                    self.focus_updates[coord] = cell.with_status(
                         focus_level_frontier=FrontierRelevance.PROCESSED,
                     )
 
@@ -344,6 +356,7 @@ def solve(input: SolverInput, *, allow_guess: bool = False, return_segmentation:
             "csp_flags": len(manager.flag_cells - reducer_flags),
             "zones": len(manager.segmentation.zones) if manager.segmentation else 0,
             "components": len(manager.segmentation.components) if manager.segmentation else 0,
+            "stats": manager.stats,
         },
     )
 
@@ -11,6 +11,7 @@ from PIL import Image, ImageDraw
 # Note: Cache incrémentiel retiré - trop complexe pour le bénéfice actuel
 
 from src.config import CELL_SIZE, CELL_BORDER
+from src.lib.s0_interface.s07_overlay.painter import CellPainter, rect_pattern
 from src.lib.s3_storage.types import (
     ActiveRelevance,
     FrontierRelevance,
@@ -85,22 +86,16 @@ def render_combined_overlay(
         elif cell.solver_status == SolverStatus.TO_VISUALIZE:
             to_visualize.add(coord)
 
-    # 1. Overlay zones en mémoire
-    zone_overlay = Image.new("RGBA", base_image.size, (0, 0, 0, 0))
-    draw_zones = ImageDraw.Draw(zone_overlay)
-
+    # 1. Overlay zones en mémoire (une couche vectorisée par état)
     start_x, start_y, _, _ = bounds
+    painter = CellPainter(base_image.size, (-start_x * stride, -start_y * stride), stride)
+    fill_pattern = rect_pattern(stride, 1, 1, cell_size - 1, cell_size - 1)
+    outline_pattern = rect_pattern(stride, 0, 0, cell_size, cell_size, outline_only=True)
 
     def _draw_cells(coords, fill_color):
-        for x, y in coords:
-            px = (x - start_x) * stride
-            py = (y - start_y) * stride
-            draw_zones.rectangle(
-                [(px, py), (px + cell_size, py + cell_size)],
-                fill=fill_color,
-                outline=(255, 255, 255, 200),
-                width=1,
-            )
+        mask = painter.lattice_mask(coords)
+        painter.fill(mask, fill_pattern, fill_color)
+        painter.fill(mask, outline_pattern, (255, 255, 255, 200))
 
     _draw_cells(frontier_to_process, FRONTIER_TO_PROCESS_COLOR)
     _draw_cells(frontier_processed, FRONTIER_PROCESSED_COLOR)
@@ -110,7 +105,7 @@ def render_combined_overlay(
     _draw_cells(mine, MINE_COLOR)
     _draw_cells(to_visualize, TO_VISUALIZE_COLOR)
 
-    combined_img = Image.alpha_composite(base_image.convert("RGBA"), zone_overlay)
+    combined_img = painter.composite(base_image)
 
     # 2. Ajouter les actions du solver par-dessus (croix/ronds overlay_actions, sans fond de case)
     draw_actions = ImageDraw.Draw(combined_img)
@@ -6,9 +6,10 @@ import json
 from pathlib import Path
 from typing import Dict, Iterable, Tuple, Optional, TYPE_CHECKING
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageFont
 
 from src.config import CELL_SIZE, CELL_BORDER
+from src.lib.s0_interface.s07_overlay.painter import CellPainter, rect_pattern, text_sprite
 from src.lib.s3_storage.types import (
     Coord, LogicalCellState,
     ActiveRelevance,
@@ -71,11 +72,13 @@ def render_status_overlay(
     stride = stride or (CELL_SIZE + CELL_BORDER)
     cell_size = cell_size or CELL_SIZE
     
-    overlay = Image.new("RGBA", base_image.size, (0, 0, 0, 0))
-    draw = ImageDraw.Draw(overlay)
     font = _load_font(14)
 
     start_x, start_y, _, _ = bounds
+    painter = CellPainter(base_image.size, (-start_x * stride, -start_y * stride), stride)
+    # Rectangle ImageDraw [(px, py), (px + cell_size, py + cell_size)] : intérieur + contour 1px
+    fill_pattern = rect_pattern(stride, 1, 1, cell_size - 1, cell_size - 1)
+    outline_pattern = rect_pattern(stride, 0, 0, cell_size, cell_size, outline_only=True)
 
     # Classifier les cellules par état et niveau de focus
     # OPTIMISATION: Ne traiter que les cellules avec un statut pertinent
@@ -126,16 +129,11 @@ def render_status_overlay(
             mine.add(coord)
 
     def _draw_cells(coords: Iterable[Coord], fill_color: Tuple, label: str):
-        for x, y in coords:
-            px = (x - start_x) * stride
-            py = (y - start_y) * stride
-            draw.rectangle(
-                [(px, py), (px + cell_size, py + cell_size)],
-                fill=fill_color,
-                outline=(255, 255, 255, 200),
-                width=1,
-            )
-            draw.text((px + 3, py + 3), label, fill=(255, 255, 255, 255), font=font)
+        # Une couche vectorisée par état : fond, contour puis libellé (sprite)
+        mask = painter.lattice_mask(coords)
+        painter.fill(mask, fill_pattern, fill_color)
+        painter.fill(mask, outline_pattern, (255, 255, 255, 200))
+        painter.stamp(mask, text_sprite(label, font), (3, 3))
 
     # Libellés centrés sur les niveaux de focus (comme le legacy)
     _draw_cells(frontier_to_process, FRONTIER_TO_PROCESS_COLOR, "TP")  # TO_PROCESS
@@ -146,7 +144,7 @@ def render_status_overlay(
     _draw_cells(to_visualize, TO_VISUALIZE_COLOR, "V")
     _draw_cells(mine, MINE_COLOR, "M")
 
-    return Image.alpha_composite(base_image.convert("RGBA"), overlay)
+    return painter.composite(base_image)
 
 
 def render_and_save_status(
@@ -23,11 +23,7 @@ from .s4a_status_analyzer import StatusManager
 from .s4b_csp_solver.csp_manager import solve as _solve_internal
 from .s4d_post_solver_sweep import build_sweep_actions
 from src.lib.s3_storage.types import SolverStatus
-from .s4c_overlays import (
-    render_and_save_actions,
-    render_and_save_combined,
-    render_segmentation_overlay,
-)
+from src.lib.s0_browser.overlay_queue import submit_overlay
 
 if TYPE_CHECKING:
     from src.lib.s3_storage import StorageController
@@ -140,13 +136,21 @@ def solve(
     if final_upsert.cells:
         storage.apply_upsert(final_upsert)
     
-    # === OVERLAYS (si contexte fourni) ===
+    # === OVERLAYS (si contexte fourni, rendus par le worker overlay) ===
     if overlay_ctx and overlay_ctx.overlay_enabled and base_image:
+        # Renderers chargés seulement si les overlays sont activés (démarrage rapide)
+        from .s4c_overlays import (
+            render_and_save_actions,
+            render_and_save_combined,
+            render_segmentation_overlay,
+        )
+
         bounds = overlay_ctx.capture_bounds
         stride = overlay_ctx.capture_stride
         snapshot_for_overlay = runtime.get_snapshot()
         
-        render_and_save_actions(
+        submit_overlay(
+            render_and_save_actions,
             base_image=base_image.copy(),
             actions=solver_output.actions,
             export_ctx=overlay_ctx,
@@ -155,7 +159,8 @@ def solve(
             reducer_actions=solver_output.reducer_actions,
         )
 
-        render_and_save_combined(
+        submit_overlay(
+            render_and_save_combined,
             base_image=base_image.copy(),
             cells=snapshot_for_overlay,
             actions=solver_output.actions,
@@ -166,7 +171,8 @@ def solve(
         )
 
         if segmentation:
-            render_segmentation_overlay(
+            submit_overlay(
+                render_segmentation_overlay,
                 base_image=base_image.copy(),
                 segmentation=segmentation,
                 export_ctx=overlay_ctx,
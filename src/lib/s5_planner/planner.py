@@ -1,12 +1,11 @@
 """Planification et ordonnancement des actions."""
 
-import time
 from typing import List, Optional
 
 from src.lib.s0_coordinates import CoordinateConverter
 from src.lib.s0_coordinates.types import ScreenPoint
 from src.lib.s4_solver.types import SolverAction, ActionType
-from src.lib.s0_browser import click_left, click_right
+from src.lib.s0_browser import click_left, click_right, wait_render_settled
 from .types import PlannerInput, ExecutionPlan, PlannedAction
 
 def plan(
@@ -17,10 +16,12 @@ def plan(
 ) -> ExecutionPlan:
     """Convertit les actions solver en plan d'exécution et les exécute si le driver est fourni."""
     planned_actions: List[PlannedAction] = []
+    idle_saved = 0.0
     
     # --- 1. Définition des Scénarios ---
     
     def execute_and_track(action: SolverAction, priority: int) -> Optional[PlannedAction]:
+        nonlocal idle_saved
         rel_point = None
         if converter:
             try:
@@ -62,8 +63,8 @@ def plan(
                 try:
                     current_lives = extractor.get_game_info().lives
                     if current_lives < lives_before:
-                        print(f"[PLANNER] Explosion détectée ({lives_before} -> {current_lives}). Stabilisation 2s...")
-                        time.sleep(2)
+                        print(f"[PLANNER] Explosion détectée ({lives_before} -> {current_lives}). Stabilisation (max 2s)...")
+                        idle_saved += wait_render_settled(driver, max_wait=2.0).idle_saved
                 except Exception:
                     pass
         
@@ -149,12 +150,13 @@ def plan(
             print("[PLANNER] Auto-exploration désactivée - exploration bloquée")
         if not has_acted:
             print("[PLANNER] Auto-exploration désactivée - pas d'actions safe disponibles - pause requise")
-            return ExecutionPlan(actions=[], estimated_time=0.0, post_delay=0.0)
+            return ExecutionPlan(actions=[], estimated_time=0.0, post_delay=0.0, idle_saved=idle_saved)
         # On retourne les actions déjà exécutées (flags/safes) sans exploration
         return ExecutionPlan(
             actions=planned_actions,
             estimated_time=len(planned_actions) * 0.5,
-            post_delay=0.0
+            post_delay=0.0,
+            idle_saved=idle_saved,
         )
     
     if should_explore and input.snapshot:
@@ -219,8 +221,9 @@ def plan(
                 planned_actions.append(pa)
                 clicked_coords.add(exploration_action.coord)
                 
-                # Petit délai pour laisser le jeu réagir (et potentiellement mettre à jour le DOM lives)
-                time.sleep(0.15)
+                # Laisser le jeu réagir (et potentiellement mettre à jour le DOM lives)
+                if driver:
+                    idle_saved += wait_render_settled(driver, max_wait=0.15).idle_saved
             else:
                 break
 
@@ -228,6 +231,7 @@ def plan(
         actions=planned_actions,
         estimated_time=len(planned_actions) * 0.1,
         post_delay=0.0,
+        idle_saved=idle_saved,
     )
 
 
@@ -41,6 +41,7 @@ class ExecutionPlan:
     actions: List[PlannedAction]
     estimated_time: float = 0.0
     post_delay: float = 0.0
+    idle_saved: float = 0.0  # Temps économisé sur les délais fixes (détection de rendu)
     
     @property
     def action_count(self) -> int:
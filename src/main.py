@@ -1,13 +1,28 @@
 import argparse
 import sys
+import time
 from pathlib import Path
 
+_STARTED = time.perf_counter()
+
 ROOT = Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from src.bot_1000mines import Minesweeper1000Bot
-from src.config import DIFFICULTY_CONFIG
+from src.config import DIFFICULTY_CONFIG, DEFAULT_DIFFICULTY
+from src.startup_profile import startup_profile
+
+# Ordre d'import mesuré par --profile-startup (coût incrémental de chaque étage)
+_PROFILED_MODULES = (
+    "numpy",
+    "PIL.Image",
+    "src.lib.s3_storage",
+    "src.lib.s2_vision",
+    "src.lib.s4_solver",
+    "src.lib.s5_planner",
+    "src.services",
+    "src.bot_1000mines",
+)
 
 
 def main() -> None:
@@ -39,21 +54,121 @@ def main() -> None:
         default=0.2,
         help="Délai entre itérations (secondes) pour laisser les animations/DOM se stabiliser",
     )
+    parser.add_argument(
+        "--simulate",
+        action="store_true",
+        help="Jouer sur le plateau simulé hors-ligne (aucun navigateur) et mesurer les cases/s",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Graine du plateau simulé (avec --simulate)",
+    )
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help="Enregistrer chaque partie (captures + deltas storage + actions) dans temp/games/<id>/recording.zip",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="ARCHIVE",
+        help="Rejouer une archive enregistrée (vision → storage → solver, sans navigateur) et afficher les temps",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="GAME_ID",
+        help="Reprendre une partie interrompue depuis temp/games/<GAME_ID>/grid_state.db, si la page la montre encore",
+    )
+    parser.add_argument(
+        "--browser-pool",
+        action="store_true",
+        help="Navigateur headless pré-chauffé (page chargée, surcouche injectée) démarré pendant l'initialisation",
+    )
+    parser.add_argument(
+        "--sessions",
+        type=int,
+        default=1,
+        help="Nombre de parties jouées en parallèle (un processus par session, graines consécutives en simulation)",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Afficher les temps d'import et d'initialisation jusqu'à la première itération",
+    )
     args = parser.parse_args()
 
+    if args.profile_startup:
+        startup_profile.enable(origin=_STARTED)
+        startup_profile.import_modules(_PROFILED_MODULES)
+
+    if args.replay:
+        from src.services import replay_recording
+        replay_recording(Path(args.replay))
+        return
+
+    if args.sessions > 1:
+        if args.resume:
+            parser.error("--resume reprend une seule partie : incompatible avec --sessions > 1")
+        from src.services import build_specs, run_sessions
+        specs = build_specs(
+            args.sessions,
+            simulate=args.simulate,
+            difficulty=args.difficulty or DEFAULT_DIFFICULTY,
+            seed=args.seed,
+            max_iterations=args.max_iterations,
+            delay=args.delay,
+            pooled=args.browser_pool,
+            record=args.record,
+            overlay=args.overlay,
+        )
+        report = run_sessions(specs)
+        failed = [metrics.index for metrics in report.sessions if metrics.error]
+        print("[FIN] Succès" if not failed else f"[FIN] Échec (sessions {failed})")
+        return
+
+    if args.browser_pool and not args.simulate:
+        from src.services import prewarm_browsers
+        prewarm_browsers(args.difficulty or DEFAULT_DIFFICULTY)  # Chrome démarre pendant les imports restants
+
+    from src.bot_1000mines import Minesweeper1000Bot
+
     bot = Minesweeper1000Bot()
+    if args.simulate:
+        result = bot.run_simulation(
+            args.difficulty or DEFAULT_DIFFICULTY,
+            seed=args.seed,
+            max_iterations=args.max_iterations,
+            record=args.record,
+            overlay_enabled=args.overlay,
+            resume=args.resume,
+        )
+        bot.cleanup()
+        _print_startup_profile()
+        print("[FIN] Succès" if result.get("success") else "[FIN] Échec")
+        return
+
     success = bot.run_minimal_pipeline(
-        args.difficulty,
+        args.difficulty or DEFAULT_DIFFICULTY,
         overlay_enabled=args.overlay,
         max_iterations=args.max_iterations,
         delay_between_iterations=args.delay,
+        record=args.record,
+        resume=args.resume,
+        pooled=args.browser_pool,
     )
 
     bot.cleanup()
+    _print_startup_profile()
 
     print("[FIN] Succès" if success else "[FIN] Échec")
 
 
+def _print_startup_profile() -> None:
+    if startup_profile.enabled:
+        print(startup_profile.report())
+
+
 if __name__ == "__main__":
     try:
         main()
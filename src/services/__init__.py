@@ -1,15 +1,39 @@
 """Services du bot 1000mines."""
 
-from .s0_session_service import Session, create_session, close_session, get_current_session, restart_game
+from .s0_session_service import (
+    Session,
+    create_session,
+    create_simulated_session,
+    close_session,
+    get_current_session,
+    restart_game,
+    get_browser_pool,
+    prewarm_browsers,
+)
 from .s9_game_loop import run_iteration, run_game, IterationResult
+from .s9_game_recorder import GameRecorder, ReplayReport, replay_recording
+from .s9_progress_tracker import ProgressSample, ProgressTracker
+from .s9_orchestrator import SessionSpec, OrchestratorReport, build_specs, run_sessions
 
 __all__ = [
     "Session",
     "create_session",
+    "create_simulated_session",
     "close_session",
     "get_current_session",
     "restart_game",
+    "get_browser_pool",
+    "prewarm_browsers",
     "run_iteration",
     "run_game",
     "IterationResult",
+    "GameRecorder",
+    "ReplayReport",
+    "replay_recording",
+    "ProgressSample",
+    "ProgressTracker",
+    "SessionSpec",
+    "OrchestratorReport",
+    "build_specs",
+    "run_sessions",
 ]
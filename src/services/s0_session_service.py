@@ -1,20 +1,30 @@
-"""Service de session : initialisation et nettoyage."""
+"""Service de session : initialisation et nettoyage.
 
-from __future__ import annotations
+Selenium, le simulateur, le pool et le client DevTools ne sont importés que
+par les fonctions qui s'en servent : importer le service (simulateur, replay)
+ne charge pas Selenium.
+"""
 
-from dataclasses import dataclass
-from typing import Optional
+from __future__ import annotations
 
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import atexit
+import random
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
 
 from src.lib.s0_browser import BrowserConfig, BrowserHandle, start_browser, stop_browser, navigate_to
 from src.lib.s0_browser.game_info import GameInfoExtractor
 from src.lib.s0_coordinates import CoordinateConverter, ViewportMapper, CanvasLocator
+from src.lib.s1_capture import FrameBuffer
+from src.lib.s2_vision import TileVision
 from src.lib.s3_storage import StorageController
 from src.lib.s0_interface.s07_overlay import get_ui_controller, UIController
-from src.config import DIFFICULTY_CONFIG
+from src.config import DEVTOOLS_CONFIG, DIFFICULTY_CONFIG
+from src.startup_profile import startup_profile
+
+if TYPE_CHECKING:
+    from src.lib.s0_browser.devtools import AsyncBrowserClient
+    from src.lib.s0_browser.pool import BrowserPool, PooledBrowser
 
 
 @dataclass
@@ -33,6 +43,13 @@ class Session:
     exploration_start_lives: int = 0
     last_state: Optional[int] = None
     same_state_count: int = 0
+    auto_exploration: bool = False  # Valeur par défaut quand aucune UI ne la pilote
+    name: Optional[str] = None  # Sessions parallèles (orchestrateur) : suffixe des game_id
+    pooled: Optional[PooledBrowser] = None  # Navigateur prêté par le pool (rendu à la fermeture)
+    io: Optional[AsyncBrowserClient] = None  # Client asynchrone (DevTools) : requêtes concurrentes par itération
+    tile_vision: TileVision = field(default_factory=TileVision)  # Vision par tuiles : tuiles de la passe précédente
+    frame_buffer: FrameBuffer = field(default_factory=FrameBuffer)  # Tampon du composite, propre à la session
+    resume_from: Optional[str] = None  # game_id dont la grille est reprise à la première passe vision (si elle concorde)
 
     @property
     def driver(self):
@@ -42,24 +59,19 @@ class Session:
 _current_session: Optional[Session] = None
 
 
-def create_session(
-    difficulty: str = "impossible",
-    headless: bool = False,
-) -> Session:
-    """Crée une nouvelle session de jeu."""
-    global _current_session
-    
-    # 1. Démarrer le navigateur
-    config = BrowserConfig(headless=headless)
-    browser = start_browser(config)
-    
-    # 2. Naviguer vers le jeu
+def _open_game_page(browser: BrowserHandle, difficulty: str) -> None:
+    """Charge la page du jeu en mode Infinite et sélectionne la difficulté."""
+    from selenium.webdriver.common.by import By  # Import différé : inutile en simulation
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
     url = f"https://1000mines.com/?level={difficulty}"
-    navigate_to(browser, url)
+    with startup_profile.phase("navigation"):
+        navigate_to(browser, url)
     driver = browser.driver
     wait = WebDriverWait(driver, 10)
 
-    # 2.0 Sélectionner systématiquement le mode Infinite (mode de jeu) comme dans le legacy
+    # Sélectionner systématiquement le mode Infinite (mode de jeu) comme dans le legacy
     try:
         wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "a[href='/#infinite']")))
         infinite_button = wait.until(
@@ -70,7 +82,7 @@ def create_session(
     except Exception as e:
         print(f"[AVERTISSEMENT] Impossible de sélectionner le mode Infinite: {e}")
 
-    # 2.1 Sélectionner la difficulté via Selenium (avec fallback JS)
+    # Sélectionner la difficulté via Selenium (avec fallback JS)
     selenium_id = DIFFICULTY_CONFIG.get(difficulty, {}).get("selenium_id")
     if selenium_id:
         try:
@@ -84,6 +96,92 @@ def create_session(
                 print(f"   - Difficulté {difficulty} sélectionnée via JS")
             except Exception as e_js:
                 print(f"   - Erreur lors de la sélection de la difficulté: {e_js}")
+
+
+def _click_restart(driver) -> None:
+    """Clique sur le bouton restart du jeu (bouton enfant, sinon le host lui-même)."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    restart_host = WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, "#ctl-restart-host"))
+    )
+    driver.execute_script(
+        """
+const host = arguments[0];
+const btn = host.querySelector('button') || host;
+btn.scrollIntoView({block: 'center', inline: 'center'});
+btn.click();
+btn.dispatchEvent(new MouseEvent('click', {bubbles: true, cancelable: true, view: window}));
+""",
+        restart_host,
+    )
+
+
+# ----------------------------------------------------------------------
+# Pool de navigateurs pré-chauffés
+# ----------------------------------------------------------------------
+
+_browser_pool: Optional[BrowserPool] = None
+
+
+def _warm_browser(browser: BrowserHandle, difficulty: str) -> bool:
+    """
+    Préparation d'une instance du pool : page du jeu + surcouche UI pré-injectée.
+
+    Appelée depuis le thread de remplissage du pool : contrôleur propre à
+    l'instance, le singleton reste à la game loop.
+    """
+    _open_game_page(browser, difficulty)
+    return UIController().install(browser.driver)
+
+
+def _reset_browser(browser: BrowserHandle) -> bool:
+    """Nouvelle partie dans la page : restart du jeu et surcouche vidée (pas de relance)."""
+    _click_restart(browser.driver)
+    browser.driver.execute_script("if (window.BotUI) window.BotUI.reset();")
+    return True
+
+
+def get_browser_pool() -> BrowserPool:
+    """Retourne le pool global (créé à la première utilisation, fermé à la sortie)."""
+    global _browser_pool
+    if _browser_pool is None:
+        from src.lib.s0_browser.pool import BrowserPool
+
+        _browser_pool = BrowserPool(warmup=_warm_browser, reset=_reset_browser)
+        atexit.register(_browser_pool.shutdown)
+    return _browser_pool
+
+
+def prewarm_browsers(difficulty: str = "impossible") -> None:
+    """Lance la préparation des navigateurs en arrière-plan (avant la création de session)."""
+    get_browser_pool().prefill(difficulty)
+
+
+def create_session(
+    difficulty: str = "impossible",
+    headless: bool = False,
+    pooled: bool = False,
+) -> Session:
+    """
+    Crée une nouvelle session de jeu.
+
+    `pooled` : navigateur headless pris dans le pool (page chargée, surcouche
+    déjà injectée) et rendu au pool à la fermeture au lieu d'être arrêté.
+    """
+    global _current_session
+
+    # 1-2. Navigateur sur la page du jeu
+    lease = None
+    if pooled:
+        lease = get_browser_pool().acquire(difficulty)
+        browser = lease.handle
+        print(f"[SESSION] Navigateur pré-chauffé du pool ({lease.games} session(s) déjà jouée(s))")
+    else:
+        browser = start_browser(BrowserConfig(headless=headless))
+        _open_game_page(browser, difficulty)
     
     # 3. Initialiser les composants
     converter = CoordinateConverter()
@@ -96,7 +194,8 @@ def create_session(
     extractor = GameInfoExtractor(driver=browser.driver)
     
     # 4. Créer la session
-    ui_ctrl = get_ui_controller()
+    # Navigateur du pool : contrôleur propre à la session (sessions du pool concurrentes)
+    ui_ctrl = UIController() if pooled else get_ui_controller()
     
     session = Session(
         browser=browser,
@@ -107,10 +206,14 @@ def create_session(
         extractor=extractor,
         ui_controller=ui_ctrl,
         difficulty=difficulty,
+        pooled=lease,
+        io=_open_session_client(browser.driver),
     )
     
-    # 5. Injecter l'UI temps réel
-    if ui_ctrl.inject(browser.driver):
+    # 5. Injecter l'UI temps réel (reprise simple si le pool l'a déjà injectée)
+    with startup_profile.phase("injection UI"):
+        injected = ui_ctrl.adopt(browser.driver) if pooled else ui_ctrl.inject(browser.driver)
+    if injected:
         print("[SESSION] UI temps réel injectée")
     
     _current_session = session
@@ -118,12 +221,80 @@ def create_session(
     return session
 
 
+def _open_session_client(driver) -> Optional[AsyncBrowserClient]:
+    """
+    Client DevTools d'une session navigateur ; None si désactivé
+    (`DEVTOOLS_CONFIG['session_client']`) ou injoignable : la game loop
+    capture alors par `capture_all_canvases`.
+    """
+    if not DEVTOOLS_CONFIG['session_client']:
+        return None
+    from src.lib.s0_browser.devtools import open_browser_client
+
+    try:
+        client = open_browser_client(driver, fallback=False)
+    except Exception as e:
+        print(f"[SESSION] Erreur client DevTools: {e}")
+        client = None
+    if client is None:
+        print("[SESSION] Client DevTools indisponible : capture synchrone")
+    return client
+
+
+def create_simulated_session(
+    difficulty: str = "impossible",
+    seed: int = 0,
+) -> Session:
+    """Crée une session sur le plateau simulé (aucun navigateur, pas d'UI)."""
+    from src.lib.s0_browser.devtools import LocalBrowserClient
+    from src.lib.s0_simulator import SimulatedDriver, SimulatorConfig
+
+    global _current_session
+
+    # Les choix aléatoires du planner (exploration) doivent aussi être reproductibles
+    random.seed(seed)
+
+    with startup_profile.phase("plateau simulé"):
+        driver = SimulatedDriver(SimulatorConfig(seed=seed, difficulty=difficulty))
+    browser = BrowserHandle(driver=driver)
+
+    converter = CoordinateConverter()
+    converter.set_driver(driver)
+    converter.setup_anchor()
+
+    session = Session(
+        browser=browser,
+        storage=StorageController(),
+        converter=converter,
+        viewport=ViewportMapper(converter, driver),
+        canvas_locator=CanvasLocator(driver=driver),
+        extractor=GameInfoExtractor(driver=driver),
+        ui_controller=None,
+        difficulty=difficulty,
+        auto_exploration=True,
+        io=LocalBrowserClient(driver),
+    )
+
+    _current_session = session
+    print(f"[SESSION] Session simulée créée (difficulté: {difficulty}, seed: {seed})")
+    return session
+
+
 def close_session(session: Optional[Session] = None) -> None:
     """Ferme une session proprement."""
     global _current_session
     
     session = session or _current_session
-    if session and session.browser:
+    if session:
+        session.storage.detach_database()
+        if session.io:
+            session.io.close()
+            session.io = None
+    if session and session.pooled:
+        get_browser_pool().release(session.pooled)
+        session.pooled = None
+        print("[SESSION] Session fermée (navigateur rendu au pool)")
+    elif session and session.browser:
         stop_browser(session.browser)
         print("[SESSION] Session fermée")
     
@@ -138,25 +309,13 @@ def get_current_session() -> Optional[Session]:
 
 def restart_game(session: Session) -> None:
     """Clique sur le bouton restart du jeu et réinitialise le storage."""
-    driver = session.driver
-    wait = WebDriverWait(driver, 10)
     try:
-        restart_host = wait.until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "#ctl-restart-host"))
-        )
-        # Essayer d'abord le bouton enfant, sinon le host lui-même
-        driver.execute_script(
-            """
-const host = arguments[0];
-const btn = host.querySelector('button') || host;
-btn.scrollIntoView({block: 'center', inline: 'center'});
-btn.click();
-btn.dispatchEvent(new MouseEvent('click', {bubbles: true, cancelable: true, view: window}));
-""",
-            restart_host,
-        )
+        _click_restart(session.driver)
         print("[SESSION] Restart du jeu via JS sur ctl-restart-host")
     except Exception as e:
         print(f"[AVERTISSEMENT] Impossible de cliquer sur le bouton restart: {e}")
-    # Reset du storage pour la nouvelle partie
+    if session.ui_controller:
+        session.ui_controller.reset(session.driver)  # Statuts de l'ancienne partie effacés de la surcouche
+    # Reset du storage pour la nouvelle partie (la base de l'ancienne partie est fermée)
+    session.storage.detach_database()
     session.storage = StorageController()
@@ -12,23 +12,53 @@ from __future__ import annotations
 
 import time
 from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from datetime import datetime
+from typing import Callable, Dict, Any, Optional
 from pathlib import Path
-from selenium.common.exceptions import StaleElementReferenceException
 
-from src.lib.s1_capture import capture_all_canvases
-from src.lib.s2_vision import analyze_image, VisionOverlay, vision_result_to_matches
-from src.lib.s3_storage import LogicalCellState, SolverStatus
+from src.lib.s1_capture import capture_all_canvases, capture_all_canvases_async
+from src.lib.s2_vision import analyze_image, analyze_tiles
+from src.lib.s3_storage import GridDatabase
 from src.lib.s4_solver import solve
 from src.lib.s5_planner import plan, PlannerInput
 from src.lib.s0_browser.export_context import ExportContext
-from src.lib.s0_interface.s07_overlay import StatusCellData, ActionCellData
+from src.lib.s0_browser.render_settle import wait_render_settled
+from src.lib.s0_browser.overlay_queue import submit_overlay
+from src.lib.s0_interface.s07_overlay import StatusCellData, ActionCellData, ControlState
 from .s0_session_service import restart_game
-from src.config import CELL_SIZE, CELL_BORDER
+from .s9_game_recorder import GameRecorder
+from .s9_progress_tracker import ProgressSample, ProgressTracker
+from src.startup_profile import startup_profile
+from src.config import (
+    CELL_SIZE,
+    CELL_BORDER,
+    GRID_DB_CONFIG,
+    STORAGE_EVICTION_CONFIG,
+    UI_OVERLAY_CONFIG,
+    VISION_CONFIG,
+    get_game_paths,
+)
 
 from .s0_session_service import Session
 
 
+def _overlay_visible_bounds(session: Session):
+    """Zone visible (min_col, min_row, max_col, max_row) élargie de la marge, None si inconnue."""
+    try:
+        grid_bounds = session.viewport.get_visible_grid_bounds()
+    except Exception:
+        return None
+    if grid_bounds is None:
+        return None
+    margin = UI_OVERLAY_CONFIG['viewport_margin']
+    return (
+        grid_bounds.min_col - margin,
+        grid_bounds.min_row - margin,
+        grid_bounds.max_col + margin,
+        grid_bounds.max_row + margin,
+    )
+
+
 def _update_ui_overlay(session: Session, bounds, solver_output, snapshot_override=None) -> None:
     """Met à jour les overlays UI temps réel avec les données du solver.
     
@@ -47,10 +77,23 @@ def _update_ui_overlay(session: Session, bounds, solver_output, snapshot_overrid
         else:
             snapshot = session.storage.get_snapshot()  # Fallback si pas disponible
         
+        # Culling viewport : l'index spatial ne renvoie que les cellules de la zone visible
+        ui = session.ui_controller
+        if ui.visible_bounds is not None:
+            ui.spatial_index.follow(session.storage)
+            coords = ui.spatial_index.query(ui.visible_bounds)
+        else:
+            coords = snapshot.keys()
+
         # Convertir snapshot en StatusCellData (filtrer seulement ACTIVE/FRONTIER/TO_VISUALIZE)
         # Les coordonnées doivent être ABSOLUES (grille globale) car le canvas est ancré sur #anchor
         status_cells = []
-        for (col, row), cell in snapshot.items():
+        for col, row in coords:
+            cell = snapshot.get((col, row))
+            if cell is None:
+                cell = session.storage.get_cell((col, row))  # Cellule évincée : état lu dans sa région froide
+            if cell is None:
+                continue
             status = cell.solver_status.name if hasattr(cell.solver_status, 'name') else str(cell.solver_status)
             if status in ('ACTIVE', 'FRONTIER', 'TO_VISUALIZE', 'JUST_VISUALIZED', 'MINE', 'SOLVED'):
                 # Déterminer le focus_level à envoyer
@@ -100,8 +143,13 @@ def run_iteration(
     session: Session,
     iteration: int = 0,
     export_ctx: Optional[ExportContext] = None,
+    recorder: Optional[GameRecorder] = None,
+    control: Optional[ControlState] = None,
 ) -> IterationResult:
-    """Exécute une itération du pipeline (appels séquentiels aux modules)."""
+    """
+    Exécute une itération du pipeline (appels séquentiels aux modules).
+    `control` : état de contrôle UI déjà vidé de la page par l'appelant (auto-exploration).
+    """
     start_time = time.time()
     
     if export_ctx:
@@ -112,17 +160,30 @@ def run_iteration(
 
     try:
         # 1. CAPTURE (boîte noire)
-        capture_result = capture_all_canvases(
-            session.driver,
-            save=bool(export_ctx and export_ctx.overlay_enabled),
-            save_dir=str(export_ctx.get_capture_dir()) if export_ctx and export_ctx.overlay_enabled else None,
-            game_id=session.game_id,
-        )
+        game_info = None
+        if session.io:
+            # Tuiles et infos de jeu demandées ensemble : un seul temps d'aller-retour
+            capture_result, game_info = session.io.gather(
+                capture_all_canvases_async(
+                    session.driver, session.io, game_id=session.game_id, frame_buffer=session.frame_buffer
+                ),
+                session.extractor.get_game_info_async(session.io),
+            )
+        else:
+            capture_result = capture_all_canvases(
+                session.driver,
+                save=bool(export_ctx and export_ctx.overlay_enabled),
+                save_dir=str(export_ctx.get_capture_dir()) if export_ctx and export_ctx.overlay_enabled else None,
+                game_id=session.game_id,
+                frame_buffer=session.frame_buffer,
+            )
         print(f"[CAPTURE] {capture_result.canvas_count} canvas")
 
         # --- 2. VISION ---
         bounds = capture_result.metadata.get("grid_bounds") or capture_result.grid_bounds
-        known_set = session.storage.get_known()
+        known_mask = session.storage.get_known_mask(bounds)
+        if recorder:
+            recorder.begin_iteration(session.storage)
         
         # Propager les métadonnées de capture pour les overlays (solver/vision)
         if export_ctx:
@@ -130,20 +191,37 @@ def run_iteration(
             export_ctx.capture_stride = CELL_SIZE + CELL_BORDER
             export_ctx.capture_path = getattr(capture_result, "composite_path", None)
 
-        vision_result = analyze_image(
-            capture_result.composite_image,
-            bounds=bounds,
-            cell_size=CELL_SIZE,
-            known_set=known_set or None,
-        )
+        if VISION_CONFIG['tile_native']:
+            tracker = session.tile_vision
+            if tracker.source is not session.storage:
+                # Nouveau storage (restart) : les tuiles déjà vues ne valent plus, passe complète
+                tracker.source = session.storage
+                tracker.reset()
+            vision_result = analyze_tiles(
+                capture_result.tiles,
+                bounds=bounds,
+                known_mask=known_mask,
+                tracker=tracker,
+                changed_only=VISION_CONFIG['changed_tiles_only'],
+            )
+        else:
+            # Tableau du composite (vue sur le tampon) : l'image PIL ne sert qu'aux overlays et à l'enregistrement
+            vision_result = analyze_image(
+                capture_result.composite_array,
+                bounds=bounds,
+                cell_size=CELL_SIZE,
+                known_mask=known_mask,
+            )
         print(f"[VISION] {vision_result.cell_count} cellules")
         
         # 2.5. Overlay vision (si activé)
         if export_ctx and export_ctx.overlay_enabled and capture_result.composite_image:
+            from src.lib.s2_vision import render_and_save_vision_overlay, vision_result_to_matches
+
             stride = CELL_SIZE + CELL_BORDER
-            vision_overlay = VisionOverlay()
             matches_dict = vision_result_to_matches(vision_result)
-            vision_overlay.render_and_save(
+            submit_overlay(
+                render_and_save_vision_overlay,
                 base_image=capture_result.composite_image,
                 matches=matches_dict,
                 export_ctx=export_ctx,
@@ -152,7 +230,10 @@ def run_iteration(
             )
 
         # --- 3. STORAGE ---
+        if session.resume_from:
+            _resume_grid(session, vision_result)
         symbol_counts = session.storage.update_from_vision(vision_result)
+        session.tile_vision.commit()  # Tuiles de référence : seulement une fois le résultat pris par le storage
         unrevealed = symbol_counts.get('unrevealed', 0)
         revealed = sum(v for k, v in symbol_counts.items() if k != 'unrevealed')
         print(f"[STORAGE] unrevealed={unrevealed}, revealed={revealed}")
@@ -161,21 +242,30 @@ def run_iteration(
         solver_output = solve(
             session.storage,
             overlay_ctx=export_ctx,
-            base_image=capture_result.composite_image,
+            # Composite assemblé seulement pour les overlays
+            base_image=capture_result.composite_image if export_ctx and export_ctx.overlay_enabled else None,
         )
         print(f"[SOLVER] {len(solver_output.actions)} actions")
+        if recorder:
+            recorder.record_iteration(
+                iteration,
+                capture_result.composite_bytes,
+                bounds,
+                session.storage,
+                solver_output,
+            )
         
         # --- 4.5. UI OVERLAY (temps réel - progression 3 étapes) ---
+        # Chaque étape n'envoie que le delta depuis la précédente (protocole versionné)
         if session.ui_controller:
+            session.ui_controller.set_visible_bounds(_overlay_visible_bounds(session))
             # Étape 1: État brut avant solver (status_1.png)
             if solver_output.snapshot_pre_solver:
                 _update_ui_overlay(session, bounds, solver_output, snapshot_override=solver_output.snapshot_pre_solver)
-                time.sleep(0.15)  # Délai pour visualiser
             
             # Étape 2: Après StatusAnalyzer, avant CSP (status_2.png)
             if solver_output.snapshot_post_pipeline1:
                 _update_ui_overlay(session, bounds, solver_output, snapshot_override=solver_output.snapshot_post_pipeline1)
-                time.sleep(0.15)  # Délai pour visualiser
             
             # Étape 3: Après CSP, état final (status_3.png)
             if solver_output.snapshot_post_solver:
@@ -184,8 +274,9 @@ def run_iteration(
                 _update_ui_overlay(session, bounds, solver_output)  # Fallback classique
 
         # --- 5. PLANNER ---
-        # 5.1 Extraction des infos de jeu (score, vies) pour la boucle
-        game_info = session.extractor.get_game_info()
+        # 5.1 Infos de jeu (score, vies) : déjà lues avec la capture si le client asynchrone est actif
+        if game_info is None:
+            game_info = session.extractor.get_game_info()
         print(f"[GAME INFO] Score: {game_info.score}, Lives: {game_info.lives}")
 
         # 5.2 Gestion de l'état d'exploration
@@ -208,12 +299,10 @@ def run_iteration(
 
         # Détection état bloqué (stuck) -> Force exploration
         force_exploration = False
-        snapshot = session.storage.get_snapshot()
-        if snapshot:
-            # On considère comme progrès : les cellules révélées ET les drapeaux
-            revealed_count = sum(1 for c in snapshot.values() if c.logical_state != LogicalCellState.UNREVEALED)
-            flag_count = sum(1 for c in snapshot.values() if c.logical_state == LogicalCellState.UNREVEALED and c.solver_status == SolverStatus.MINE)
-            current_state = revealed_count + flag_count
+        counters = session.storage.get_counters()
+        if counters.cells:
+            # On considère comme progrès : les cellules révélées ET les drapeaux (compteurs O(1) du storage)
+            current_state = counters.progress
             
             if session.last_state == current_state:
                 session.same_state_count += 1
@@ -234,14 +323,10 @@ def run_iteration(
                 metadata={"game_over": True}
             )
 
-        # 5.3 Lecture de l'état de contrôle UI
-        auto_exploration = False  # Valeur par défaut : désactivé
-        if session.ui_controller:
-            try:
-                control_state = session.ui_controller.get_control_state(session.driver)
-                auto_exploration = control_state.auto_exploration
-            except Exception as e:
-                print(f"[UI] Erreur lecture control state: {e}")
+        # 5.3 État de contrôle UI (lu par run_game en début d'itération)
+        auto_exploration = session.auto_exploration  # Valeur par défaut (désactivé sauf simulateur)
+        if control is not None:
+            auto_exploration = control.auto_exploration
 
         execution_plan = plan(
             input=PlannerInput(
@@ -309,6 +394,7 @@ def run_iteration(
             metadata={
                 "vision_count": vision_result.cell_count,
                 "solver_actions": len(solver_output.actions),
+                "idle_saved": execution_plan.idle_saved,
             },
         )
 
@@ -326,16 +412,71 @@ def run_iteration(
         )
 
 
+def _attach_grid_database(session: Session) -> None:
+    """Branche la base de grille de la partie (reprise si le fichier existe déjà)."""
+    if session.storage.database is not None:
+        return
+    try:
+        session.storage.attach_database(GridDatabase.for_game(session.game_id))
+    except Exception as e:
+        print(f"[GRID_DB] Base de grille indisponible, partie non persistée: {e}")
+
+
+def _resume_grid(session: Session, vision_result) -> None:
+    """Reprise (--resume) : recharge la grille de la partie interrompue si la page la montre encore."""
+    game_id, session.resume_from = session.resume_from, None
+    path = Path(get_game_paths(game_id)['grid_db'])
+    if not path.exists():
+        print(f"[GRID_DB] Reprise impossible : {path} introuvable")
+        return
+    try:
+        database = GridDatabase(path)
+    except Exception as e:
+        print(f"[GRID_DB] Reprise impossible : {e}")
+        return
+    try:
+        session.storage.resume_from(database, vision_result)
+    finally:
+        database.close()
+
+
 def run_game(
     session: Session,
     max_iterations: int = 500,
     delay: float = 1,
     overlay_enabled: bool = False,
+    max_games: Optional[int] = None,
+    record: bool = False,
+    on_progress: Optional[Callable[[ProgressSample], None]] = None,
 ) -> Dict[str, Any]:
-    """Exécute la boucle de jeu complète, avec contrôles UI (pause/restart)."""
+    """
+    Exécute la boucle de jeu complète, avec contrôles UI (pause/restart).
+    `max_games` : arrêt sans interaction après N parties (simulateur, benchmarks).
+    `record` : enregistre chaque partie dans temp/games/<game_id>/recording.zip (rejouable).
+    La grille est persistée dans temp/games/<game_id>/grid_state.db. Reprise :
+    `session.resume_from` (game_id interrompu) recharge sa base à la première
+    passe vision si la page montre encore cette partie ; la partie reprise
+    écrit sous un nouveau game_id (l'ancien dossier reste intact).
+    `on_progress` : reçoit chaque échantillon de progression (agrégation par l'orchestrateur).
+    """
+    games_played = 0
     while True:
         total_actions = 0
         iterations = 0
+        total_idle_saved = 0.0
+        progress = ProgressTracker()
+
+        # Identifiant de partie partagé (overlays, enregistrement, base de grille)
+        if session.game_id is None:
+            session.game_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+            if session.name:
+                session.game_id += f"_{session.name}"
+        game_id = session.game_id  # Conservé : un restart depuis l'UI remet session.game_id à None avant l'export
+        if GRID_DB_CONFIG['enabled']:
+            _attach_grid_database(session)
+        sample = progress.sample(session.storage.get_counters(), iteration=-1)  # Point de départ
+        if on_progress:
+            on_progress(sample)
         
         export_ctx = None
         if overlay_enabled:
@@ -345,63 +486,93 @@ def run_game(
             )
             print(f"[OVERLAY] Export: {export_ctx.export_root}")
         
-        for i in range(max_iterations):
-            # Vérifier si restart demandé via UI
-            if session.ui_controller and session.ui_controller.is_restart_requested(session.driver):
-                print("[BOT] Restart demandé via UI, nouvelle partie...")
-                restart_game(session)
-                session.game_id = None
-                break  # Sortir de la boucle d'itérations pour restart
-            
-            # Vérifier si redémarrage manuel détecté (clic bouton restart/difficulté)
-            if session.ui_controller and session.ui_controller.is_manual_restart_requested(session.driver):
-                print("[BOT] Redémarrage manuel détecté! Nouvelle partie...")
-                # Redémarrer complètement la partie
-                restart_game(session)
-                session.game_id = None
-                break  # Sortir de la boucle d'itérations pour restart
-            
-            # Vérifier si bot en pause via UI
-            if session.ui_controller:
-                while not session.ui_controller.is_bot_running(session.driver):
-                    time.sleep(0.5)  # Attendre que le bot soit relancé
-                    # Vérifier restart pendant la pause
-                    if session.ui_controller.is_restart_requested(session.driver):
-                        print("[BOT] Restart demandé pendant pause, nouvelle partie...")
-                        restart_game(session)
-                        session.game_id = None
-                        break
-                    # Vérifier redémarrage manuel pendant la pause
-                    if session.ui_controller.is_manual_restart_requested(session.driver):
-                        print("[BOT] Redémarrage manuel détecté pendant pause!")
-                        # Redémarrer complètement la partie
+        recorder = None
+        if record:
+            recorder = GameRecorder.for_game(
+                export_ctx.game_id if export_ctx else session.game_id,
+                difficulty=session.difficulty,
+            )
+        
+        try:
+            for i in range(max_iterations):
+                # Contrôles UI : un seul aller-retour vide la file d'événements de la page
+                control = None
+                if session.ui_controller:
+                    control = session.ui_controller.poll_control(session.driver)
+                    # Pause : attente bloquante jusqu'au prochain événement (plus de sondage toutes les 0,5 s)
+                    while not control.bot_running and not (control.restart_requested or control.manual_restart):
+                        control = session.ui_controller.poll_control(
+                            session.driver, wait=UI_OVERLAY_CONFIG['control_wait']
+                        )
+                    if control.restart_requested or control.manual_restart:
+                        source = "demandé via UI" if control.restart_requested else "manuel détecté"
+                        print(f"[BOT] Redémarrage {source}, nouvelle partie...")
                         restart_game(session)
                         session.game_id = None
-                        break  # Sortir de la boucle de pause et d'itérations
+                        break  # Sortir de la boucle d'itérations pour restart
             
-            iterations += 1
-            print(f"\n{'='*80}")
-            print(f"ITÉRATION {i+1}")
-            print(f"{'='*80}")
+                iterations += 1
+                print(f"\n{'='*80}")
+                print(f"ITÉRATION {i+1}")
+                print(f"{'='*80}")
             
-            result = run_iteration(session, iteration=i, export_ctx=export_ctx)
-            total_actions += result.actions_executed
+                if games_played == 0 and i == 0:
+                    startup_profile.mark("première itération")
+                result = run_iteration(session, iteration=i, export_ctx=export_ctx, recorder=recorder, control=control)
+                total_actions += result.actions_executed
+                sample = progress.sample(session.storage.get_counters(), iteration=i)
+                print(f"[PROGRESS] {progress.summary()}")
+                if on_progress:
+                    on_progress(sample)
             
-            if not result.success:
-                if result.metadata.get("game_over"):
-                    break
-                if result.actions_executed > 0:
-                    print(f"[GAME] Attention itération {i+1} : erreurs partielles, mais {result.actions_executed} actions exécutées. Continuation.")
-                else:
-                    print(f"[GAME] Erreur itération {i+1}")
-                    break
+                if not result.success:
+                    if result.metadata.get("game_over"):
+                        break
+                    if result.actions_executed > 0:
+                        print(f"[GAME] Attention itération {i+1} : erreurs partielles, mais {result.actions_executed} actions exécutées. Continuation.")
+                    else:
+                        print(f"[GAME] Erreur itération {i+1}")
+                        break
             
-            if result.actions_executed == 0:
-                print(f"[GAME] Attention itération {i+1} : 0 actions exécutées.")
+                if result.actions_executed == 0:
+                    print(f"[GAME] Attention itération {i+1} : 0 actions exécutées.")
+
+                # Zones résolues loin de la frontière : hors des snapshots des prochaines itérations
+                if STORAGE_EVICTION_CONFIG['enabled'] and (i + 1) % STORAGE_EVICTION_CONFIG['interval'] == 0:
+                    session.storage.evict_cold_regions()
             
-            time.sleep(delay)
+                # Attente adaptative : on ne dort que le temps que le jeu finisse de redessiner
+                settle = wait_render_settled(session.driver, max_wait=delay)
+                result.metadata["settle_wait"] = settle.waited
+                result.metadata["idle_saved"] = result.metadata.get("idle_saved", 0.0) + settle.idle_saved
+                total_idle_saved += result.metadata["idle_saved"]
+        finally:
+            # Archive toujours finalisée (exception, Ctrl+C) : sans répertoire central elle serait illisible
+            if recorder:
+                recorder.close()
+
+        print(f"[GAME] {iterations} itérations, {total_actions} actions, {total_idle_saved:.2f}s d'attente économisées")
+        cells_per_second = progress.cells_per_second()
+        if progress.samples:
+            try:
+                progress_path = progress.save(Path(get_game_paths(game_id)['progress']))
+                print(f"[PROGRESS] Série exportée : {progress_path} ({cells_per_second:.1f} cellules/s)")
+            except Exception as e:
+                print(f"[PROGRESS] Erreur export série: {e}")
+        games_played += 1
+        session.storage.detach_database()
         
-        print(f"[GAME] {iterations} itérations, {total_actions} actions")
+        if max_games is not None and games_played >= max_games:
+            return {
+                "iterations": iterations,
+                "total_actions": total_actions,
+                "idle_saved": total_idle_saved,
+                "cells_per_second": cells_per_second,
+                "games_played": games_played,
+                "success": True,
+                "export_root": str(export_ctx.export_root) if export_ctx else None,
+                "restart": False,
+            }
         
         # Fin de partie : mettre le bot en pause et attendre l'utilisateur
         if session.ui_controller:
@@ -409,25 +580,16 @@ def run_game(
             session.ui_controller.set_bot_running(session.driver, False)
             print("[BOT] ⚡ Partie prête ! Appuyez sur Start (F5) pour commencer")
             
-            # Attendre que l'utilisateur relance via l'overlay
-            waiting_for_restart = True
-            while waiting_for_restart:
-                time.sleep(0.5)
-                
-                # Vérifier si auto-restart demandé (bouton "Start New Game" F6)
-                if session.ui_controller.is_auto_restart_requested(session.driver):
-                    print("[BOT] Auto-restart demandé via UI")
-                    restart_game(session)
-                    session.game_id = None
-                    waiting_for_restart = False
-                    break
-                
-                # Vérifier si redémarrage manuel détecté
-                if session.ui_controller.is_manual_restart_requested(session.driver):
-                    print("[BOT] Redémarrage manuel détecté")
+            # Attendre que l'utilisateur relance via l'overlay (bouton "Start New Game" F6 ou restart du jeu)
+            while True:
+                control = session.ui_controller.poll_control(
+                    session.driver, wait=UI_OVERLAY_CONFIG['control_wait']
+                )
+                if control.restart_requested or control.manual_restart:
+                    source = "Auto-restart demandé via UI" if control.restart_requested else "Redémarrage manuel détecté"
+                    print(f"[BOT] {source}")
                     restart_game(session)
                     session.game_id = None
-                    waiting_for_restart = False
                     break
         else:
             # Pas d'UI controller : fallback sur input terminal
@@ -436,6 +598,8 @@ def run_game(
                 return {
                     "iterations": iterations,
                     "total_actions": total_actions,
+                    "idle_saved": total_idle_saved,
+                    "cells_per_second": cells_per_second,
                     "success": True,
                     "export_root": str(export_ctx.export_root) if export_ctx else None,
                     "restart": False,
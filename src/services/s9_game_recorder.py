@@ -0,0 +1,243 @@
+"""Enregistrement et rejeu des itérations de jeu (corpus de benchmark reproductible).
+
+Archive par partie (zip) :
+- iter_NNNN/composite.png : composite de capture tel que vu par la vision
+- iter_NNNN/record.json   : bornes, delta storage avant vision (changements
+  externes : exploration du planner...), delta produit par vision+solver,
+  actions du solver
+
+Le rejeu reconstruit le storage itération par itération et refait passer
+les captures par vision → storage → solver, sans navigateur.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import time
+import zipfile
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from PIL import Image
+
+from src.config import CELL_SIZE, get_game_paths
+from src.lib.s0_coordinates.types import GridBounds
+from src.lib.s2_vision import analyze_image
+from src.lib.s3_storage import StorageController
+from src.lib.s3_storage.types import (
+    Coord,
+    GridCell,
+    StorageUpsert,
+    RawCellState,
+    LogicalCellState,
+    SolverStatus,
+    ActiveRelevance,
+    FrontierRelevance,
+)
+from src.lib.s4_solver import solve
+from src.lib.s4_solver.types import SolverOutput
+
+RECORDING_VERSION = 1
+
+
+def _value(member) -> Optional[str]:
+    # Les focus levels peuvent être None (cellules hors ACTIVE/FRONTIER)
+    return member.value if member is not None else None
+
+
+def _member(enum_cls, value):
+    return enum_cls(value) if value is not None else None
+
+
+def _cell_to_row(cell: GridCell) -> list:
+    return [
+        cell.coord[0],
+        cell.coord[1],
+        _value(cell.raw_state),
+        _value(cell.logical_state),
+        cell.number_value,
+        _value(cell.solver_status),
+        _value(cell.focus_level_active),
+        _value(cell.focus_level_frontier),
+    ]
+
+
+def _row_to_cell(row: list) -> GridCell:
+    col, r, raw, logical, number, status, focus_a, focus_f = row
+    return GridCell(
+        coord=(col, r),
+        raw_state=_member(RawCellState, raw),
+        logical_state=_member(LogicalCellState, logical),
+        number_value=number,
+        solver_status=_member(SolverStatus, status),
+        focus_level_active=_member(ActiveRelevance, focus_a),
+        focus_level_frontier=_member(FrontierRelevance, focus_f),
+    )
+
+
+def _diff_snapshots(before: Dict[Coord, GridCell], after: Dict[Coord, GridCell]) -> List[list]:
+    """Cellules nouvelles ou modifiées entre deux snapshots (le storage ne supprime jamais)."""
+    return [_cell_to_row(cell) for coord, cell in after.items() if before.get(coord) != cell]
+
+
+def _actions_to_rows(output: SolverOutput) -> List[list]:
+    return [[a.coord[0], a.coord[1], a.action.value, a.confidence] for a in output.actions]
+
+
+class GameRecorder:
+    """Enregistre chaque itération d'une partie dans une archive zip."""
+
+    def __init__(self, path: Path, metadata: Optional[Dict[str, Any]] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._zip = zipfile.ZipFile(self.path, "w", compression=zipfile.ZIP_DEFLATED)
+        self._last_snapshot: Dict[Coord, GridCell] = {}
+        self._pre_delta: List[list] = []
+        self.iterations = 0
+        header = {"version": RECORDING_VERSION, "created": datetime.now().isoformat(), **(metadata or {})}
+        self._zip.writestr("header.json", json.dumps(header))
+
+    @classmethod
+    def for_game(cls, game_id: Optional[str], **metadata: Any) -> "GameRecorder":
+        """Crée l'archive standard temp/games/<game_id>/recording.zip."""
+        game_id = game_id or datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        path = Path(get_game_paths(game_id)['recording'])
+        print(f"[RECORDER] Enregistrement: {path}")
+        return cls(path, metadata={"game_id": game_id, **metadata})
+
+    def begin_iteration(self, storage: StorageController) -> None:
+        """À appeler avant la vision : capture les changements externes depuis la dernière itération."""
+        snapshot = storage.get_snapshot()
+        self._pre_delta = _diff_snapshots(self._last_snapshot, snapshot)
+        self._last_snapshot = snapshot
+
+    def record_iteration(
+        self,
+        iteration: int,
+        composite_bytes: bytes,
+        bounds: GridBounds,
+        storage: StorageController,
+        solver_output: SolverOutput,
+    ) -> None:
+        """À appeler après le solver : enregistre capture + deltas + actions."""
+        try:
+            snapshot = storage.get_snapshot()
+            record = {
+                "iteration": iteration,
+                "bounds": [bounds.min_row, bounds.min_col, bounds.max_row, bounds.max_col],
+                "pre_delta": self._pre_delta,
+                "post_delta": _diff_snapshots(self._last_snapshot, snapshot),
+                "actions": _actions_to_rows(solver_output),
+            }
+            self._last_snapshot = snapshot
+            prefix = f"iter_{self.iterations:04d}"
+            # Le PNG est déjà compressé : stocké tel quel
+            self._zip.writestr(f"{prefix}/composite.png", composite_bytes, compress_type=zipfile.ZIP_STORED)
+            self._zip.writestr(f"{prefix}/record.json", json.dumps(record, separators=(",", ":")))
+            self.iterations += 1
+        except Exception as e:
+            print(f"[RECORDER] Erreur enregistrement itération {iteration}: {e}")
+
+    def close(self) -> None:
+        if self._zip:
+            self._zip.close()
+            self._zip = None
+            print(f"[RECORDER] {self.iterations} itérations enregistrées → {self.path}")
+
+
+@dataclass
+class ReplayIteration:
+    """Mesures d'une itération rejouée."""
+    iteration: int
+    cell_count: int
+    vision_ms: float
+    storage_ms: float
+    solver_ms: float
+    actions_recorded: int
+    actions_replayed: int
+    actions_matching: int
+
+
+@dataclass
+class ReplayReport:
+    """Rapport complet de rejeu d'une archive."""
+    path: str
+    iterations: List[ReplayIteration] = field(default_factory=list)
+
+    @property
+    def totals(self) -> Dict[str, float]:
+        return {
+            "iterations": len(self.iterations),
+            "cells": sum(i.cell_count for i in self.iterations),
+            "vision_ms": sum(i.vision_ms for i in self.iterations),
+            "storage_ms": sum(i.storage_ms for i in self.iterations),
+            "solver_ms": sum(i.solver_ms for i in self.iterations),
+            "actions_recorded": sum(i.actions_recorded for i in self.iterations),
+            "actions_matching": sum(i.actions_matching for i in self.iterations),
+        }
+
+
+def _iteration_prefixes(archive: zipfile.ZipFile) -> List[str]:
+    return sorted({name.split("/", 1)[0] for name in archive.namelist() if name.startswith("iter_")})
+
+
+def replay_recording(path: Path, max_iterations: Optional[int] = None) -> ReplayReport:
+    """
+    Rejoue une archive : pour chaque itération, applique le delta externe
+    enregistré puis refait vision → storage → solver sur la capture d'origine.
+    Les actions obtenues sont comparées aux actions enregistrées.
+    """
+    report = ReplayReport(path=str(path))
+    storage = StorageController()
+
+    with zipfile.ZipFile(path, "r") as archive:
+        for prefix in _iteration_prefixes(archive)[:max_iterations]:
+            record = json.loads(archive.read(f"{prefix}/record.json"))
+            composite = Image.open(io.BytesIO(archive.read(f"{prefix}/composite.png"))).convert("RGB")
+            min_row, min_col, max_row, max_col = record["bounds"]
+            bounds = GridBounds(min_row=min_row, min_col=min_col, max_row=max_row, max_col=max_col)
+
+            if record["pre_delta"]:
+                cells = {cell.coord: cell for cell in map(_row_to_cell, record["pre_delta"])}
+                storage.apply_upsert(StorageUpsert(cells=cells))
+
+            t0 = time.perf_counter()
+            vision_result = analyze_image(
+                composite,
+                bounds=bounds,
+                cell_size=CELL_SIZE,
+                known_mask=storage.get_known_mask(bounds),
+            )
+            t1 = time.perf_counter()
+            storage.update_from_vision(vision_result)
+            t2 = time.perf_counter()
+            solver_output = solve(storage)
+            t3 = time.perf_counter()
+
+            recorded: Set[Tuple[int, int, str]] = {(c, r, a) for c, r, a, _ in record["actions"]}
+            replayed = {(a.coord[0], a.coord[1], a.action.value) for a in solver_output.actions}
+            item = ReplayIteration(
+                iteration=record["iteration"],
+                cell_count=vision_result.cell_count,
+                vision_ms=(t1 - t0) * 1000,
+                storage_ms=(t2 - t1) * 1000,
+                solver_ms=(t3 - t2) * 1000,
+                actions_recorded=len(recorded),
+                actions_replayed=len(replayed),
+                actions_matching=len(recorded & replayed),
+            )
+            report.iterations.append(item)
+            print(
+                f"[REPLAY] {prefix}: vision {item.vision_ms:.1f}ms, storage {item.storage_ms:.1f}ms, "
+                f"solver {item.solver_ms:.1f}ms, actions {item.actions_matching}/{item.actions_recorded} identiques"
+            )
+
+    totals = report.totals
+    print(
+        f"[REPLAY] {totals['iterations']} itérations, {totals['cells']} cellules : "
+        f"vision {totals['vision_ms']:.0f}ms, storage {totals['storage_ms']:.0f}ms, solver {totals['solver_ms']:.0f}ms"
+    )
+    return report
@@ -0,0 +1,266 @@
+"""
+Orchestrateur multi-sessions : N parties indépendantes en parallèle.
+
+Chaque session (navigateur Chrome ou plateau simulé) tourne dans son propre
+processus (spawn) avec sa propre boucle de jeu. La banque de templates est
+compilée une fois, publiée en mémoire partagée, et chaque processus s'y
+attache en lecture seule. Les échantillons de progression (compteurs du
+storage) remontent par une file et sont agrégés ici : cellules révélées
+cumulées et débit global en cellules/heure.
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import queue
+import sys
+import time
+import traceback
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.config import ORCHESTRATOR_CONFIG
+from src.lib.s2_vision import CenterTemplateMatcher, SharedTemplateBank
+
+
+@dataclass(frozen=True)
+class SessionSpec:
+    """Paramètres d'une session lancée par l'orchestrateur."""
+    index: int
+    simulate: bool
+    difficulty: str
+    seed: int = 0
+    max_iterations: int = 500
+    max_games: int = 1
+    delay: float = 0.2
+    headless: bool = ORCHESTRATOR_CONFIG['headless']
+    pooled: bool = False     # Navigateur pré-chauffé du pool (toujours le cas en headless)
+    record: bool = False     # Enregistrement de chaque partie (recording.zip)
+    overlay: bool = False    # Overlays de debug
+    log_path: Optional[str] = None
+
+
+@dataclass
+class SessionMetrics:
+    """Progression agrégée d'une session (toutes parties confondues)."""
+    index: int
+    games: int = 0
+    iterations: int = 0
+    revealed: int = 0       # Cases ouvertes depuis le début de chaque partie (reprise exclue), drapeaux non compris
+    flagged: int = 0
+    done: bool = False
+    error: Optional[str] = None
+    result: Dict[str, Any] = field(default_factory=dict)
+    _baseline: int = 0
+    _completed: int = 0
+
+    def on_sample(self, iteration: int, revealed: int, flagged: int) -> None:
+        if iteration < 0:  # Échantillon de départ d'une nouvelle partie
+            self._completed = self.revealed
+            self._baseline = revealed
+            self.games += 1
+        else:
+            self.iterations += 1
+        self.revealed = self._completed + max(0, revealed - self._baseline)
+        self.flagged = flagged
+
+
+@dataclass
+class OrchestratorReport:
+    """Bilan central de toutes les sessions."""
+    sessions: List[SessionMetrics]
+    elapsed: float
+
+    @property
+    def total_revealed(self) -> int:
+        return sum(metrics.revealed for metrics in self.sessions)
+
+    @property
+    def cells_per_hour(self) -> float:
+        return self.total_revealed * 3600.0 / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        running = sum(1 for metrics in self.sessions if not metrics.done)
+        failed = sum(1 for metrics in self.sessions if metrics.error)
+        return (
+            f"{len(self.sessions)} sessions ({running} actives, {failed} en échec) | "
+            f"{self.total_revealed} cellules révélées en {self.elapsed:.1f}s → {self.cells_per_hour:.0f} cellules/h"
+        )
+
+
+def _session_worker(spec: SessionSpec, bank_handle: Optional[SharedTemplateBank], events) -> None:
+    """Processus d'une session : boucle de jeu complète, progression envoyée à l'orchestrateur."""
+    log = None
+    if spec.log_path:
+        # Les logs des sessions parallèles ne s'entremêlent pas sur la console
+        log = open(spec.log_path, "w", encoding="utf-8", buffering=1)
+        sys.stdout = sys.stderr = log
+
+    session = None
+    try:
+        from src.lib.s2_vision import use_template_bank
+        from src.lib.s0_browser import stop_overlay_queue
+        from .s0_session_service import close_session, create_session, create_simulated_session, prewarm_browsers
+        from .s9_game_loop import run_game
+
+        pooled = spec.pooled or spec.headless
+        if not spec.simulate and pooled:
+            prewarm_browsers(spec.difficulty)  # Chrome démarre pendant l'attache de la banque
+        if bank_handle is not None:
+            use_template_bank(bank_handle.attach())
+
+        if spec.simulate:
+            session = create_simulated_session(difficulty=spec.difficulty, seed=spec.seed)
+        else:
+            session = create_session(difficulty=spec.difficulty, headless=spec.headless, pooled=pooled)
+        session.name = f"s{spec.index}"
+
+        def forward(sample) -> None:
+            counters = sample.counters
+            events.put(("progress", spec.index, sample.iteration, counters.revealed, counters.flagged))
+
+        result = run_game(
+            session,
+            max_iterations=spec.max_iterations,
+            delay=0.0 if spec.simulate else spec.delay,
+            max_games=spec.max_games,
+            record=spec.record,
+            overlay_enabled=spec.overlay,
+            on_progress=forward,
+        )
+        if spec.simulate:
+            board = session.driver.board
+            result.update({
+                "seed": spec.seed,
+                "cells_revealed": board.stats.revealed,
+                "explosions": board.stats.explosions,
+            })
+        stop_overlay_queue()
+        events.put(("done", spec.index, result))
+    except Exception as e:
+        traceback.print_exc()
+        events.put(("error", spec.index, f"{type(e).__name__}: {e}"))
+    finally:
+        if session is not None:
+            try:
+                close_session(session)
+            except Exception as e:
+                print(f"[ORCHESTRATOR] Erreur fermeture session {spec.index}: {e}")
+        if log is not None:
+            log.close()
+
+
+def build_specs(
+    count: int,
+    *,
+    simulate: bool,
+    difficulty: str,
+    seed: int = 0,
+    max_iterations: int = 500,
+    max_games: int = 1,
+    delay: float = 0.2,
+    pooled: bool = False,
+    record: bool = False,
+    overlay: bool = False,
+    log_dir: Optional[Path] = None,
+) -> List[SessionSpec]:
+    """Specs de N sessions (graines consécutives en simulation, un fichier de log par session)."""
+    if log_dir is None:
+        log_dir = Path(ORCHESTRATOR_CONFIG['log_dir']) / datetime.now().strftime("%Y%m%d_%H%M%S")
+    log_dir.mkdir(parents=True, exist_ok=True)
+    return [
+        SessionSpec(
+            index=index,
+            simulate=simulate,
+            difficulty=difficulty,
+            seed=seed + index,
+            max_iterations=max_iterations,
+            max_games=max_games,
+            delay=delay,
+            pooled=pooled,
+            record=record,
+            overlay=overlay,
+            log_path=str(log_dir / f"session_{index}.log"),
+        )
+        for index in range(count)
+    ]
+
+
+def run_sessions(
+    specs: Sequence[SessionSpec],
+    report_interval: float = ORCHESTRATOR_CONFIG['report_interval'],
+) -> OrchestratorReport:
+    """Lance une session par processus et agrège leur progression jusqu'à la fin de toutes."""
+    context = mp.get_context("spawn")
+    bank_handle, segment = SharedTemplateBank.publish(CenterTemplateMatcher().bank)
+    events = context.Queue()
+    metrics = {spec.index: SessionMetrics(index=spec.index) for spec in specs}
+    processes = {
+        spec.index: context.Process(
+            target=_session_worker,
+            args=(spec, bank_handle, events),
+            name=f"session-{spec.index}",
+        )
+        for spec in specs
+    }
+
+    start = time.perf_counter()
+    report = OrchestratorReport(sessions=list(metrics.values()), elapsed=0.0)
+    print(f"[ORCHESTRATOR] {len(specs)} sessions lancées (banque de templates partagée : {bank_handle.shm_name})")
+    try:
+        for process in processes.values():
+            process.start()
+        pending = set(processes)
+        last_report = start
+        while pending:
+            try:
+                kind, index, *payload = events.get(timeout=1.0)
+            except queue.Empty:
+                # Processus mort sans message (crash dur)
+                for index in list(pending):
+                    process = processes[index]
+                    if not process.is_alive():
+                        metrics[index].done = True
+                        metrics[index].error = f"processus terminé (code {process.exitcode})"
+                        pending.discard(index)
+            else:
+                if kind == "progress":
+                    metrics[index].on_sample(*payload)
+                elif kind == "done":
+                    metrics[index].done = True
+                    metrics[index].result = payload[0]
+                    pending.discard(index)
+                elif kind == "error":
+                    metrics[index].done = True
+                    metrics[index].error = payload[0]
+                    pending.discard(index)
+                    print(f"[ORCHESTRATOR] Session {index} en échec : {payload[0]}")
+
+            now = time.perf_counter()
+            report.elapsed = now - start
+            if now - last_report >= report_interval:
+                print(f"[ORCHESTRATOR] {report.summary()}")
+                last_report = now
+    finally:
+        for process in processes.values():
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        segment.close()
+        segment.unlink()
+
+    report.elapsed = time.perf_counter() - start
+    for metrics in report.sessions:
+        status = f"échec ({metrics.error})" if metrics.error else "ok"
+        extra = ""
+        if "explosions" in metrics.result:
+            # Contrôle en simulation : compteur du storage vs vérité du plateau (cases hors tuiles capturées exclues du premier)
+            board_revealed = metrics.result['cells_revealed']
+            extra = (f" (plateau : révélées={board_revealed} explosions={metrics.result['explosions']}, "
+                     f"écart {metrics.revealed - board_revealed:+d})")
+        print(f"[ORCHESTRATOR] Session {metrics.index} : {status}, {metrics.games} partie(s), "
+              f"{metrics.iterations} itérations, {metrics.revealed} cellules{extra}")
+    print(f"[ORCHESTRATOR] Terminé : {report.summary()}")
+    return report
@@ -0,0 +1,87 @@
+"""
+Série temporelle de progression d'une partie (compteurs du storage).
+
+Un échantillon par itération : horodatage et compteurs O(1) du storage
+(révélées, drapeaux, par status). Sert au calcul du débit (cellules/s,
+global ou sur une fenêtre glissante) et est exporté en CSV dans
+temp/games/<game_id>/progress.csv.
+"""
+
+from __future__ import annotations
+
+import csv
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from src.lib.s3_storage import StorageCounters
+from src.lib.s3_storage.types import SolverStatus
+
+
+@dataclass(frozen=True)
+class ProgressSample:
+    """Compteurs du storage à un instant donné."""
+    timestamp: float
+    iteration: int
+    counters: StorageCounters
+
+    @property
+    def progress(self) -> int:
+        return self.counters.progress
+
+
+class ProgressTracker:
+    """Accumule les échantillons d'une partie et calcule le débit."""
+
+    def __init__(self, window: int = 5):
+        self.window = window  # Nombre d'échantillons du débit instantané
+        self.samples: List[ProgressSample] = []
+
+    def sample(self, counters: StorageCounters, iteration: int, timestamp: Optional[float] = None) -> ProgressSample:
+        entry = ProgressSample(
+            timestamp=time.time() if timestamp is None else timestamp,
+            iteration=iteration,
+            counters=counters,
+        )
+        self.samples.append(entry)
+        return entry
+
+    def cells_per_second(self, window: Optional[int] = None) -> float:
+        """Débit (cases révélées par seconde) sur les `window` derniers échantillons (tous si None)."""
+        samples = self.samples if window is None else self.samples[-(window + 1):]
+        if len(samples) < 2:
+            return 0.0
+        elapsed = samples[-1].timestamp - samples[0].timestamp
+        if elapsed <= 0:
+            return 0.0
+        return (samples[-1].counters.revealed - samples[0].counters.revealed) / elapsed
+
+    def summary(self) -> str:
+        if not self.samples:
+            return "aucun échantillon"
+        last = self.samples[-1].counters
+        return (
+            f"{last.revealed} révélées, {last.flagged} drapeaux, "
+            f"{self.cells_per_second(self.window):.1f} cellules/s "
+            f"(moyenne {self.cells_per_second():.1f})"
+        )
+
+    def save(self, path: Path) -> Path:
+        """Exporte la série en CSV (une ligne par échantillon, une colonne par status)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        statuses = list(SolverStatus)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(
+                ["timestamp", "iteration", "cells", "revealed", "flagged"]
+                + [status.value.lower() for status in statuses]
+            )
+            for entry in self.samples:
+                counters = entry.counters
+                writer.writerow(
+                    [f"{entry.timestamp:.3f}", entry.iteration, counters.cells, counters.revealed, counters.flagged]
+                    + [counters.by_status.get(status, 0) for status in statuses]
+                )
+        return path
@@ -0,0 +1,64 @@
+"""
+Profil de démarrage du bot (`--profile-startup`).
+
+Mesure les imports et les étapes d'initialisation (pilote Chrome, lancement
+du navigateur, session, banque de templates...) jusqu'à la première
+itération. Désactivé par défaut : `phase()` ne coûte alors qu'un test.
+"""
+
+from __future__ import annotations
+
+import importlib
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Tuple
+
+
+class StartupProfile:
+    """Chronologie des étapes de démarrage (durée, instant depuis le lancement)."""
+
+    def __init__(self) -> None:
+        self.origin = time.perf_counter()
+        self.enabled = False
+        self.phases: List[Tuple[str, float, float]] = []  # (étape, durée, fin depuis l'origine)
+        self._marked: set = set()
+
+    def enable(self, origin: float | None = None) -> None:
+        self.enabled = True
+        if origin is not None:
+            self.origin = origin
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.phases.append((name, end - start, end - self.origin))
+
+    def mark(self, name: str, once: bool = True) -> None:
+        """Jalon instantané (ex. première itération)."""
+        if not self.enabled or (once and name in self._marked):
+            return
+        self._marked.add(name)
+        self.phases.append((name, 0.0, time.perf_counter() - self.origin))
+
+    def import_modules(self, modules: Iterable[str]) -> None:
+        """Importe les modules dans l'ordre : chaque durée est le coût incrémental."""
+        for module in modules:
+            with self.phase(f"import {module}"):
+                importlib.import_module(module)
+
+    def report(self) -> str:
+        lines = ["[STARTUP] Profil de démarrage :"]
+        for name, duration, at in self.phases:
+            timing = f"{duration * 1000:8.1f} ms" if duration else "  (jalon)  "
+            lines.append(f"[STARTUP]   {timing}  @ {at * 1000:8.1f} ms  {name}")
+        return "\n".join(lines)
+
+
+startup_profile = StartupProfile()